@@ -0,0 +1,105 @@
+from collections import OrderedDict
+import sys
+
+class CheckpointNode:
+    """检查点前缀树节点"""
+    def __init__(self, parent: 'CheckpointNode | None' = None, action: tuple = tuple()):
+        self.parent = parent                                # 父节点
+        self.action = action                                # 自父节点到达本节点的行动
+        self.children: dict[tuple, CheckpointNode] = {}     # 子节点
+        self.snapshot: dict | None = None                   # 本前缀处的游戏状态快照
+        self.snapshot_bytes = 0                             # 本节点快照的估算内存（存储时测量）
+
+class CheckpointCache:
+    """以行动记录前缀为键的游戏状态快照缓存（前缀树存储，LRU淘汰，内存上限）"""
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, max_entries: int = 4096):
+        self.root = CheckpointNode()                        # 前缀树根节点（空前缀）
+        self.max_bytes = max_bytes                          # 快照总内存上限（估算）
+        self.max_entries = max_entries                      # 快照数量上限
+        self.total_bytes = 0                                # 当前全部快照的估算内存之和
+        self.lru: OrderedDict[int, CheckpointNode] = OrderedDict()  # 持有快照的节点（按最近使用排序）
+        self.hits = 0                                       # 命中次数
+        self.misses = 0                                     # 未命中次数
+
+    def __len__(self):
+        return len(self.lru)
+
+    def lookup(self, action_history: list) -> tuple[int, dict | None]:
+        """查找行动记录的最深已缓存前缀，返回(前缀长度, 快照)"""
+        node = self.root
+        depth, found = 0, None
+        for idx, action in enumerate(action_history):
+            node = node.children.get(action)
+            if node is None:
+                break
+            if node.snapshot is not None:
+                depth, found = idx + 1, node
+        if found is None:
+            self.misses += 1
+            return 0, None
+        self.hits += 1
+        self.lru.move_to_end(id(found))
+        return depth, found.snapshot
+
+    def store(self, action_history_prefix: list, snapshot: dict):
+        """存储行动记录前缀处的快照，超出上限时淘汰最久未使用的快照"""
+        node = self.root
+        for action in action_history_prefix:
+            child = node.children.get(action)
+            if child is None:
+                child = node.children[action] = CheckpointNode(node, action)
+            node = child
+
+        # 逐个测量快照内存并累计（替换已有快照时先扣除原快照）
+        snapshot_bytes = self.estimate_bytes(snapshot)
+        self.total_bytes += snapshot_bytes - node.snapshot_bytes
+        node.snapshot, node.snapshot_bytes = snapshot, snapshot_bytes
+        self.lru[id(node)] = node
+        self.lru.move_to_end(id(node))
+
+        while len(self.lru) > 1 and (
+            len(self.lru) > self.max_entries or self.total_bytes > self.max_bytes
+        ):
+            _, evicted_node = self.lru.popitem(last=False)
+            self.evict(evicted_node)
+
+    def evict(self, node: CheckpointNode):
+        """移除节点快照，并剪除不再通向任何快照的分支"""
+        self.total_bytes -= node.snapshot_bytes
+        node.snapshot, node.snapshot_bytes = None, 0
+        while node.parent is not None and node.snapshot is None and not node.children:
+            del node.parent.children[node.action]
+            node = node.parent
+
+    def clear(self):
+        """清空缓存"""
+        self.root = CheckpointNode()
+        self.lru.clear()
+        self.total_bytes = 0
+
+    @staticmethod
+    def estimate_bytes(snapshot: dict) -> int:
+        """估算快照占用内存（遍历快照内全部对象，不含游戏状态本身）"""
+        owner = snapshot['owner']
+        seen = {id(owner)}
+        stack = [value for key, value in snapshot.items() if key != 'owner']
+        total = 0
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            total += sys.getsizeof(obj)
+            match obj:
+                case dict():
+                    stack.extend(obj.keys())
+                    stack.extend(obj.values())
+                case list() | tuple() | set() | frozenset():
+                    stack.extend(obj)
+                case _ if hasattr(obj, '__dict__') and not isinstance(obj, type):
+                    stack.append(obj.__dict__)
+                case _ if hasattr(obj, '__slots__') and not isinstance(obj, type):
+                    stack.extend(getattr(obj, name) for name in obj.__slots__ if hasattr(obj, name))
+                case _ if hasattr(obj, '__self__'):
+                    stack.append(obj.__self__)
+        return total
@@ -1,4 +1,4 @@
-from GameState import GameStateBase
+from GameState import GameStateBase, ZOBRIST_ACTION_DONE_BASE, ZOBRIST_OWNER_BASE, compile_cost, state_versions, zobrist_key
 
 class AllEffectObject:
 
@@ -13,65 +13,122 @@ class AllEffectObject:
         def __init__(self, game_state: GameStateBase) -> None:
             self.game_state = game_state
             self.owner_list = []
+            self.owner_feature = ZOBRIST_OWNER_BASE     # 持有者的 Zobrist 特征号（由板块类型与id确定，见 create_actual_object）
+            self.action_done_feature = ZOBRIST_ACTION_DONE_BASE     # 附加行动已执行标记的 Zobrist 特征号（同上）
             self.immediate_effect = []
             self.income_effect = []
             self.pass_effect = []
             self.setup_effect = []
             self.additional_action_is_done = [False] * game_state.num_players
             self.round_end_effect_args: tuple[str, int, str, int] = tuple()
-        
+            self.compiled_costs: dict = {}          # 编译后的花费检查（按 cost_key 缓存）
+        
+        # 该玩家持有本板块（可重复持有）的哈希分量，未持有时为0
+        def owner_hash(self, player_id: int) -> int:
+            count = self.owner_list.count(player_id)
+            return zobrist_key(self.owner_feature + player_id, count) if count else 0
+
+        # 增减持有者（同时增量更新游戏状态的持有关系哈希与版本号）
+        def add_owner(self, player_id: int):
+            self.game_state.ownership_hash ^= self.owner_hash(player_id)
+            self.owner_list.append(player_id)
+            self.game_state.ownership_hash ^= self.owner_hash(player_id)
+            self.game_state.objects_version = next(state_versions)
+
+        def remove_owner(self, player_id: int):
+            self.game_state.ownership_hash ^= self.owner_hash(player_id)
+            self.owner_list.remove(player_id)
+            self.game_state.ownership_hash ^= self.owner_hash(player_id)
+            self.game_state.objects_version = next(state_versions)
+
+        # 标记该玩家本回合已执行每回合一次附加行动（同时增量更新游戏状态的持有关系哈希）
+        def mark_additional_action_done(self, player_id: int):
+            if not self.additional_action_is_done[player_id]:
+                self.game_state.ownership_hash ^= zobrist_key(self.action_done_feature + player_id, 1)
+            self.additional_action_is_done[player_id] = True
+
+        def clear_owners(self):
+            for player_id in set(self.owner_list):
+                self.game_state.ownership_hash ^= self.owner_hash(player_id)
+            self.owner_list.clear()
+            self.game_state.objects_version = next(state_versions)
+
         # 检查是否可获取
         def check_get(self, player_id: int) -> bool:
             if player_id in self.owner_list or len(self.owner_list) >= self.max_owner:
                 return False
-            if not self.game_state.check(player_id, self.cost(player_id)[0]):
+            if not self.game_state.check_cost(player_id, self.compiled_cost(player_id)):
                 return False
             return True
         
         # 获取花费
         def cost(self, player_id) -> tuple[list, list]:
             return [], [] # 花费检查，花费执行
+
+        # 花费所依赖的玩家状态（None 表示花费固定）
+        def cost_key(self, player_id):
+            return None
+
+        # 获取编译后的花费检查（见 GameState.compile_cost，按 cost_key 缓存，花费所依赖的状态不变时不再重建花费列表）
+        def compiled_cost(self, player_id) -> tuple:
+            key = self.cost_key(player_id)
+            compiled = self.compiled_costs.get(key)
+            if compiled is None:
+                compiled = self.compiled_costs[key] = compile_cost(tuple(self.cost(player_id)[0]))
+            return compiled
         
         # 立即执行方法
         def execute_immediate_effect(self, executed_player_id:int):
             # 执行立即效果
-            spend_str, reward_str = self.game_state.adjust(executed_player_id, self.immediate_effect)
+            spend_str, reward_str = yield from self.game_state.adjust(executed_player_id, self.immediate_effect)
             self._print_effect('immediate', executed_player_id, spend_str, reward_str)
             # 清空本版块立即效果列表（以防多玩家获取同一板块时，后获得者重复执行效果）
             self.immediate_effect.clear()
         # 回合收入方法
         def execute_income_effect(self, executed_player_id:int):
             # 执行收入效果
-            spend_str, reward_str = self.game_state.adjust(executed_player_id, self.income_effect)
+            spend_str, reward_str = yield from self.game_state.adjust(executed_player_id, self.income_effect)
             self._print_effect('income',executed_player_id, spend_str, reward_str)
             # 清空本版块收入效果列表（以防多玩家获取同一板块时，后获得者重复执行效果）
             self.income_effect.clear()
         # 略过回合方法
         def execute_pass_effect(self, executed_player_id:int):
             # 执行略过回合效果
-            spend_str, reward_str = self.game_state.adjust(executed_player_id, self.pass_effect)
+            spend_str, reward_str = yield from self.game_state.adjust(executed_player_id, self.pass_effect)
             self._print_effect('pass',executed_player_id, spend_str, reward_str)
             # 清空本版块略过回合效果列表（以防多玩家获取同一板块时，后获得者重复执行效果）
             self.pass_effect.clear()
         # 初始设置方法
         def execute_setup_effect(self, executed_player_id:int):
             # 执行初始设置效果
-            spend_str, reward_str = self.game_state.adjust(executed_player_id, self.setup_effect)
+            spend_str, reward_str = yield from self.game_state.adjust(executed_player_id, self.setup_effect)
             self._print_effect('setup',executed_player_id, spend_str, reward_str)
             # 清空初始设置效果
             self.setup_effect.clear()
-        # 额外行动方法
+        # 额外行动方法（检查时返回可用行动位掩码，执行时返回行动效果生成器）
         def additional_action(self, mode, player_id:int, args = tuple()):
-            pass
+            match mode:
+                case 'check':
+                    return self.check_additional_action(player_id)
+                case 'execute':
+                    return self.execute_additional_action(player_id, args)
+                case _:
+                    raise ValueError('Invalid mode')
+        # 检查额外行动
+        def check_additional_action(self, player_id:int) -> int:
+            return 0
+        # 执行额外行动
+        def execute_additional_action(self, player_id:int, args = tuple()):
+            yield from ()
         
         # 当获取时
         def get(self, got_player_id):
             # 记录该板块的拥有者
-            self.owner_list.append(got_player_id)
+            self.add_owner(got_player_id)
             # 支付该板块费用
-            self.game_state.adjust(got_player_id, self.cost(got_player_id)[1])
+            yield from self.game_state.adjust(got_player_id, self.cost(got_player_id)[1])
             # 执行立即效果
-            self.execute_immediate_effect(got_player_id)
+            yield from self.execute_immediate_effect(got_player_id)
             # 添加收入效果
             self.game_state.players[got_player_id].income_effect_list.append(self.execute_income_effect)
             # 添加略过效果
@@ -83,16 +140,22 @@ class AllEffectObject:
 
         # 当激活时
         def activate(self, executed_player_id):    
-            pass
+            yield from ()
         # 当回合结束时
         def round_end(self):
-            # 重置每回合一次附加行动已执行标记
+            # 重置每回合一次附加行动已执行标记（同时从持有关系哈希中移除）
+            for player_id, is_done in enumerate(self.additional_action_is_done):
+                if is_done:
+                    self.game_state.ownership_hash ^= zobrist_key(self.action_done_feature + player_id, 1)
             self.additional_action_is_done = [False] * self.game_state.num_players
+            yield from ()
         # 当交还时
         def back(self, executed_player_id):
-            pass
+            yield from ()
 
         def _print_effect(self, mode, executed_player_id, spend_str, reward_str):
+            if self.game_state.headless:
+                return
             color_dict = {
                 'immediate': 'orange',
                 'setup': 'orange',
@@ -124,7 +187,7 @@ class AllEffectObject:
         id = 0
 
         def get(self, got_player_id):
-            super().get(got_player_id)
+            yield from super().get(got_player_id)
             self.game_state.io.update_player_state(got_player_id, {'planning_card': self.name_dict[self.id][:2]})
 
         def execute_income_effect(self, executed_player_id):
@@ -136,14 +199,14 @@ class AllEffectObject:
                 ('magics', 'get', 4-buildings[2] if buildings[2]>=2 else 2*(4-buildings[2])-2), 
                 ('meeple', 'get', 3-buildings[4] + 1-buildings[5]) 
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         def execute_immediate_effect(self, executed_player_id: int):
             self.immediate_effect.extend([
                 ('money', 'get', 15),
                 ('ore', 'get', 3),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class Faction(EffectObject):
         
@@ -165,7 +228,7 @@ class AllEffectObject:
         id = 0
         
         def get(self, got_player_id):
-            super().get(got_player_id)
+            yield from super().get(got_player_id)
             self.game_state.io.update_player_state(got_player_id, {'faction': self.name_dict[self.id]})
 
     class PalaceTile(EffectObject):
@@ -174,12 +237,13 @@ class AllEffectObject:
 
         # 当获取时
         def get(self, got_player_id):
-            self.owner_list.append(got_player_id)
+            self.add_owner(got_player_id)
+            yield from ()
         
         # 当激活时
         def activate(self, executed_player_id):
             # 执行立即效果
-            self.execute_immediate_effect(executed_player_id)
+            yield from self.execute_immediate_effect(executed_player_id)
             # 添加收入效果
             self.game_state.players[executed_player_id].income_effect_list.append(self.execute_income_effect)
             # 添加略过效果
@@ -201,11 +265,11 @@ class AllEffectObject:
                 self.immediate_effect.extend([
                     ('money', 'get', 1),
                 ])
-            super().round_end()
+            yield from super().round_end()
 
         # 当获取时
         def get(self, got_player_id):
-            super().get(got_player_id)
+            yield from super().get(got_player_id)
             # 设置玩家新一轮回合助推板
             self.game_state.players[got_player_id].booster_ids.append(self.id)
             # 数据面板更新
@@ -214,10 +278,10 @@ class AllEffectObject:
         # 当交还时
         def back(self, executed_player_id):
             # 从将交还的回合助推板的持有者列表中移除玩家id，即标记为未被持有
-            self.owner_list.remove(executed_player_id)
+            self.remove_owner(executed_player_id)
             # 执行该玩家所有略过动作效果
             for effect_function in self.game_state.players[executed_player_id].pass_effect_list.copy():
-                effect_function(executed_player_id)
+                yield from effect_function(executed_player_id)
             # 使用函数引用和实例标识来移除
             self._remove_effect_functions(executed_player_id)
             # 移除该玩家属于回合助推板的额外行动
@@ -275,10 +339,10 @@ class AllEffectObject:
                 ('tracks', typ, 3 - num_book)
             ]
             # 获取该能力板块奖励
-            self.game_state.adjust(got_player_id, reward)
+            yield from self.game_state.adjust(got_player_id, reward)
             # 获取能力板块行动效果
-            self.game_state.action_effect(player_id=got_player_id, get_ability_tile_typ=typ)
-            super().get(got_player_id)
+            yield from self.game_state.action_effect(player_id=got_player_id, get_ability_tile_typ=typ)
+            yield from super().get(got_player_id)
             
 
     class ScienceTile(EffectObject):
@@ -296,6 +360,11 @@ class AllEffectObject:
                 return False
             return True
 
+        # 花费随已拥有高科数量、规划卡与是否已建造宫殿变化（指定书类型由初始设置确定）
+        def cost_key(self, player_id):
+            player = self.game_state.players[player_id]
+            return len(player.science_tile_ids), player.planning_card_id == 6, player.is_got_palace
+
         # 花费获取
         def cost(self, player_id):
             # 初始化花费检查列表
@@ -326,11 +395,11 @@ class AllEffectObject:
             return check_list,adjust_list
         
         def get(self, got_player_id):
-            super().get(got_player_id)
+            yield from super().get(got_player_id)
             # 添加该高科板块id至玩家列表
             self.game_state.players[got_player_id].science_tile_ids.append(self.id)
             # 获取高科板块行动效果触发
-            self.game_state.action_effect(player_id=got_player_id, get_science_tile=True)
+            yield from self.game_state.action_effect(player_id=got_player_id, get_science_tile=True)
 
     class RoundScoring(EffectObject):
         
@@ -367,8 +436,8 @@ class AllEffectObject:
                         case _:
                             round_end_effect = [(reward_item, 'get', get_num)]
                     # 获取奖励
-                    self.game_state.adjust(player_idx, round_end_effect)
-            return super().round_end()
+                    yield from self.game_state.adjust(player_idx, round_end_effect)
+            yield from super().round_end()
         
         '''其左侧行动效果均已写入action_effect方法中'''
         # 回合计分板块的行动效果
@@ -385,8 +454,8 @@ class AllEffectObject:
         # 当回合结束时
         def round_end(self):
             # 清空控制者列表
-            self.owner_list.clear()
-            super().round_end()
+            self.clear_owners()
+            yield from super().round_end()
 
     class CityTile(EffectObject):
 
@@ -399,13 +468,13 @@ class AllEffectObject:
             return True
         
         def get(self, got_player_id):
-            super().get(got_player_id)
-            self.game_state.action_effect(player_id=got_player_id, get_city_tile=True)
+            yield from super().get(got_player_id)
+            yield from self.game_state.action_effect(player_id=got_player_id, get_city_tile=True)
             self.game_state.io.update_player_state(got_player_id, {'city_amount': self.game_state.players[got_player_id].citys_amount})
         
         def execute_immediate_effect(self, executed_player_id):
             self.game_state.players[executed_player_id].citys_amount += 1
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class MagicsAction(EffectObject):
         
@@ -414,8 +483,8 @@ class AllEffectObject:
 
         def round_end(self):
             # 清空控制者列表
-            self.owner_list.clear()
-            super().round_end()
+            self.clear_owners()
+            yield from super().round_end()
 
     class PlainPlanningCard(PlanningCard):
 
@@ -435,7 +504,7 @@ class AllEffectObject:
                 ('meeple','get',1), 
                 ('magics','get',2), 
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class LakePlanningCard(PlanningCard):
 
@@ -446,7 +515,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('navigation',),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
         
     class ForestPlanningCard(PlanningCard):
 
@@ -461,7 +530,7 @@ class AllEffectObject:
                 ('tracks','engineering',1),
                 ('tracks','medical',1)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
         
     class MountainPlanningCard(PlanningCard):
 
@@ -473,7 +542,7 @@ class AllEffectObject:
                 ('money', 'get', 2),
                 ('money', 'get', min(1, 4-self.game_state.players[executed_player_id].buildings[2]))
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
                 
     class WastelandPlanningCard(PlanningCard):
 
@@ -484,14 +553,14 @@ class AllEffectObject:
             self.setup_effect.extend([ 
                 ('book','get','any',1), 
             ])
-            super().execute_setup_effect(executed_player_id)
+            yield from super().execute_setup_effect(executed_player_id)
 
         def execute_immediate_effect(self, executed_player_id):
             '''立即效果: 获取1矿'''
             self.immediate_effect.extend([
                 ('ore','get',1)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
             '''行动效果：第二项发明少付1书'''
             # 已写进获取高科板块的检查获取花费中
@@ -505,7 +574,7 @@ class AllEffectObject:
             self.setup_effect.extend([
                 ('spade', 1, False)
             ])
-            super().execute_setup_effect(executed_player_id)
+            yield from super().execute_setup_effect(executed_player_id)
 
     class BlessedFaction(Faction):
 
@@ -519,7 +588,7 @@ class AllEffectObject:
                 ('tracks','engineering',1),
                 ('tracks','medical',1)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
         '''行动效果: 结算轮次计分板块的科学奖励效果时，轨道被视为额外+3'''
         # 轮次计分板效果已写到行动效果方法中
 
@@ -533,7 +602,7 @@ class AllEffectObject:
                 ('tracks','bank',1), 
                 ('tracks','medical',1)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
             
         '''行动效果: 当建城时, 任意轨道推一格执行3次 + 获取1书'''
         # 猫人行动效果已写入action_effect中
@@ -549,7 +618,7 @@ class AllEffectObject:
                 ('tracks','engineering',1),
                 ('ore','get',1)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
         '''行动效果: 每用一铲获得2块钱'''
         # 哥布林行动效果已写入action_effect中
@@ -563,7 +632,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('tracks','medical',2)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
         
         '''行动效果: 每次执行魔力行动时, 少花费一点魔力并获得板面分数 (1分, 5人局2分)'''
         # TODO 幻术师行动效果
@@ -577,7 +646,7 @@ class AllEffectObject:
             self.setup_effect.extend([
                 ('ability_tile',)
             ])
-            super().execute_setup_effect(executed_player_id)
+            yield from super().execute_setup_effect(executed_player_id)
 
     class LizardsFaction(Faction):
 
@@ -588,7 +657,7 @@ class AllEffectObject:
             self.setup_effect.extend([
                 ('tracks','any',2)
             ])
-            super().execute_setup_effect(executed_player_id)
+            yield from super().execute_setup_effect(executed_player_id)
 
         '''行动效果: 当建城时, 立即免费一铲 + 免费建造一个车间 (无需在刚刚铲的地块上)'''
         # TODO 蜥蜴人行动效果
@@ -602,7 +671,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('tracks','engineering',2)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
         
         '''行动效果: 当执行地形改造并/或建造车间时, 可支付1矿跨越一个地形执行 (终局计分视为可抵达,即使无剩余矿), 并获得4版面分数'''
         # TODO 鼹鼠行动效果
@@ -619,7 +688,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('tracks','law',1)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
         '''初始设置阶段: 取消摆放两个工会，而是摆放一个大学作为初始建筑'''
         # 写成check_setup_building_action中了
@@ -633,7 +702,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('tracks','law',3)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
         '''行动效果: 当工会建造在河边时, 获得2版面分数'''
         # 航海家行动效果已写入action_effect中
@@ -648,7 +717,7 @@ class AllEffectObject:
                 ('tracks','bank',1), 
                 ('tracks','engineering',1)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
             
         '''初始设置阶段: 可额外摆放一个中立塔楼作为初始建筑'''
         # 写成check_setup_building_action中了
@@ -659,7 +728,7 @@ class AllEffectObject:
                 ('magics','get',2),
                 ('money','get',2)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
     class PhilosophersFaction(Faction):
 
@@ -670,37 +739,34 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('tracks','bank',2)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
         '''行动效果: 获取能力板块时, 多获得对应学科的书1本'''
         # 哲学家行动效果已写入action_effect中
 
         additional_action_name = 'additional_action_philosophers_faction'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 获取1书'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 判断每回合一次附加行动是否未执行
-                        and self.additional_action_is_done[player_id] ==  False
-                    ):
-                        return [288]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 判断每回合一次附加行动是否未执行
+                and self.additional_action_is_done[player_id] ==  False
+            ):
+                return 1 << 288
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 获取奖励
-                    self.game_state.adjust(player_id, [('book', 'get', 'any', 1)])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 获取1书'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 获取奖励
+            yield from self.game_state.adjust(player_id, [('book', 'get', 'any', 1)])
 
     class PsychicsFaction(Faction):
 
@@ -713,33 +779,30 @@ class AllEffectObject:
                 ('tracks','medical',1),
                 ('ore','get',1)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
         additional_action_name = 'additional_action_psychics_faction'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 转5点魔力, 并立即进行下一动'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 判断每回合一次附加行动是否未执行
-                        and self.additional_action_is_done[player_id] ==  False
-                    ):
-                        return [289]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 判断每回合一次附加行动是否未执行
+                and self.additional_action_is_done[player_id] ==  False
+            ):
+                return 1 << 289
+            else:
+                return 0
 
-                    # 不设置主行动执行
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 获取奖励
-                    self.game_state.adjust(player_id, [('magics', 'get', 5)])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 转5点魔力, 并立即进行下一动'''
+            # 不设置主行动执行
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 获取奖励
+            yield from self.game_state.adjust(player_id, [('magics', 'get', 5)])
 
     class PalaceTile1(PalaceTile):
 
@@ -750,64 +813,58 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('magics','get', 5)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         additional_action_name = 'additional_action_palace_tile_1'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 获得2矿'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 判断每回合一次附加行动是否未执行
-                        and self.additional_action_is_done[player_id] ==  False
-                    ):
-                        return [290]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 判断每回合一次附加行动是否未执行
+                and self.additional_action_is_done[player_id] ==  False
+            ):
+                return 1 << 290
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 获取奖励
-                    self.game_state.adjust(player_id, [('ore', 'get', 2)])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 获得2矿'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 获取奖励
+            yield from self.game_state.adjust(player_id, [('ore', 'get', 2)])
 
     class PalaceTile2(PalaceTile):
         
         id = 2
         additional_action_name = 'additional_action_palace_tile_2'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 立即2铲并可选建造'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 判断每回合一次附加行动是否未执行
-                        and self.additional_action_is_done[player_id] ==  False
-                    ):
-                        return [291]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 判断每回合一次附加行动是否未执行
+                and self.additional_action_is_done[player_id] ==  False
+            ):
+                return 1 << 291
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 获取奖励
-                    self.game_state.adjust(player_id, [('spade', 2)])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 立即2铲并可选建造'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 获取奖励
+            yield from self.game_state.adjust(player_id, [('spade', 2)])
 
     class PalaceTile3(PalaceTile):
         
@@ -818,44 +875,41 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('magics','get', 2)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         additional_action_name = 'additional_action_palace_tile_3'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 将1个学院降级为工会，并获得3分1矿'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 判断每回合一次附加行动是否未执行
-                        and self.additional_action_is_done[player_id] ==  False
-                        # 检查是否还有工会
-                        and self.game_state.players[player_id].buildings[2] > 0
-                        # 检查是否有学院已被建造
-                        and self.game_state.players[player_id].buildings[4] < 3
-                    ):
-                        return [292]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 判断每回合一次附加行动是否未执行
+                and self.additional_action_is_done[player_id] ==  False
+                # 检查是否还有工会
+                and self.game_state.players[player_id].buildings[2] > 0
+                # 检查是否有学院已被建造
+                and self.game_state.players[player_id].buildings[4] < 3
+            ):
+                return 1 << 292
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 选择降级位置
-                    if self.game_state.invoke_immediate_aciton(player_id, ('select_position', 'controlled', (4, None))): return 
-                    # 执行降级行动并获取奖励
-                    self.game_state.adjust(player_id, [
-                        ('building', 'degrade', 2, False), 
-                        ('score', 'get', 'board', 3), 
-                        ('ore', 'get', 1)
-                    ])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 将1个学院降级为工会，并获得3分1矿'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 选择降级位置
+            yield from self.game_state.invoke_immediate_aciton(player_id, ('select_position', 'controlled', (4, None)))
+            # 执行降级行动并获取奖励
+            yield from self.game_state.adjust(player_id, [
+                ('building', 'degrade', 2, False), 
+                ('score', 'get', 'board', 3), 
+                ('ore', 'get', 1)
+            ])
 
     class PalaceTile4(PalaceTile):
 
@@ -866,40 +920,37 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('magics','get', 2)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         additional_action_name = 'additional_action_palace_tile_4'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 将1个车间升级为工会'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 判断每回合一次附加行动是否未执行
-                        and self.additional_action_is_done[player_id] ==  False
-                        # 检查是否还有工会
-                        and self.game_state.players[player_id].buildings[2] > 0
-                        # 检查是否有车间已被建造
-                        and self.game_state.players[player_id].buildings[1] < 9
-                    ):
-                        return [293]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 判断每回合一次附加行动是否未执行
+                and self.additional_action_is_done[player_id] ==  False
+                # 检查是否还有工会
+                and self.game_state.players[player_id].buildings[2] > 0
+                # 检查是否有车间已被建造
+                and self.game_state.players[player_id].buildings[1] < 9
+            ):
+                return 1 << 293
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 选择升级位置
-                    if self.game_state.invoke_immediate_aciton(player_id, ('select_position', 'controlled', (1, 'alone_or_neighbor'))): return 
-                    # 执行升级行动
-                    self.game_state.adjust(player_id, [('building', 'upgrade_special', 2, False)])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 将1个车间升级为工会'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 选择升级位置
+            yield from self.game_state.invoke_immediate_aciton(player_id, ('select_position', 'controlled', (1, 'alone_or_neighbor')))
+            # 执行升级行动
+            yield from self.game_state.adjust(player_id, [('building', 'upgrade_special', 2, False)])
 
     class PalaceTile5(PalaceTile):
 
@@ -910,14 +961,14 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('magics','get', 4)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         def execute_immediate_effect(self, executed_player_id):
             '''立即效果: 获得1能力板块'''
             self.immediate_effect.extend([
                 ('ability_tile',)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class PalaceTile6(PalaceTile):
 
@@ -929,34 +980,31 @@ class AllEffectObject:
                 ('magics','get', 4),
                 ('book', 'get', 'any', 1)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         additional_action_name = 'additional_action_palace_tile_6'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 获得2轨'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 检测该玩家每回合一次的附加行动是否已执行
-                        and self.additional_action_is_done[player_id] == False
-                    ):
-                        return [294]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 检测该玩家每回合一次的附加行动是否已执行
+                and self.additional_action_is_done[player_id] == False
+            ):
+                return 1 << 294
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 获取奖励
-                    self.game_state.adjust(player_id, [('tracks', 'any', 2)])        
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 获得2轨'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 获取奖励
+            yield from self.game_state.adjust(player_id, [('tracks', 'any', 2)])        
 
     class PalaceTile7(PalaceTile):
 
@@ -967,7 +1015,7 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('magics', 'get', 4)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         def execute_pass_effect(self, executed_player_id):
             '''略过效果: 每1学院获得1分'''
@@ -978,7 +1026,7 @@ class AllEffectObject:
             self.pass_effect.extend([
                 ('score', 'get', 'board', 3 * building_nums)
             ])
-            super().execute_pass_effect(executed_player_id)
+            yield from super().execute_pass_effect(executed_player_id)
 
     class PalaceTile8(PalaceTile):
 
@@ -991,7 +1039,7 @@ class AllEffectObject:
                 ('ore', 'get', 1),
                 ('magics', 'get', 2)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
         
         # TODO 涉及建城效果
 
@@ -1004,7 +1052,7 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('meeple', 'get', 1)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         # TODO 涉及选择位置行动     
 
@@ -1017,7 +1065,7 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('money', 'get', 6)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         def execute_immediate_effect(self, executed_player_id):
             '''立即效果: 获得12转魔 + 2书'''
@@ -1025,7 +1073,7 @@ class AllEffectObject:
                 ('magics', 'get', 12),
                 ('book', 'get', 'any', 2)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class PalaceTile11(PalaceTile):
 
@@ -1036,14 +1084,14 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('ore', 'get', 1)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         def execute_immediate_effect(self, executed_player_id):
             '''立即效果: 获得1城片'''
             self.immediate_effect.extend([
                 ('ability_tile',)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class PalaceTile12(PalaceTile):
 
@@ -1054,7 +1102,7 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('magics', 'get', 8)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
         
         '''行动效果: 每建造1车间获得2分'''
         # 建造行动效果已写入action_effect中
@@ -1065,33 +1113,30 @@ class AllEffectObject:
         
         additional_action_name = 'additional_action_palace_tile_13'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 获取3块钱 + 1书'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 判断每回合一次附加行动是否未执行
-                        and self.additional_action_is_done[player_id] ==  False
-                    ):
-                        return [295]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 判断每回合一次附加行动是否未执行
+                and self.additional_action_is_done[player_id] ==  False
+            ):
+                return 1 << 295
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 获取奖励
-                    self.game_state.adjust(player_id, [
-                        ('money', 'get', 3),
-                        ('book', 'get', 'any', 1)
-                    ])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 获取3块钱 + 1书'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 获取奖励
+            yield from self.game_state.adjust(player_id, [
+                ('money', 'get', 3),
+                ('book', 'get', 'any', 1)
+            ])
                     
         '''行动效果: 每建造1工会获得3分'''
         # 建造行动效果已写入action_effect中
@@ -1105,7 +1150,7 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('magics', 'get', 6)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         # TODO 涉及建城检查效果
 
@@ -1115,7 +1160,7 @@ class AllEffectObject:
                 ('navigation',),
                 ('navigation',)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class PalaceTile15(PalaceTile):
 
@@ -1126,7 +1171,7 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('magics', 'get', 6)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         def execute_immediate_effect(self, executed_player_id):
             '''立即效果: 获得立即2铲（可建造） + 2书 + 立即建造2桥'''
@@ -1136,10 +1181,10 @@ class AllEffectObject:
             ])
             for i in range(2):
                 if self.game_state.check(executed_player_id, [('bridge',)]):
-                    self.game_state.adjust(executed_player_id, [('bridge',)])
+                    yield from self.game_state.adjust(executed_player_id, [('bridge',)])
                 else:
                     break
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class PalaceTile16(PalaceTile):
 
@@ -1151,7 +1196,7 @@ class AllEffectObject:
                 ('magics', 'get', 2),
                 ('book', 'get', 'any', 1)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
         
         # TODO 特殊建造立即行动
 
@@ -1162,12 +1207,14 @@ class AllEffectObject:
         def execute_immediate_effect(self, executed_player_id):
             '''收入效果: 获得临时1航行'''
             self.game_state.players[executed_player_id].temp_navigation = True
-            super().execute_immediate_effect(executed_player_id)
+            self.game_state.update_reachable_mask(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
         
         def execute_pass_effect(self, executed_player_id):
             '''略过效果: 取消临时1航行'''
             self.game_state.players[executed_player_id].temp_navigation = False
-            super().execute_pass_effect(executed_player_id)
+            self.game_state.update_reachable_mask(executed_player_id)
+            yield from super().execute_pass_effect(executed_player_id)
 
         '''行动效果: 每建造1个位于河边的车间获得2分'''
         # 建筑建造行动效果已写入action_effect方法中
@@ -1181,7 +1228,7 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('ore', 'get', 1),
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         def execute_pass_effect(self, executed_player_id):
             '''略过效果: 每一宫殿或大学获得4分'''
@@ -1194,7 +1241,7 @@ class AllEffectObject:
             self.pass_effect.extend([
                 ('score', 'get', 'board', 4 * building_nums)
             ])
-            super().execute_pass_effect(executed_player_id)
+            yield from super().execute_pass_effect(executed_player_id)
 
     class RoundBooster3(RoundBooster):
 
@@ -1205,36 +1252,33 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('ore', 'get', 2)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
         
         additional_action_name = 'additional_action_round_booster_3'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 获取2轨'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 判断每回合一次附加行动是否未执行
-                        and self.additional_action_is_done[player_id] ==  False
-                    ):
-                        return [296]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 判断每回合一次附加行动是否未执行
+                and self.additional_action_is_done[player_id] ==  False
+            ):
+                return 1 << 296
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 获取奖励
-                    self.game_state.adjust(player_id, [
-                        ('tracks', 'any', 2)
-                    ])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 获取2轨'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 获取奖励
+            yield from self.game_state.adjust(player_id, [
+                ('tracks', 'any', 2)
+            ])
 
     class RoundBooster4(RoundBooster):
 
@@ -1245,7 +1289,7 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('meeple', 'get', 1)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         '''行动效果: 每插入1个米宝获得2分'''
         # 插入米宝行动效果已写入action_effect方法中
@@ -1256,39 +1300,36 @@ class AllEffectObject:
         
         additional_action_name = 'additional_action_round_booster_5'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 获取1铲'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 判断每回合一次附加行动是否未执行
-                        and self.additional_action_is_done[player_id] ==  False
-                    ):
-                        return [297]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 判断每回合一次附加行动是否未执行
+                and self.additional_action_is_done[player_id] ==  False
+            ):
+                return 1 << 297
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 获取奖励
-                    self.game_state.adjust(player_id, [
-                        ('spade', 1)
-                    ])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 获取1铲'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 获取奖励
+            yield from self.game_state.adjust(player_id, [
+                ('spade', 1)
+            ])
         
         def execute_income_effect(self, executed_player_id):
             '''收入效果: 获得1书'''
             self.income_effect.extend([
                 ('book', 'get', 'any', 1)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
     class RoundBooster6(RoundBooster):
 
@@ -1299,7 +1340,7 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('money', 'get', 4)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
         
         def execute_pass_effect(self, executed_player_id):
             '''略过效果: 每1学院获得1轨'''
@@ -1310,7 +1351,7 @@ class AllEffectObject:
             self.pass_effect.extend([
                 ('tracks', 'any', building_nums)
             ])
-            super().execute_pass_effect(executed_player_id)
+            yield from super().execute_pass_effect(executed_player_id)
 
     class RoundBooster7(RoundBooster):
 
@@ -1321,7 +1362,7 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('magics', 'get', 3)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
         '''行动效果: 每建造1个工会获得3分'''
         # 建筑建造行动效果已写入action_effect方法中
@@ -1332,40 +1373,36 @@ class AllEffectObject:
 
         additional_action_name = 'additional_action_round_booster_8'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 立即建造1桥'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 判断每回合一次附加行动是否未执行
-                        and self.additional_action_is_done[player_id] ==  False
-                        # 检测是否满足建桥条件
-                        and self.game_state.check(player_id, [('bridge',)])
-                    ):
-                        return [298
-                        ]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 判断每回合一次附加行动是否未执行
+                and self.additional_action_is_done[player_id] ==  False
+                # 检测是否满足建桥条件
+                and self.game_state.check(player_id, [('bridge',)])
+            ):
+                return 1 << 298
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 建造桥梁
-                    self.game_state.adjust(player_id, [('bridge',)])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 立即建造1桥'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 建造桥梁
+            yield from self.game_state.adjust(player_id, [('bridge',)])
         
         def execute_income_effect(self, executed_player_id):
             '''收入效果: 获得1书'''
             self.income_effect.extend([
                 ('book', 'get', 'any', 1)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
     class RoundBooster9(RoundBooster):
 
@@ -1377,7 +1414,7 @@ class AllEffectObject:
                 ('magics', 'get', 4),
                 ('money', 'get', 2)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
     class RoundBooster10(RoundBooster):
 
@@ -1388,7 +1425,7 @@ class AllEffectObject:
             self.income_effect.extend([
                 ('money', 'get', 6)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
     class AbilityTile1(AbilityTile):
 
@@ -1400,7 +1437,7 @@ class AllEffectObject:
                 ('ore', 'get', 1),
                 ('tracks', 'any', 1)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
     class AbilityTile2(AbilityTile):
 
@@ -1412,7 +1449,7 @@ class AllEffectObject:
                 ('score', 'get', 'board', 3),
                 ('money', 'get', 2)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
         
     class AbilityTile3(AbilityTile):
         
@@ -1424,7 +1461,7 @@ class AllEffectObject:
                 ('book', 'get', 'any', 1),
                 ('magics', 'get', 1)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
         
     class AbilityTile4(AbilityTile):
 
@@ -1437,7 +1474,7 @@ class AllEffectObject:
                 ('score', 'get', 'board', 5),
                 ('money', 'get', 2)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class AbilityTile5(AbilityTile):
 
@@ -1448,7 +1485,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('spade', 2)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class AbilityTile6(AbilityTile):
 
@@ -1457,39 +1494,36 @@ class AllEffectObject:
         def execute_immediate_effect(self, executed_player_id):
             '''立即效果: 获得2个侧楼'''
             self.game_state.players[executed_player_id].buildings[8] += 2  
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
         additional_action_name = 'additional_action_ability_tile_6'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''附加行动: 建造1个侧楼'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 检查是否还有侧楼
-                        and self.game_state.players[player_id].buildings[8] > 0
-                        # 存在未建造侧楼的已控制坐标
-                        and any(
-                            self.game_state.map_board_state.map_grid[i][j][3] == 0
-                            for i,j in self.game_state.players[player_id].controlled_map_ids
-                        )
-                    ):
-                        return [301]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 检查是否还有侧楼
+                and self.game_state.players[player_id].buildings[8] > 0
+                # 存在未建造侧楼的已控制坐标
+                and any(
+                    self.game_state.map_board_state.map_grid[i][j][3] == 0
+                    for i,j in self.game_state.players[player_id].controlled_map_ids
+                )
+            ):
+                return 1 << 301
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 选择建造位置
-                    if self.game_state.invoke_immediate_aciton(player_id, ('select_position', 'controlled', (8, None))): return 
-                    # 执行建造行动
-                    self.game_state.adjust(player_id, [('building', 'build_annex', 8, True)])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''附加行动: 建造1个侧楼'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 选择建造位置
+            yield from self.game_state.invoke_immediate_aciton(player_id, ('select_position', 'controlled', (8, None)))
+            # 执行建造行动
+            yield from self.game_state.adjust(player_id, [('building', 'build_annex', 8, True)])
 
     class AbilityTile7(AbilityTile):
 
@@ -1497,30 +1531,27 @@ class AllEffectObject:
         
         additional_action_name = 'additional_action_ability_tile_7'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 获得4魔力'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 检测该玩家每回合一次的附加行动是否已执行
-                        and self.additional_action_is_done[player_id] == False
-                    ):
-                        return [287]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 检测该玩家每回合一次的附加行动是否已执行
+                and self.additional_action_is_done[player_id] == False
+            ):
+                return 1 << 287
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 获取奖励
-                    self.game_state.adjust(player_id, [('magics', 'get', 4)])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 获得4魔力'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 获取奖励
+            yield from self.game_state.adjust(player_id, [('magics', 'get', 4)])
 
     class AbilityTile8(AbilityTile):
 
@@ -1539,7 +1570,7 @@ class AllEffectObject:
             self.pass_effect.extend([
                 ('score', 'get', 'board', 2 * self.game_state.players[executed_player_id].citys_amount)
             ])
-            super().execute_pass_effect(executed_player_id)
+            yield from super().execute_pass_effect(executed_player_id)
 
     class AbilityTile10(AbilityTile):
 
@@ -1558,7 +1589,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('building', 'build_neutral', 6, True)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
         
         def execute_income_effect(self, executed_player_id):
             '''收入效果: 获得2魔力 + 2块钱'''
@@ -1566,7 +1597,7 @@ class AllEffectObject:
                 ('magics', 'get', 2),
                 ('money', 'get', 2)
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
     class AbilityTile12(AbilityTile):
 
@@ -1577,39 +1608,36 @@ class AllEffectObject:
             self.pass_effect.extend([
                 ('score', 'get', 'board', min(self.game_state.players[executed_player_id].tracks.values()))
             ])
-            super().execute_pass_effect(executed_player_id)
+            yield from super().execute_pass_effect(executed_player_id)
 
     class ScienceTile1(ScienceTile):
         
         id = 1
         additional_action_name = 'additional_action_science_tile_1'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 获取1铲'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 判断每回合一次附加行动是否未执行
-                        and self.additional_action_is_done[player_id] ==  False
-                    ):
-                        return [299]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 判断每回合一次附加行动是否未执行
+                and self.additional_action_is_done[player_id] ==  False
+            ):
+                return 1 << 299
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 获取奖励
-                    self.game_state.adjust(player_id, [
-                        ('spade', 1)
-                    ])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 获取1铲'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 获取奖励
+            yield from self.game_state.adjust(player_id, [
+                ('spade', 1)
+            ])
         
         def execute_immediate_effect(self, executed_player_id):
             self.immediate_effect.extend([
@@ -1619,7 +1647,7 @@ class AllEffectObject:
                 ('tracks', 'engineering', 1),
                 ('tracks', 'medical', 1),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class ScienceTile2(ScienceTile):
 
@@ -1636,40 +1664,37 @@ class AllEffectObject:
             self.pass_effect.extend([
                 ('score', 'get', 'board', 2 * building_nums)
             ])
-            super().execute_pass_effect(executed_player_id)
+            yield from super().execute_pass_effect(executed_player_id)
 
     class ScienceTile3(ScienceTile):
 
         id = 3
         additional_action_name = 'additional_action_science_tile_3'
         
-        def additional_action(self, mode, player_id, args=tuple()):
-            '''每回合一次附加行动: 获取1米宝 + 3分'''
-            match mode:
-                case 'check':
-                    if (
-                        # 判断不处于初始阶段
-                        self.game_state.round != 0
-                        # 判断主要行动是否未完成
-                        and self.game_state.players[player_id].main_action_is_done == False
-                        # 判断每回合一次附加行动是否未执行
-                        and self.additional_action_is_done[player_id] ==  False
-                    ):
-                        return [300]
-                    else:
-                        return []
-                    
-                case 'execute':
+        def check_additional_action(self, player_id):
+            if (
+                # 判断不处于初始阶段
+                self.game_state.round != 0
+                # 判断主要行动是否未完成
+                and self.game_state.players[player_id].main_action_is_done == False
+                # 判断每回合一次附加行动是否未执行
+                and self.additional_action_is_done[player_id] ==  False
+            ):
+                return 1 << 300
+            else:
+                return 0
 
-                    # 设置主行动已执行
-                    self.game_state.players[player_id].main_action_is_done = True
-                    # 设置每回合一次附加行动已执行
-                    self.additional_action_is_done[player_id] = True
-                    # 获取奖励
-                    self.game_state.adjust(player_id, [
-                        ('meeple', 'get', 1),
-                        ('score', 'get', 'board', 3)
-                    ])
+        def execute_additional_action(self, player_id, args=tuple()):
+            '''每回合一次附加行动: 获取1米宝 + 3分'''
+            # 设置主行动已执行
+            self.game_state.players[player_id].main_action_is_done = True
+            # 设置每回合一次附加行动已执行
+            self.mark_additional_action_done(player_id)
+            # 获取奖励
+            yield from self.game_state.adjust(player_id, [
+                ('meeple', 'get', 1),
+                ('score', 'get', 'board', 3)
+            ])
 
     class ScienceTile4(ScienceTile):
 
@@ -1714,7 +1739,7 @@ class AllEffectObject:
                 ('score', 'get', 'board', 10),
                 ('tracks', 'any', num),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class ScienceTile5(ScienceTile):
 
@@ -1744,7 +1769,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('score', 'get', 'board', score_num),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class ScienceTile6(ScienceTile):
         
@@ -1759,7 +1784,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('score', 'get', 'board', 5 * building_num),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class ScienceTile7(ScienceTile):
         
@@ -1767,12 +1792,10 @@ class AllEffectObject:
         
         def execute_immediate_effect(self, executed_player_id):
             '''立即效果: 已有4个聚落获得8分，5个12分，6个以上18分'''
-            settlement_num = (
-                len(set(map(
-                    lambda x: x[0],
-                    self.game_state.players[executed_player_id].settlements_and_cities.values()
-                )))
-            )
+            settlement_num = len(set(
+                self.game_state.find_settlement(executed_player_id, pos)[0]
+                for pos in self.game_state.players[executed_player_id].settlements_and_cities
+            ))
             match settlement_num:
                 case i if i <= 3:
                     score_num = 0
@@ -1786,7 +1809,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('score', 'get', 'board', score_num),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class ScienceTile8(ScienceTile):
         
@@ -1798,7 +1821,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('score', 'get', 'board', 5 * city_num),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class ScienceTile9(ScienceTile):
         
@@ -1812,7 +1835,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('score', 'get', 'board', score_num),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class ScienceTile10(ScienceTile):
         
@@ -1827,7 +1850,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('score', 'get', 'board', 2 * building_num),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class ScienceTile11(ScienceTile):
 
@@ -1840,7 +1863,7 @@ class AllEffectObject:
                 ('navigation',),
                 ('shovel',),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class ScienceTile12(ScienceTile):
         
@@ -1860,7 +1883,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('score', 'get', 'board', score_num),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class ScienceTile13(ScienceTile):
         
@@ -1871,14 +1894,14 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('building', 'build_neutral', 1, True),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
         def execute_income_effect(self, executed_player_id: int):
             '''收入效果: 获取3矿'''
             self.income_effect.extend([
                 ('ore', 'get', 3),
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
     class ScienceTile14(ScienceTile):
         
@@ -1889,14 +1912,14 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('building', 'build_neutral', 2, True),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
         
         def execute_income_effect(self, executed_player_id: int):
             '''收入效果: 获取5块'''
             self.income_effect.extend([
                 ('money', 'get', 5),
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
     class ScienceTile15(ScienceTile):
         
@@ -1908,7 +1931,7 @@ class AllEffectObject:
                 ('building', 'build_neutral', 4, True),
                 ('ability_tile',)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class ScienceTile16(ScienceTile):
         
@@ -1919,14 +1942,14 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('building', 'build_neutral', 5, True),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
         def execute_income_effect(self, executed_player_id: int):
             '''收入效果: 获取2分'''
             self.income_effect.extend([
                 ('score', 'get', 'board', 2),
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
     class ScienceTile17(ScienceTile):
         
@@ -1938,14 +1961,14 @@ class AllEffectObject:
                 ('building', 'build_neutral', 3, True),
                 ('magics', 'science_tile_18', 2)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
         def execute_income_effect(self, executed_player_id: int):
             '''收入效果: 获取4转魔'''
             self.income_effect.extend([
                 ('magics', 'get', 4),
             ])
-            super().execute_income_effect(executed_player_id)
+            yield from super().execute_income_effect(executed_player_id)
 
     class ScienceTile18(ScienceTile):
         
@@ -1957,7 +1980,7 @@ class AllEffectObject:
                 ('building', 'build_neutral', 7, True),
                 ('score', 'get', 'board', 7)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class RoundScoring1(RoundScoring):
 
@@ -1966,7 +1989,7 @@ class AllEffectObject:
         def round_end(self):
             '''回合结束效果: 每有3法律轨，获得1米宝'''
             self.round_end_effect_args = ('meeple', 1, 'law', 3)
-            return super().round_end()
+            yield from super().round_end()
 
     class RoundScoring2(RoundScoring):
         
@@ -1975,7 +1998,7 @@ class AllEffectObject:
         def round_end(self):
             '''回合结束效果: 每有3银行轨，获得4转魔'''
             self.round_end_effect_args = ('magics', 4, 'bank', 3)
-            return super().round_end()
+            yield from super().round_end()
 
     class RoundScoring3(RoundScoring):
         
@@ -1984,7 +2007,7 @@ class AllEffectObject:
         def round_end(self):
             '''回合结束效果: 每有2法律轨，获得1书'''
             self.round_end_effect_args = ('book', 1, 'law', 3)
-            return super().round_end()
+            yield from super().round_end()
 
     class RoundScoring4(RoundScoring):
         
@@ -1993,7 +2016,7 @@ class AllEffectObject:
         def round_end(self):
             '''回合结束效果: 每有4医疗轨，获得1铲'''
             self.round_end_effect_args = ('spade', 1, 'medical', 4)
-            return super().round_end()
+            yield from super().round_end()
 
     class RoundScoring5(RoundScoring):
         
@@ -2002,7 +2025,7 @@ class AllEffectObject:
         def round_end(self):
             '''回合结束效果: 每有1银行轨，获得1块'''
             self.round_end_effect_args = ('money', 1, 'bank', 1)
-            return super().round_end()
+            yield from super().round_end()
 
     class RoundScoring6(RoundScoring):
         
@@ -2011,7 +2034,7 @@ class AllEffectObject:
         def round_end(self):
             '''回合结束效果: 每有2医疗轨，获得1矿'''
             self.round_end_effect_args = ('ore', 1, 'medical', 2)
-            return super().round_end()
+            yield from super().round_end()
 
     class RoundScoring7(RoundScoring):
         
@@ -2020,7 +2043,7 @@ class AllEffectObject:
         def round_end(self):
             '''回合结束效果: 每有2银行轨，获得1矿'''
             self.round_end_effect_args = ('ore', 1, 'bank', 2)
-            return super().round_end()
+            yield from super().round_end()
 
     class RoundScoring8(RoundScoring):
         
@@ -2029,7 +2052,7 @@ class AllEffectObject:
         def round_end(self):
             '''回合结束效果: 每有1工程轨，获得1块'''
             self.round_end_effect_args = ('money', 1, 'engineering', 1)
-            return super().round_end()
+            yield from super().round_end()
 
     class RoundScoring9(RoundScoring):
         
@@ -2038,7 +2061,7 @@ class AllEffectObject:
         def round_end(self):
             '''回合结束效果: 每有3医疗轨，获得1书'''
             self.round_end_effect_args = ('book', 1, 'medical', 3)
-            return super().round_end()
+            yield from super().round_end()
 
     class RoundScoring10(RoundScoring):
         
@@ -2047,7 +2070,7 @@ class AllEffectObject:
         def round_end(self):
             '''回合结束效果: 每有4工程轨，获得1铲'''
             self.round_end_effect_args = ('spade', 1, 'engineering', 4)
-            return super().round_end()
+            yield from super().round_end()
 
     class RoundScoring11(RoundScoring):
         
@@ -2056,7 +2079,7 @@ class AllEffectObject:
         def round_end(self):
             '''回合结束效果: 每有3工程轨，获得1米宝'''
             self.round_end_effect_args = ('meeple', 1, 'engineering', 3)
-            return super().round_end()
+            yield from super().round_end()
 
     class RoundScoring12(RoundScoring):
         
@@ -2065,7 +2088,7 @@ class AllEffectObject:
         def round_end(self):
             '''回合结束效果: 每有2法律轨，获得3转魔'''
             self.round_end_effect_args = ('magics', 3, 'law', 2)
-            return super().round_end()
+            yield from super().round_end()
 
     class FinalScoring1(FinalScoring):
 
@@ -2102,7 +2125,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('magics', 'get', 5),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class BookAction2(BookAction):
 
@@ -2115,7 +2138,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('tracks', 'any', 2),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class BookAction3(BookAction):
 
@@ -2128,7 +2151,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('money', 'get', 6),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class BookAction4(BookAction):
 
@@ -2138,10 +2161,10 @@ class AllEffectObject:
             return [('book', 'self', 'any', 2)], [('book', 'use', 'any', 2)]
         
         def execute_immediate_effect(self, executed_player_id):
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
             if self.game_state.players[executed_player_id].buildings[1] < 9:
-                if self.game_state.invoke_immediate_aciton(executed_player_id, ('select_position', 'controlled', (1, 'alone_or_neighbor'))): return 
-                self.game_state.adjust(executed_player_id,[('building', 'upgrade_special', 2, False)])
+                yield from self.game_state.invoke_immediate_aciton(executed_player_id, ('select_position', 'controlled', (1, 'alone_or_neighbor')))
+                yield from self.game_state.adjust(executed_player_id,[('building', 'upgrade_special', 2, False)])
             
     class BookAction5(BookAction):
 
@@ -2154,7 +2177,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('score', 'get', 'board', 2 * (4 - self.game_state.players[executed_player_id].buildings[2] + self.game_state.players[executed_player_id].buildings[10])),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class BookAction6(BookAction):
 
@@ -2167,7 +2190,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('spade',3),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
     
     class CityTileBook(CityTile):
 
@@ -2178,7 +2201,7 @@ class AllEffectObject:
                 ('book', 'get', 'any', 2),
                 ('score', 'get', 'board', 5),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class CityTileTrack(CityTile):
 
@@ -2192,7 +2215,7 @@ class AllEffectObject:
                 ('tracks', 'medical', 1),
                 ('score', 'get', 'board', 7),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
     
     class CityTileShovel(CityTile):
 
@@ -2203,7 +2226,7 @@ class AllEffectObject:
                 ('spade', 2),
                 ('score', 'get', 'board', 5),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
     
     class CityTileMagics(CityTile):
 
@@ -2214,7 +2237,7 @@ class AllEffectObject:
                 ('magics', 'get', 8),
                 ('score', 'get', 'board', 8),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
     
     class CityTileOre(CityTile):
 
@@ -2225,7 +2248,7 @@ class AllEffectObject:
                 ('ore', 'get', 3),
                 ('score', 'get', 'board', 4),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
     
     class CityTileMeeple(CityTile):
 
@@ -2236,7 +2259,7 @@ class AllEffectObject:
                 ('meeple', 'get', 1),
                 ('score', 'get', 'board', 8),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
     
     class CityTileMoney(CityTile):
 
@@ -2247,7 +2270,7 @@ class AllEffectObject:
                 ('money', 'get', 6),
                 ('score', 'get', 'board', 6),
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class MagicsActionBridge(MagicsAction):
 
@@ -2260,7 +2283,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('bridge',)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class MagicsActionMeeple(MagicsAction):
 
@@ -2273,7 +2296,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('meeple','get',1)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
         
     class MagicsActionOre(MagicsAction):
 
@@ -2286,7 +2309,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('ore','get', 2)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class MagicsActionMoney(MagicsAction):
 
@@ -2299,7 +2322,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('money','get',7)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class MagicsActionShovel1(MagicsAction):
 
@@ -2312,7 +2335,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('spade',1)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     class MagicsActionShovel2(MagicsAction):
 
@@ -2325,7 +2348,7 @@ class AllEffectObject:
             self.immediate_effect.extend([
                 ('spade',2)
             ])
-            super().execute_immediate_effect(executed_player_id)
+            yield from super().execute_immediate_effect(executed_player_id)
 
     def __init__(self, game_state: GameStateBase) -> None:
         self.game_state = game_state
@@ -2466,4 +2489,8 @@ class AllEffectObject:
         }
             
     def create_actual_object(self,typ: str, object_id: int): 
-        return self.all_object_dict[typ][object_id](self.game_state)
\ No newline at end of file
+        effect_object = self.all_object_dict[typ][object_id](self.game_state)
+        feature_offset = (list(self.all_object_dict).index(typ) * 64 + object_id) * 8
+        effect_object.owner_feature = ZOBRIST_OWNER_BASE + feature_offset
+        effect_object.action_done_feature = ZOBRIST_ACTION_DONE_BASE + feature_offset
+        return effect_object
\ No newline at end of file
@@ -1,9 +1,14 @@
 from GameState import GameStateBase
 from Agent import AgentBase
 from web_io import Silence_IO
+from CheckpointCache import CheckpointCache
+import random
 
 class GameEngine:
     """游戏引擎"""
+    # 行动记录不少于该长度时，分叉对局改为复制当前游戏状态（较短时完整重放更快，见 benchmark.py）
+    branch_copy_min_history_len = 60
+
     def __init__(self, game_args: dict):
         self.game_args = game_args                                     # 游戏参数
         self.num_players = game_args['num_players']                    # 玩家数量
@@ -12,7 +17,14 @@ class GameEngine:
         self.game_state = self.create_game_state()                     # 游戏状态
         self.game_state.effect_object()                                # 效果板块
         self.agents = self.create_agents()                             # 代理系统
-        self.next_immediate_action = []
+        self.game_flow = self.create_game_flow()                       # 游戏流程（生成器，逐个产出决策点）
+        self.pending_decision: tuple | None = None                     # 当前等待选择行动的决策点
+        self.final_scores: dict[int, int] = {}                         # 终局各玩家总分（游戏结束后可用）
+        self.turn_boundary_history_len = -1                            # 最近一次回合边界时的行动记录长度
+        self.checkpoint_cache = CheckpointCache()                      # 重放检查点缓存（分叉对局共享）
+        self.replay_history = self.action_history.copy()               # 重放对局的完整行动记录
+        self.last_checkpoint_len = 0                                   # 最近一次检查点（或重放起点）处的已执行行动数
+        self.branch_rng = random.Random(f'branch-{self.game_args['seed']}')  # 为模拟对局生成随机种子（与对局随机数生成器相互独立）
     
     def create_game_state(self):
         """创建游戏状态"""
@@ -25,13 +37,9 @@ class GameEngine:
                 return
             
             def invoke_immediate_aciton(self, player_id: int, args: tuple):
-                flag, *data = out_ref.action(player_id, 'immediate', args)
-                if flag:
-                    out_ref.next_immediate_action = data
-                    return True
-                else:
-                    out_ref.next_immediate_action = []
-                return False
+                # 产出立即行动决策点，并在传入所选行动后执行该行动
+                action_id = yield from super().invoke_immediate_aciton(player_id, args)
+                yield from out_ref.agents[player_id].action_system.execute_action('immediate', action_id)
             
         return GameState(self.num_players, self.game_args)
     
@@ -48,208 +56,266 @@ class GameEngine:
             def reproduce(self, action_history_appendix: list = []):
                 return out_ref.reproduce(action_history_appendix)
             
-            def simulate(self, action_history_appendix: list = []):
-                return out_ref.simulate(action_history_appendix)
+            def simulate(self, action_history_appendix: list = [], seed: int | None = None):
+                return out_ref.simulate(action_history_appendix, seed)
 
         return [Agent(self.game_state,i,self.game_args) for i in range(self.num_players)]
     
-    def action(self, player_id, typ= 'normal', args = tuple()):
+    def action(self, player_id, typ= 'normal', args = tuple()) -> int | None:
+        """按行动模式为决策点选择行动id（重现模式下行动记录已耗尽时返回None）"""
         match self.game_args['action_mode']:
             case 'input':
-                self.agents[player_id].need_estimate = True
-                self.agents[player_id].action_turn(typ, args)
+                # 每回合首个常规行动与每个立即行动前进行估值
+                self.agents[player_id].need_estimate = typ == 'immediate' or self.is_at_turn_boundary()
+                return self.agents[player_id].action_turn(typ, args)
             case 'simulate':
                 if self.action_history:
                     action_player_id, action_typ, action_id = self.action_history.pop(0)
                     assert action_player_id == player_id
                     assert action_typ == typ
-                    self.agents[player_id].action_step('target', typ, action_id)
+                    return self.agents[player_id].action_step('target', typ, action_id)
                 else:
-                    self.agents[player_id].action_step('random', typ, args)
-                    
-                if typ == 'normal':
-                    if self.agents[player_id].action_system.is_next_action_exist():
-                        self.action(player_id, 'normal')
-                    else:
-                        self.agents[player_id].action_system.reset_action_state()
+                    return self.agents[player_id].action_step('random', typ, args)
             case 'reproduce':
-                if self.next_immediate_action:
-                    return (True, *self.next_immediate_action)
-                
                 if self.action_history:
                     action_player_id, action_typ, action_id = self.action_history.pop(0)
                     assert action_player_id == player_id
                     assert action_typ == typ
-                    self.agents[player_id].action_step('target', typ, action_id)
-                    if typ == 'normal':
-                        if self.agents[player_id].action_system.is_next_action_exist():
-                            self.action(player_id, 'normal')
-                        else:
-                            self.agents[player_id].action_system.reset_action_state()
+                    return self.agents[player_id].action_step('target', typ, action_id)
                 else:
-                    return (True, player_id, typ, args)
-        return (False,)
+                    return None
 
     def run_game(self):
-        """运行整个游戏"""
-        
-        def initial_setup_phase():
-            """初始设置阶段"""
-            self.web_io.update_global_status("初始设置阶段")
-            
-            # 4轮选择（逆蛇轮抽）
-            for round_idx in range(1,5):
-                self.web_io.update_global_status(f"第{round_idx }轮初始设置行动")
+        """运行游戏：逐个为游戏流程的决策点选择行动，直至游戏结束并返回排名分数；
+        重现模式下行动记录耗尽时暂停于当前决策点并将其返回（可继续追加行动后通过 step 推进）"""
+        try:
+            if self.pending_decision is None:
+                self.pending_decision = next(self.game_flow)
+            while True:
+                player_id, typ, args = self.pending_decision
+                action_id = self.action(player_id, typ, args)
+                if action_id is None:
+                    return [player_id, typ, args]
+                self.pending_decision = self.game_flow.send(action_id)
+        except StopIteration as game_end:
+            self.pending_decision = None
+            return game_end.value
 
-                # 确定本轮玩家顺序
-                if round_idx % 2 == 1:
-                    current_turn_order = self.game_state.current_player_order
-                else:
-                    current_turn_order = self.game_state.pass_order
+    def step(self, action_id: int):
+        """于当前暂停的决策点执行所选行动，并推进至下一决策点（无需重放行动记录）"""
+        player_id, typ, _ = self.pending_decision
+        self.replay_history.append((player_id, typ, action_id))
+        self.action_history.append((player_id, typ, action_id))
+        return self.run_game()
+
+    def create_game_flow(self):
+        """游戏流程（生成器）：从游戏状态记录的阶段与待行动玩家队列处开始，
+        逐个产出决策点(player_id, typ, args)，并接收所选行动id"""
+        game_state = self.game_state
+
+        while True:
+            match game_state.phase:
+                case 'setup_draft':
+                    # 4轮选择（逆蛇轮抽）
+                    while game_state.turn_queue:
+                        yield from self.player_turn(game_state.turn_queue[0])
+                        game_state.turn_queue.pop(0)
 
-                for player_idx in current_turn_order:
-                    flag, *data = self.action(player_idx)
-                    if flag:
-                        return (True, *data)
+                    if game_state.setup_round < 4:
+                        game_state.setup_round += 1
+                        if game_state.setup_round == 1:
+                            self.web_io.update_global_status("初始设置阶段")
+                        self.web_io.update_global_status(f"第{game_state.setup_round}轮初始设置行动")
+                        # 确定本轮玩家顺序
+                        if game_state.setup_round % 2 == 1:
+                            game_state.turn_queue = game_state.current_player_order.copy()
+                        else:
+                            game_state.turn_queue = game_state.pass_order.copy()
+                    else:
+                        game_state.setup_choice_is_completed = True
+                        self.web_io.update_global_status("初始建筑摆放阶段")
+                        game_state.turn_queue = self.setup_build_order()
+                        game_state.phase = 'setup_build'
+
+                case 'setup_build':
+                    while game_state.turn_queue:
+                        yield from self.player_turn(game_state.turn_queue[0])
+                        game_state.turn_queue.pop(0)
+                    game_state.phase = 'setup_effect'
+
+                case 'setup_effect':
+                    self.web_io.update_global_status("初始阶段效果结算")
+                    for player_idx in game_state.pass_order:
+                        cur_player_setup_list = game_state.players[player_idx].setup_effect_list
+                        if cur_player_setup_list:
+                            yield from cur_player_setup_list.pop(0)(player_idx)
+
+                    # 将初始未选的回合助推板的获取立即效果加一块钱
+                    for effect_object in game_state.all_available_object_dict['round_booster'].values():
+                        yield from effect_object.round_end()
                     
-            self.game_state.setup_choice_is_completed = True    
-
-            self.web_io.update_global_status("初始建筑摆放阶段")
-            build_order = []
-            faction_8_owner_id = -1
-            faction_10_owner_id = -1
-
-            for idx in range(self.num_players):
-                if self.game_state.players[idx].faction_id == 8:
-                    faction_8_owner_id = idx
-                if self.game_state.players[idx].faction_id == 10:
-                    faction_10_owner_id = idx
-            match faction_8_owner_id, faction_10_owner_id:
-                case -1, -1:
-                    build_order = self.game_state.pass_order + self.game_state.current_player_order
-                case _, -1:
-                    build_order = [idx for idx in self.game_state.pass_order + self.game_state.current_player_order if idx != faction_8_owner_id] + [faction_8_owner_id]
-                case -1, _:
-                    build_order = self.game_state.pass_order + self.game_state.current_player_order + [faction_10_owner_id]
-                case _, _:
-                    build_order = [idx for idx in self.game_state.pass_order + self.game_state.current_player_order if idx != faction_8_owner_id] + [faction_10_owner_id, faction_8_owner_id]
-
-            for player_idx in build_order:
-                flag, *data = self.action(player_idx)
-                if flag:
-                    return (True, *data)
-
-            self.web_io.update_global_status("初始阶段效果结算")
-            for player_idx in self.game_state.pass_order:
-                cur_player_setup_list = self.game_state.players[player_idx].setup_effect_list
-                if cur_player_setup_list:
-                    cur_player_setup_list.pop(0)(player_idx)
-                    if self.next_immediate_action:
-                        return (True, *self.next_immediate_action)
-
-            # 将初始未选的回合助推板的获取立即效果加一块钱
-            for effect_object in self.game_state.all_available_object_dict['round_booster'].values():
-                effect_object.round_end()
-            
-            self.game_state.current_player_order = self.game_state.pass_order.copy()
+                    game_state.current_player_order = game_state.pass_order.copy()
 
-            self.web_io.round_update(self.game_state.round)
-            return (False,)
+                    self.web_io.round_update(game_state.round)
+                    game_state.round = 1
+                    game_state.phase = 'income'
 
-        def execute_formal_round():
-            # 备份本回合初始时的玩家行动顺序
-            self.current_round_init_player_order = self.game_state.current_player_order.copy()
+                case 'income':
+                    # 备份本回合初始时的玩家行动顺序
+                    current_round_init_player_order = game_state.current_player_order.copy()
 
-            self.game_state.pass_order.clear()
-            current_player_order = self.game_state.current_player_order.copy()      
+                    game_state.pass_order.clear()
+                    current_player_order = game_state.current_player_order.copy()      
 
-            self.web_io.update_global_status(f'第{self.game_state.round}轮收入阶段\n玩家行动顺序：{','.join(map(lambda x:str(x+1),current_player_order))}')
+                    self.web_io.update_global_status(f'第{game_state.round}轮收入阶段\n玩家行动顺序：{','.join(map(lambda x:str(x+1),current_player_order))}')
 
-            for player_idx in self.current_round_init_player_order:
-                # print(self.game_state.players[player_idx].income_effect_list)
-                for income_effect in self.game_state.players[player_idx].income_effect_list:
-                    income_effect(player_idx)
-                    if self.next_immediate_action:
-                        return (True, *self.next_immediate_action)
-            
-            self.web_io.update_global_status(f'第{self.game_state.round}轮行动阶段\n玩家行动顺序：{','.join(map(lambda x:str(x+1),current_player_order))}')
-            while current_player_order:
-                for player_idx in current_player_order:
-                    flag, *data = self.action(player_idx)
-                    if flag:
-                        return (True, *data)
-                current_player_order = self.game_state.current_player_order.copy()
-
-            self.web_io.update_global_status(f'第{self.game_state.round}轮回合结束结算阶段\n玩家行动顺序：{','.join(map(lambda x:str(x+1),self.game_state.pass_order))}')
-
-            for effect_object_typ in [
-                # 回合结束奖励，并添加下一回合的回合计分
-                'round_scoring', 'final_scoring',
-                # 清空以下板块的每回合一次行动标记
-                'book_action', 'magics_action', 'faction', 'palace_tile', 'ability_tile', 'science_tile', 
-                # 并将未选的回合助推板的获取立即效果加一块钱
-                'round_booster'
-            ]:
-                for effect_object in self.game_state.all_available_object_dict[effect_object_typ].values():
-                    effect_object.round_end()
-                    if self.next_immediate_action:
-                        return (True, *self.next_immediate_action)
-                
-            self.game_state.current_player_order = self.game_state.pass_order.copy()
-
-            self.web_io.round_update(self.game_state.round)
-            return (False,)
-        
-        self.current_round_init_player_order = []  # 当前轮初始玩家行动顺序
-
-        # 初始设置阶段
-        flag, *data = initial_setup_phase()
-        if flag:
-            return data
-
-        # print(f"\n=== 正式轮次阶段 ===")
-        for round_idx in range(1, 7):
-            # 设置游戏当前轮次
-            self.game_state.round = round_idx  
-            # print(f"\n--- 第{round_idx}轮 ---")
-            
-            flag, *data = execute_formal_round()
-            if flag:
-                return data
+                    for player_idx in current_round_init_player_order:
+                        for income_effect in game_state.players[player_idx].income_effect_list:
+                            yield from income_effect(player_idx)
+                    
+                    self.web_io.update_global_status(f'第{game_state.round}轮行动阶段\n玩家行动顺序：{','.join(map(lambda x:str(x+1),current_player_order))}')
+                    game_state.turn_queue = current_player_order
+                    game_state.phase = 'action'
 
-        # print("\n=== 终局结算阶段 ===\n")
-        rank = sorted(self.game_state.calculate_players_total_score().items(),key=lambda x:x[1],reverse=True)
-        
-        return tuple(map(lambda x:x[1],rank))
-        return (None,None)
+                case 'action':
+                    while game_state.turn_queue:
+                        yield from self.player_turn(game_state.turn_queue[0])
+                        game_state.turn_queue.pop(0)
 
-    def reproduce(self, action_history_appendix: list):
-        reproduce_args = {
+                    if game_state.current_player_order:
+                        # 仍有玩家未略过，开始新一圈行动
+                        game_state.turn_queue = game_state.current_player_order.copy()
+                    else:
+                        game_state.phase = 'round_end'
+
+                case 'round_end':
+                    self.web_io.update_global_status(f'第{game_state.round}轮回合结束结算阶段\n玩家行动顺序：{','.join(map(lambda x:str(x+1),game_state.pass_order))}')
+
+                    for effect_object_typ in [
+                        # 回合结束奖励，并添加下一回合的回合计分
+                        'round_scoring', 'final_scoring',
+                        # 清空以下板块的每回合一次行动标记
+                        'book_action', 'magics_action', 'faction', 'palace_tile', 'ability_tile', 'science_tile', 
+                        # 并将未选的回合助推板的获取立即效果加一块钱
+                        'round_booster'
+                    ]:
+                        for effect_object in game_state.all_available_object_dict[effect_object_typ].values():
+                            yield from effect_object.round_end()
+                        
+                    game_state.current_player_order = game_state.pass_order.copy()
+
+                    self.web_io.round_update(game_state.round)
+                    if game_state.round < 6:
+                        game_state.round += 1
+                        game_state.phase = 'income'
+                    else:
+                        game_state.phase = 'game_end'
+
+                case 'game_end':
+                    # print("\n=== 终局结算阶段 ===\n")
+                    self.final_scores = game_state.calculate_players_total_score()
+                    rank = sorted(self.final_scores.items(),key=lambda x:x[1],reverse=True)
+                    return tuple(map(lambda x:x[1],rank))
+
+    def player_turn(self, player_id: int):
+        """玩家回合（生成器）：玩家依次执行常规行动，直至本回合无可继续的行动"""
+        self.turn_boundary()
+        action_system = self.agents[player_id].action_system
+        while True:
+            action_id = yield player_id, 'normal', tuple()
+            yield from action_system.execute_action('normal', action_id)
+            if not action_system.is_next_action_exist():
+                # 重置当前行动状态为每轮初始状态
+                action_system.reset_action_state()
+                return
+
+    def setup_build_order(self) -> list[int]:
+        """确定初始建筑摆放顺序"""
+        build_order = []
+        faction_8_owner_id = -1
+        faction_10_owner_id = -1
+
+        for idx in range(self.num_players):
+            if self.game_state.players[idx].faction_id == 8:
+                faction_8_owner_id = idx
+            if self.game_state.players[idx].faction_id == 10:
+                faction_10_owner_id = idx
+        match faction_8_owner_id, faction_10_owner_id:
+            case -1, -1:
+                build_order = self.game_state.pass_order + self.game_state.current_player_order
+            case _, -1:
+                build_order = [idx for idx in self.game_state.pass_order + self.game_state.current_player_order if idx != faction_8_owner_id] + [faction_8_owner_id]
+            case -1, _:
+                build_order = self.game_state.pass_order + self.game_state.current_player_order + [faction_10_owner_id]
+            case _, _:
+                build_order = [idx for idx in self.game_state.pass_order + self.game_state.current_player_order if idx != faction_8_owner_id] + [faction_10_owner_id, faction_8_owner_id]
+        return build_order
+
+    def turn_boundary(self):
+        """到达回合边界（某玩家常规行动前）时，记录当前位置，或为重放对局存储检查点"""
+        match self.game_args['action_mode']:
+            case 'input':
+                # 记录回合边界，供分叉对局直接复制当前游戏状态
+                self.turn_boundary_history_len = len(self.action_history)
+            case 'reproduce' | 'simulate':
+                # 模拟对局执行完行动记录后转为随机行动，此后的状态不再对应行动记录前缀
+                if self.game_args['action_mode'] == 'simulate' and not self.action_history:
+                    return
+                applied_len = len(self.replay_history) - len(self.action_history)
+                # 距上一检查点的重放足够长时才存储，使快照开销低于其节省的重放开销
+                if applied_len - self.last_checkpoint_len >= self.branch_copy_min_history_len:
+                    self.checkpoint_cache.store(self.replay_history[:applied_len], self.game_state.snapshot())
+                    self.last_checkpoint_len = applied_len
+
+    def is_at_turn_boundary(self) -> bool:
+        """判断当前对局是否停留在回合边界（某玩家常规行动前，且此后未执行任何行动）"""
+        return self.turn_boundary_history_len == len(self.game_args['action_history'])
+
+    def branch(self, action_mode: str, action_history_appendix: list) -> 'GameEngine':
+        """从当前对局分叉出静默对局，并载入待执行的追加行动"""
+        action_history = self.game_args['action_history'].copy() + action_history_appendix.copy()
+        branch_args = {
             'num_players': self.game_args['num_players'],
-            'setup_mode': 'target',
+            # 随机初始设置由对局种子决定，分叉对局以相同种子即可复现
+            'setup_mode': 'random' if self.game_args['setup_mode'] == 'random' else 'target',
             'setup_tile_args' : self.game_args['setup_tile_args'],
-            'setup_player_order_args': self.game_args['setup_player_order_args'].copy(),
-            'action_history': self.game_args['action_history'].copy() + action_history_appendix.copy(),
-            'action_mode': 'reproduce',
+            'setup_player_order_args': self.game_state.init_player_order.copy(),
+            'seed': self.game_args['seed'],
+            'action_history': action_history,
+            'action_mode': action_mode,
             'web_io': Silence_IO(),
         }
-        reproduce_game = GameEngine(reproduce_args)
+        branch_game = GameEngine(branch_args)
+        branch_game.checkpoint_cache = self.checkpoint_cache
+
+        # 选择最深的可用起点：当前对局的回合边界，或已缓存的最深行动记录前缀
+        current_len = len(self.game_args['action_history'])
+        cached_len, snapshot = self.checkpoint_cache.lookup(action_history)
+        if self.is_at_turn_boundary() and current_len >= max(cached_len, self.branch_copy_min_history_len):
+            # 处于回合边界时，仅需复制一次当前游戏状态，再执行追加行动
+            self.game_state.copy_to(branch_game.game_state)
+            start_len = current_len
+        elif snapshot is not None:
+            branch_game.game_state.restore(snapshot)
+            start_len = cached_len
+        else:
+            # 否则从初始设置开始重放全部行动记录
+            start_len = 0
+        del branch_game.action_history[:start_len]
+        branch_game.last_checkpoint_len = start_len
+        return branch_game
+
+    def reproduce(self, action_history_appendix: list):
+        reproduce_game = self.branch('reproduce', action_history_appendix)
         next_action_data = reproduce_game.run_game()
         return {
             'next_action': next_action_data,
             'reproduce_game': reproduce_game,
         }
     
-    def simulate(self, action_history_appendix: list):
-        simulate_args = {
-            'num_players': self.game_args['num_players'],
-            'setup_mode': 'target',
-            'setup_tile_args' : self.game_args['setup_tile_args'],
-            'setup_player_order_args': self.game_args['setup_player_order_args'].copy(),
-            'action_history': self.game_args['action_history'].copy() + action_history_appendix.copy(),
-            'action_mode': 'simulate',
-            'web_io': Silence_IO(),
-        }
-        simulate_game = GameEngine(simulate_args)
+    def simulate(self, action_history_appendix: list, seed: int | None = None):
+        simulate_game = self.branch('simulate', action_history_appendix)
+        # 每次模拟使用新的随机种子（指定时可复现）
+        simulate_game.game_state.rng.seed(self.branch_rng.getrandbits(64) if seed is None else seed)
         simulate_game.run_game()
         return {}
\ No newline at end of file
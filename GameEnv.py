@@ -0,0 +1,104 @@
+from ActionSystem import mask_to_action_ids
+from GameEngine import GameEngine
+from GameState import GAME_PHASES
+from DetailedAction import NUM_ACTIONS
+from web_io import Silence_IO
+import random
+
+class GameEnv:
+    """单局训练环境：reset 开始新对局，step 于当前决策点执行行动并推进至下一决策点"""
+    # 行动掩码长度（直接以行动id为下标，下标0不对应任何行动）
+    num_actions = NUM_ACTIONS
+    # 游戏阶段（观测向量中以下标表示）
+    phases = GAME_PHASES
+
+    def __init__(self, num_players: int = 3):
+        self.num_players = num_players                                 # 玩家数量
+        self.game_engine: GameEngine | None = None                     # 当前对局引擎
+        self.decision: tuple | None = None                             # 当前决策点(player_id, typ, args)，对局结束时为None
+        self.action_mask: list[bool] = []                              # 当前决策点的合法行动掩码
+        self.available_action_ids: list[int] = []                      # 当前决策点的合法行动id（升序）
+        self.available_action_bits = 0                                # 当前决策点的合法行动整数位掩码（第id位为1表示合法）
+        self.done = True                                               # 当前对局是否已结束
+
+    def reset(self, seed: int | None = None, setup_tile_args: tuple | None = None, setup_player_order_args: list | None = None):
+        """开始新对局（未指定初始设置板块时随机设置，未指定种子时随机生成），返回首个决策点及其合法行动掩码"""
+        if seed is None:
+            seed = random.getrandbits(64)
+        if setup_player_order_args is None:
+            setup_player_order_args = random.Random(seed).sample(range(self.num_players), self.num_players)
+        game_args = {
+            'num_players': self.num_players,
+            'setup_mode': 'random' if setup_tile_args is None else 'target',
+            'setup_tile_args': setup_tile_args,
+            'setup_player_order_args': list(setup_player_order_args),
+            'seed': seed,
+            'action_history': [],
+            'action_mode': 'input',                                    # 行动由环境传入，行动记录即实际对局记录
+            'web_io': Silence_IO(),
+            'need_estimate': False,
+        }
+        self.game_engine = GameEngine(game_args)
+        self.done = False
+        self.advance(next(self.game_engine.game_flow))
+        return self.decision, self.action_mask
+
+    def step(self, action_id: int):
+        """于当前决策点执行行动，返回(下一决策点, 合法行动掩码, 各玩家终局总分, 是否结束)；
+        对局未结束时终局总分为None"""
+        if self.done:
+            raise RuntimeError('对局已结束，请先调用 reset')
+        if not (0 < action_id < self.num_actions and self.action_mask[action_id]):
+            raise ValueError(f'非法行动id: {action_id}')
+
+        self.game_engine.action_history.append((self.decision[0], self.decision[1], action_id))
+        try:
+            self.advance(self.game_engine.game_flow.send(action_id))
+        except StopIteration:
+            self.done = True
+            self.decision = self.game_engine.pending_decision = None
+            self.action_mask = [False] * self.num_actions
+            self.available_action_ids = []
+            self.available_action_bits = 0
+            final_scores = self.game_engine.final_scores
+            return None, self.action_mask, [final_scores[player_id] for player_id in range(self.num_players)], True
+        return self.decision, self.action_mask, None, False
+
+    def advance(self, decision: tuple):
+        """停留于新的决策点，并计算其合法行动掩码"""
+        player_id, typ, args = decision
+        self.decision = self.game_engine.pending_decision = decision
+        self.available_action_bits = self.game_engine.agents[player_id].action_system.get_available_action_mask(typ, args)
+        self.available_action_ids = mask_to_action_ids(self.available_action_bits)
+        self.action_mask = [False] * self.num_actions
+        for action_id in self.available_action_ids:
+            self.action_mask[action_id] = True
+
+    def legal_action_ids(self) -> list[int]:
+        """当前决策点的合法行动id列表"""
+        return self.available_action_ids.copy()
+
+    def observation(self) -> list[int]:
+        """当前对局的定长整数观测向量：全局信息、各玩家状态（按玩家id）、各地块状态（按行优先）"""
+        game_state = self.game_engine.game_state
+        player_id, typ = self.decision[:2] if self.decision is not None else (-1, None)
+        obs = [
+            game_state.round,
+            game_state.setup_round,
+            self.phases.index(game_state.phase),
+            player_id,
+            typ == 'immediate',
+        ]
+        for player in game_state.players:
+            obs.extend((player.planning_card_id, player.faction_id, player.palace_tile_id))
+            obs.extend(player.resources.values())
+            obs.extend(player.buildings.values())
+            obs.extend(player.tracks.values())
+            obs.extend(player.magics.values())
+            obs.extend((
+                player.navigation_level, player.shovel_level, player.citys_amount,
+                player.main_action_is_done, player.ispass, player.boardscore,
+            ))
+        # 地图网格字节数组已按行优先依次存放各地块的地形、控制玩家id、建筑id、侧楼数量与是否中立建筑
+        obs.extend(game_state.map_board_state.cells)
+        return obs
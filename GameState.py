@@ -1,18 +1,449 @@
 import random
-import time
 from typing import Callable
-from web_io import GamePanel
-from collections import Counter, defaultdict, deque
+from web_io import GamePanel, Silence_IO
+from collections import Counter
+from collections.abc import MutableMapping, Sequence
+from array import array
 import copy
+import functools
+import itertools
+
+# 地图尺寸（9行13列的错位六边形网格）
+MAP_HEIGHT, MAP_WIDTH = 9, 13
+
+def build_hex_neighbors() -> tuple[tuple[tuple[tuple[int, int], ...], ...], ...]:
+    """预先计算各地块在边界内的相邻地块坐标，按 HEX_NEIGHBORS[i][j] 索引"""
+    return tuple(
+        tuple(
+            tuple(
+                (i + dx, j + dy)
+                for dx, dy in [(-1,i%2-1),(-1,i%2),(0,-1),(0,1),(1,i%2-1),(1,i%2)]
+                if 0 <= i + dx < MAP_HEIGHT and 0 <= j + dy < MAP_WIDTH
+            ) for j in range(MAP_WIDTH)
+        ) for i in range(MAP_HEIGHT)
+    )
+
+# 各地块的相邻地块坐标（导入时计算，所有地图相关方法共用）
+HEX_NEIGHBORS = build_hex_neighbors()
+
+# 可建桥的地块坐标及其桥对侧地块坐标
+BRIDGE_PARTNERS: dict[tuple[int, int], tuple[tuple[int, int], ...]] = {
+    (0, 2) : ((1, 0), (2, 2)) ,
+    (0, 8) : ((1, 6),) ,
+    (0, 11) : ((1, 12),) ,
+    (1, 0) : ((0, 2),) ,
+    (1, 3) : ((2, 2),) ,
+    (1, 6) : ((0, 8),) ,
+    (1, 10) : ((2, 12), (3, 10)) ,
+    (1, 12) : ((0, 11),) ,
+    (2, 2) : ((0, 2), (1, 3)) ,
+    (2, 4) : ((3, 2),) ,
+    (2, 6) : ((3, 7),) ,
+    (2, 9) : ((3, 7), (4, 9), (3, 10)) ,
+    (2, 12) : ((1, 10),) ,
+    (3, 2) : ((2, 4),) ,
+    (3, 4) : ((4, 3), (5, 4)) ,
+    (3, 5) : ((4, 7), (5, 5)) ,
+    (3, 7) : ((2, 6), (2, 9)) ,
+    (3, 10) : ((1, 10), (2, 9)) ,
+    (4, 2) : ((6, 2),) ,
+    (4, 3) : ((3, 4), (5, 4), (6, 3)) ,
+    (4, 7) : ((3, 5), (5, 5)) ,
+    (4, 9) : ((2, 9),) ,
+    (5, 0) : ((6, 2),) ,
+    (5, 4) : ((3, 4), (4, 3), (6, 3)) ,
+    (5, 5) : ((3, 5), (4, 7)) ,
+    (5, 7) : ((6, 6), (7, 7)) ,
+    (5, 8) : ((7, 8),) ,
+    (5, 10) : ((7, 10),) ,
+    (5, 11) : ((7, 11),) ,
+    (6, 0) : ((7, 1), (8, 0)) ,
+    (6, 2) : ((4, 2), (5, 0)) ,
+    (6, 3) : ((4, 3), (5, 4), (7, 4)) ,
+    (6, 6) : ((5, 7),) ,
+    (7, 1) : ((6, 0),) ,
+    (7, 2) : ((8, 4),) ,
+    (7, 4) : ((6, 3),) ,
+    (7, 7) : ((5, 7),) ,
+    (7, 8) : ((5, 8),) ,
+    (7, 10) : ((5, 10),) ,
+    (7, 11) : ((5, 11),) ,
+    (8, 0) : ((6, 0),) ,
+    (8, 4) : ((7, 2),) ,
+}
+
+# 位棋盘：以117位整数表示地块集合，第 i*MAP_WIDTH+j 位对应地块(i,j)
+POS_BITS = tuple(tuple(1 << (i * MAP_WIDTH + j) for j in range(MAP_WIDTH)) for i in range(MAP_HEIGHT))
+# 全部地块
+FULL_MASK = (1 << (MAP_HEIGHT * MAP_WIDTH)) - 1
+# 除首列/末列外的地块（左右移位时防止跨行）
+NOT_FIRST_COL_MASK = FULL_MASK & ~sum(POS_BITS[i][0] for i in range(MAP_HEIGHT))
+NOT_LAST_COL_MASK = FULL_MASK & ~sum(POS_BITS[i][MAP_WIDTH - 1] for i in range(MAP_HEIGHT))
+# 偶数行/奇数行地块（错位六边形网格中，两者斜向相邻地块的列偏移不同）
+EVEN_ROW_MASK = sum(POS_BITS[i][j] for i in range(0, MAP_HEIGHT, 2) for j in range(MAP_WIDTH))
+ODD_ROW_MASK = FULL_MASK & ~EVEN_ROW_MASK
+# 各地块的相邻地块集合，按 NEIGHBOR_MASKS[i][j] 索引
+NEIGHBOR_MASKS = tuple(
+    tuple(sum(POS_BITS[p][q] for p, q in HEX_NEIGHBORS[i][j]) for j in range(MAP_WIDTH))
+    for i in range(MAP_HEIGHT)
+)
+
+def positions_to_mask(positions) -> int:
+    """地块坐标集合 -> 位棋盘"""
+    mask = 0
+    for i, j in positions:
+        mask |= POS_BITS[i][j]
+    return mask
+
+def mask_to_positions(mask: int) -> list[tuple[int, int]]:
+    """位棋盘 -> 地块坐标列表（按行优先升序）"""
+    positions = []
+    while mask:
+        low_bit = mask & -mask
+        positions.append(divmod(low_bit.bit_length() - 1, MAP_WIDTH))
+        mask ^= low_bit
+    return positions
+
+def dilate_mask(mask: int) -> int:
+    """位棋盘膨胀：返回与集合内任一地块相邻的全部地块（以移位代替逐格遍历相邻地块）"""
+    # 同行左右相邻
+    dilated = ((mask & NOT_LAST_COL_MASK) << 1) | ((mask & NOT_FIRST_COL_MASK) >> 1)
+    # 上下两行同列相邻（奇偶行均有）
+    dilated |= (mask << MAP_WIDTH) | (mask >> MAP_WIDTH)
+    # 偶数行的斜向相邻地块位于前一列，奇数行的位于后一列
+    even_mask = mask & EVEN_ROW_MASK & NOT_FIRST_COL_MASK
+    odd_mask = mask & ODD_ROW_MASK & NOT_LAST_COL_MASK
+    dilated |= (even_mask << (MAP_WIDTH - 1)) | (even_mask >> (MAP_WIDTH + 1))
+    dilated |= (odd_mask << (MAP_WIDTH + 1)) | (odd_mask >> (MAP_WIDTH - 1))
+    return dilated & FULL_MASK
+
+# 可建桥的地块
+BRIDGE_MASK = positions_to_mask(BRIDGE_PARTNERS)
+
+# 地形网格（每个元素是地形类型ID，0为水域；水域在对局中不会改变）
+TERRAIN_GRID = (
+    (4,0,3,2,1,6,5,0,3,2,1,7,0),
+    (5,0,0,4,3,4,7,0,4,5,3,0,2),
+    (6,3,2,0,5,1,2,0,0,6,0,0,6),
+    (7,5,6,0,7,6,0,2,0,0,1,5,4),
+    (1,4,1,7,0,0,0,4,5,3,6,7,1),
+    (2,0,0,0,3,5,0,7,1,0,2,3,6),
+    (3,0,1,2,0,4,1,0,0,0,0,0,0),
+    (0,7,3,0,6,2,7,6,2,3,4,2,0),
+    (4,5,6,0,7,5,1,3,4,5,6,7,1),
+)
+
+def build_navigation_table() -> tuple[bytes, tuple]:
+    """计算陆地地块两两之间的航行距离（途经水域格数，直接相邻为0，不可达为255），
+    以及各航行预算下自各陆地地块可抵达的陆地地块位棋盘"""
+    water_mask = positions_to_mask((i, j) for i in range(MAP_HEIGHT) for j in range(MAP_WIDTH) if TERRAIN_GRID[i][j] == 0)
+    distances = bytearray([255]) * (MAP_HEIGHT * MAP_WIDTH) ** 2
+    # 各地块在航行距离恰为d时新抵达的陆地地块
+    reached_masks_by_distance = {}
+    for i in range(MAP_HEIGHT):
+        for j in range(MAP_WIDTH):
+            if TERRAIN_GRID[i][j] == 0:
+                continue
+            origin_idx = i * MAP_WIDTH + j
+            reachable_mask = 0
+            visited_water_mask = 0
+            frontier_mask = POS_BITS[i][j]
+            navigation_distance = 0
+            # 逐层经水域向外膨胀，首次到达的陆地即为其最短航行距离
+            while frontier_mask:
+                neighbor_mask = dilate_mask(frontier_mask)
+                new_land_mask = neighbor_mask & ~water_mask & ~reachable_mask
+                reachable_mask |= new_land_mask
+                reached_masks_by_distance.setdefault(navigation_distance, {})[(i, j)] = new_land_mask
+                for p, q in mask_to_positions(new_land_mask):
+                    distances[origin_idx * MAP_HEIGHT * MAP_WIDTH + p * MAP_WIDTH + q] = navigation_distance
+                frontier_mask = neighbor_mask & water_mask & ~visited_water_mask
+                visited_water_mask |= frontier_mask
+                navigation_distance += 1
+
+    # 航行预算k下可抵达的陆地 = 航行距离不超过k的陆地（超过最大航行距离的预算与之相同）
+    navigation_masks = []
+    cumulative = [[0] * MAP_WIDTH for _ in range(MAP_HEIGHT)]
+    for navigation_distance in range(len(reached_masks_by_distance)):
+        for (i, j), new_land_mask in reached_masks_by_distance[navigation_distance].items():
+            cumulative[i][j] |= new_land_mask
+        navigation_masks.append(tuple(tuple(row) for row in cumulative))
+    return bytes(distances), tuple(navigation_masks)
+
+# 陆地地块两两之间的航行距离，以及 NAVIGATION_MASKS[航行预算][i][j]：自(i,j)可抵达的陆地地块（导入时计算，约4ms）
+NAVIGATION_DISTANCES, NAVIGATION_MASKS = build_navigation_table()
+
+# 终局大链与科技轨排名奖励分（第1、2、3名）及计分的科技轨
+CHAIN_PRIZES = (18, 12, 6)
+TRACK_PRIZES = (8, 4, 2)
+TRACK_TYPES = ('bank', 'law', 'engineering', 'medical')
+
+@functools.cache
+def rank_scores(values: tuple[int, ...], prizes: tuple[int, ...]) -> tuple[int, ...]:
+    """按数值从高到低排名分配奖励分（并列者平分所占名次的奖励之和，向下取整），返回按玩家id排列的得分；
+    结果按数值组合缓存"""
+    num_players = len(values)
+    ranked_player_ids = sorted(range(num_players), key=lambda player_id: values[player_id], reverse=True)
+    scores = [0] * num_players
+    order_id = 1
+    while order_id <= min(len(prizes), num_players):
+        for tie_place in range(order_id+1, num_players+1):
+            if values[ranked_player_ids[order_id-1]] > values[ranked_player_ids[tie_place-1]]:
+                break
+        else:
+            tie_place = num_players + 1
+        get_score_num = sum(prizes[order_id-1: tie_place-1]) // (tie_place - order_id)
+        for rank in range(order_id, tie_place):
+            scores[ranked_player_ids[rank-1]] = get_score_num
+        order_id = tie_place
+    return tuple(scores)
+
+def navigation_distance(pos: tuple[int, int], target_pos: tuple[int, int]) -> int:
+    """两陆地地块之间的航行距离（途经水域格数，直接相邻为0，不可达为255）"""
+    return NAVIGATION_DISTANCES[(pos[0] * MAP_WIDTH + pos[1]) * MAP_HEIGHT * MAP_WIDTH + target_pos[0] * MAP_WIDTH + target_pos[1]]
+
+def is_navigable(pos: tuple[int, int], target_pos: tuple[int, int], navigation_budget: int) -> bool:
+    """在给定航行预算下，自陆地地块pos能否抵达陆地地块target_pos"""
+    return navigation_distance(pos, target_pos) <= navigation_budget
+
+# 玩家计数器数组布局：资源、建筑、科技轨、科技轨排名分、魔力及标量计数器依次连续存放于 PlayerState.counters
+RESOURCE_KEYS = ('money', 'ore', 'bank_book', 'law_book', 'engineering_book', 'medical_book', 'meeples', 'all_meeples', 'all_bridges')
+BUILDING_KEYS = tuple(range(1, 14))
+MAGIC_KEYS = (1, 2, 3)
+SCALAR_COUNTER_KEYS = (
+    'navigation_level', 'shovel_level', 'boardscore', 'trackscore', 'chainscore', 'resourcescore',
+    'citys_amount', 'tracks_over_7_amount', 'largest_chain',
+)
+
+def counter_index(keys: tuple, offset: int) -> dict:
+    """计数器键 -> 计数器数组下标（自offset起连续排列）"""
+    return {key: offset + idx for idx, key in enumerate(keys)}
+
+RESOURCE_INDEX = counter_index(RESOURCE_KEYS, 0)
+BUILDING_INDEX = counter_index(BUILDING_KEYS, len(RESOURCE_INDEX))
+TRACK_INDEX = counter_index(TRACK_TYPES, len(RESOURCE_INDEX) + len(BUILDING_INDEX))
+TRACK_RANK_INDEX = counter_index(TRACK_TYPES, len(RESOURCE_INDEX) + len(BUILDING_INDEX) + len(TRACK_INDEX))
+MAGIC_INDEX = counter_index(MAGIC_KEYS, len(RESOURCE_INDEX) + len(BUILDING_INDEX) + 2 * len(TRACK_INDEX))
+SCALAR_COUNTER_INDEX = counter_index(SCALAR_COUNTER_KEYS, len(RESOURCE_INDEX) + len(BUILDING_INDEX) + 2 * len(TRACK_INDEX) + len(MAGIC_INDEX))
+NUM_COUNTERS = len(RESOURCE_INDEX) + len(BUILDING_INDEX) + 2 * len(TRACK_INDEX) + len(MAGIC_INDEX) + len(SCALAR_COUNTER_INDEX)
+
+# 常用计数器下标
+MONEY, ORE, BANK_BOOK, LAW_BOOK, ENGINEERING_BOOK, MEDICAL_BOOK, MEEPLES, ALL_MEEPLES, ALL_BRIDGES = RESOURCE_INDEX.values()
+BOOK_INDEX = {typ: RESOURCE_INDEX[f'{typ}_book'] for typ in TRACK_TYPES}
+MAGIC_2, MAGIC_3 = MAGIC_INDEX[2], MAGIC_INDEX[3]
+# 各科技轨终局排名分在计数器数组中连续存放
+TRACK_RANK_START = min(TRACK_RANK_INDEX.values())
+TRACK_RANK_STOP = TRACK_RANK_START + len(TRACK_RANK_INDEX)
+(
+    NAVIGATION_LEVEL, SHOVEL_LEVEL, BOARDSCORE, TRACKSCORE, CHAINSCORE, RESOURCESCORE,
+    CITYS_AMOUNT, TRACKS_OVER_7_AMOUNT, LARGEST_CHAIN,
+) = SCALAR_COUNTER_INDEX.values()
+
+@functools.cache
+def compile_cost(items: tuple) -> tuple[tuple[tuple[int, int], ...], int, tuple]:
+    """将状态检查列表（元组形式）编译为计数器需求：(各计数器下标及其最低数量, 四类书合计的最低数量, 其余需查询游戏状态的检查项)；
+    同一计数器的多项需求取最大值，编译结果按检查列表缓存"""
+    requirements: dict[int, int] = {}
+    book_total = 0
+    special_items = []
+    for check_item, *check_args in items:
+        match check_item, check_args:
+            case 'money', [num]:
+                idx = MONEY
+            case 'ore', [num]:
+                idx = ORE
+            case 'book', ['self', 'any', num]:
+                book_total = max(book_total, num)
+                continue
+            case 'book', ['self', typ, num]:
+                idx = BOOK_INDEX[typ]
+            case 'meeple', ['self', num]:
+                idx = MEEPLES
+            case 'meeple', ['all', num]:
+                idx = ALL_MEEPLES
+            case 'magics', [zone, num]:
+                idx = MAGIC_INDEX[zone]
+            case 'score', [num]:
+                idx = BOARDSCORE
+            case 'building', [building_id]:
+                idx, num = BUILDING_INDEX[building_id], 1
+            case ('book', ['all', _, _]) | ('tracks' | 'bridge' | 'spade', _):
+                # 公共书堆、科技轨、桥与铲的检查不能仅由玩家计数器判断
+                special_items.append((check_item, *check_args))
+                continue
+            case _:
+                raise ValueError(f'非法状态检查对象：{check_item}')
+        requirements[idx] = max(requirements.get(idx, num), num)
+    return tuple(requirements.items()), book_total, tuple(special_items)
+
+def initial_counters() -> array:
+    """新玩家的计数器数组"""
+    counters = array('h', bytes(2 * NUM_COUNTERS))
+    counters[ALL_MEEPLES] = 7     # 所有米宝
+    counters[ALL_BRIDGES] = 3     # 所有桥
+    for building_id, amount in {
+        1: 9,  # 车间
+        2: 4,  # 工会
+        3: 1,  # 宫殿
+        4: 3,  # 学校
+        5: 1,  # 大学
+    }.items():
+        counters[BUILDING_INDEX[building_id]] = amount
+    counters[MAGIC_INDEX[1]] = 5  # 一区魔力
+    counters[MAGIC_INDEX[2]] = 7  # 二区魔力
+    counters[SHOVEL_LEVEL] = 3    # 铲子等级
+    counters[BOARDSCORE] = 20     # 板面分数
+    return counters
+
+class CounterView(MutableMapping):
+    """计数器数组的字典式视图：按原字典的键读写计数器数组中对应项（兼容原字典访问方式）"""
+    __slots__ = ('counters', 'index')
+
+    def __init__(self, counters: array, index: dict):
+        self.counters = counters
+        self.index = index
+
+    def __getitem__(self, key):
+        return self.counters[self.index[key]]
+
+    def __setitem__(self, key, value: int):
+        self.counters[self.index[key]] = value
+
+    def __delitem__(self, key):
+        raise TypeError('计数器不可删除')
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def values(self) -> list[int]:
+        return [self.counters[idx] for idx in self.index.values()]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+def counter_property(idx: int) -> property:
+    """读写计数器数组第idx项的属性"""
+    def getter(self) -> int:
+        return self.counters[idx]
+    def setter(self, value: int):
+        self.counters[idx] = value
+    return property(getter, setter)
+
+# 地图网格布局：各地块按行优先连续存放于 MapBoardState.cells，每个地块依次为以下各字段
+CELL_TERRAIN, CELL_CONTROLLER, CELL_BUILDING, CELL_ANNEX, CELL_NEUTRAL = range(5)   # 地形、控制玩家id、建筑id、侧楼数量、是否中立建筑
+CELL_WIDTH = 5
+CELL_FIELDS = range(CELL_WIDTH)
+# CELL_OFFSETS[i][j]：地块(i,j)首个字段的下标
+CELL_OFFSETS = tuple(tuple((i * MAP_WIDTH + j) * CELL_WIDTH for j in range(MAP_WIDTH)) for i in range(MAP_HEIGHT))
+
+class MapCellView(Sequence):
+    """地图网格中单个地块的只读视图（兼容原 map_grid[i][j][k] 读取方式；修改须经 set_terrain 与 set_building）"""
+    __slots__ = ('cells', 'offset')
+
+    def __init__(self, cells: array, offset: int):
+        self.cells = cells
+        self.offset = offset
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[field] for field in CELL_FIELDS[k]]
+        field = CELL_FIELDS[k]
+        value = self.cells[self.offset + field]
+        return value != 0 if field == CELL_NEUTRAL else value
+
+    def __len__(self):
+        return CELL_WIDTH
+
+    def __repr__(self):
+        return repr(list(self))
+
+class MapRowView(Sequence):
+    """地图网格中一行地块的只读视图"""
+    __slots__ = ('cells', 'i')
+
+    def __init__(self, cells: array, i: int):
+        self.cells = cells
+        self.i = i
+
+    def __getitem__(self, j: int) -> MapCellView:
+        return MapCellView(self.cells, CELL_OFFSETS[self.i][j])
+
+    def __len__(self):
+        return MAP_WIDTH
+
+    def __repr__(self):
+        return repr(list(self))
+
+class MapGridView(Sequence):
+    """地图网格的只读视图：map_grid[i][j] 为地块(i,j)的 [地形, 控制玩家id, 建筑id, 侧楼数量, 是否中立建筑]"""
+    __slots__ = ('cells',)
+
+    def __init__(self, cells: array):
+        self.cells = cells
+
+    def __getitem__(self, i: int) -> MapRowView:
+        return MapRowView(self.cells, range(MAP_HEIGHT)[i])
+
+    def __len__(self):
+        return MAP_HEIGHT
+
+    def __repr__(self):
+        return repr(list(self))
+
+# 游戏阶段
+GAME_PHASES = ('setup_draft', 'setup_build', 'setup_effect', 'income', 'action', 'round_end', 'game_end')
+
+# Zobrist 哈希特征号：地图网格各字段、各桥位、各玩家各计数器、各效果板块的各持有者与附加行动标记、对局进度各项
+ZOBRIST_CELL_BASE = 0                       # + 地块字段下标
+ZOBRIST_BRIDGE_BASE = 1 << 12               # + 桥位两侧地块序号组合
+ZOBRIST_PLAYER_BASE = 1 << 15               # + 玩家id * NUM_COUNTERS + 计数器下标
+ZOBRIST_OWNER_BASE = 1 << 16                # + (效果板块类型序号 * 64 + 板块id) * 8 + 玩家id
+ZOBRIST_ACTION_DONE_BASE = 1 << 19          # + (效果板块类型序号 * 64 + 板块id) * 8 + 玩家id（每回合一次附加行动已执行标记）
+ZOBRIST_PROGRESS_BASE = 1 << 20             # + 对局进度项（见 GameStateBase.zobrist_hash）
+ZOBRIST_MASK = (1 << 64) - 1
+
+def splitmix64(x: int) -> int:
+    """64位整数混合函数"""
+    x = (x + 0x9E3779B97F4A7C15) & ZOBRIST_MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & ZOBRIST_MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & ZOBRIST_MASK
+    return x ^ (x >> 31)
+
+@functools.cache
+def zobrist_key(feature: int, value: int) -> int:
+    """特征取某值时的64位随机键（由特征号与取值确定，各进程一致）"""
+    return splitmix64(splitmix64(feature) ^ (value & ZOBRIST_MASK))
+
+@functools.cache
+def sequence_hash(base: int, values: tuple[int, ...]) -> int:
+    """连续特征 base, base+1, ... 依次取values时各键的异或（按取值组合缓存，用于对局开始时的地图网格与计数器）"""
+    sequence_hash = 0
+    for idx, value in enumerate(values):
+        sequence_hash ^= zobrist_key(base + idx, value)
+    return sequence_hash
+
+def bridge_feature(bridge_key: tuple[tuple[int, int], tuple[int, int]]) -> int:
+    """桥位的 Zobrist 特征号"""
+    (i, j), (p, q) = bridge_key
+    return ZOBRIST_BRIDGE_BASE + (i * MAP_WIDTH + j) * MAP_HEIGHT * MAP_WIDTH + p * MAP_WIDTH + q
+
+# 状态版本号（各对局共用的单调递增序列，各部分状态修改时取新值，同一版本号不会标记两个不同的状态）
+state_versions = itertools.count(1)
 
 class GameStateBase:
     """游戏状态类"""
     class GameSetup: # TODO 轮次计分的限制性规定判定
         """游戏初始设置类"""
-        def __init__(self, num_players: int, mode: tuple):
+        def __init__(self, num_players: int, mode: tuple, rng: random.Random, seedid: int, io):
             self.num_players = num_players
             self.mode = mode
-            self.seedid = 7
+            self.seedid = seedid                    # 对局随机种子
             
             # 所有可用组件
             self.all_factions = list(range(1, 13))       # 共12派系
@@ -47,53 +478,50 @@ class GameStateBase:
             # 执行随机初始设置
             match mode[0]:
                 case 'random':
-                    self.perform_random_initial_setup()
+                    self.perform_random_initial_setup(rng, io)
                 case 'target':
                     self.perform_target_initial_setup(mode[1])
                 case 'input':
-                    self.perform_input_initial_setup()
+                    self.perform_input_initial_setup(io)
                 case _:
                     raise ValueError('Invalid mode')
                  
-        def perform_random_initial_setup(self):
-            """执行随机初始设置步骤"""
-            self.seedid = int(time.strftime("%S%H%M", time.localtime()))
-            random.seed(self.seedid)
-            # print(f'seed:{self.seedid}')
+        def perform_random_initial_setup(self, rng: random.Random, io):
+            """执行随机初始设置步骤（使用对局随机数生成器，并输出至该对局的网页IO）"""
 
             # 1. 选择6张规划卡
-            self.selected_planning_cards =sorted(random.sample(self.all_planning_cards, 6))
+            self.selected_planning_cards =sorted(rng.sample(self.all_planning_cards, 6))
 
             # 2. 选择人数+1的派系板块
-            self.selected_factions = sorted(random.sample(self.all_factions, self.num_players + 1))
+            self.selected_factions = sorted(rng.sample(self.all_factions, self.num_players + 1))
             
             # 3. 选取人数+1个宫殿板块作为可选项
-            self.selected_palace_tiles = sorted(random.sample(self.all_palace_tiles, self.num_players + 1))
+            self.selected_palace_tiles = sorted(rng.sample(self.all_palace_tiles, self.num_players + 1))
             
             # 4. 选取人数+3个回合助推板作为可选项
-            self.selected_round_boosters = sorted(random.sample(self.all_round_boosters, self.num_players + 3))
+            self.selected_round_boosters = sorted(rng.sample(self.all_round_boosters, self.num_players + 3))
             io.set_bonus_columns(self.selected_round_boosters)
             
             # 5. 选取6个轮次计分板块并随机排序
-            self.round_scoring_order = random.sample(self.all_round_scoring, 6)
-            random.shuffle(self.round_scoring_order)
+            self.round_scoring_order = rng.sample(self.all_round_scoring, 6)
+            rng.shuffle(self.round_scoring_order)
             for i in range(6):
                 io.set_round_scoring(i+1,self.round_scoring_order[i])
 
             # 6. 随机选取1个最终计分板块
-            self.final_scoring = random.choice(self.all_final_scoring)
+            self.final_scoring = rng.choice(self.all_final_scoring)
             io.set_final_round_bonus(self.final_scoring)
 
             # 7. 对共12块能力板块随机排序
-            self.ability_tiles_order = random.sample(self.all_ability_tiles, 12)
-            random.shuffle(self.ability_tiles_order)
+            self.ability_tiles_order = rng.sample(self.all_ability_tiles, 12)
+            rng.shuffle(self.ability_tiles_order)
             
             # 8. 选取2+人数*2的科学板块并随机排序
-            self.science_tiles_order = random.sample(self.all_science_tiles, self.num_players * 2 + 2)
-            random.shuffle(self.science_tiles_order)
+            self.science_tiles_order = rng.sample(self.all_science_tiles, self.num_players * 2 + 2)
+            rng.shuffle(self.science_tiles_order)
             
             # 9. 选取3个书本行动
-            self.selected_book_actions = sorted(random.sample(self.all_book_actions, 3))            
+            self.selected_book_actions = sorted(rng.sample(self.all_book_actions, 3))            
       
         def perform_target_initial_setup(self, args):
             """执行指定初始设置步骤"""
@@ -213,7 +641,7 @@ class GameStateBase:
             # 9. 选取3个书本行动
             self.selected_book_actions = args[8]
 
-        def perform_input_initial_setup(self):
+        def perform_input_initial_setup(self, io):
             """执行所有初始设置步骤"""
 
             # 1. 选择被排除的那张规划卡
@@ -297,70 +725,56 @@ class GameStateBase:
             )
     
     class PlayerState:
-        """玩家状态类"""
+        """玩家状态类（各计数器集中存放于一个整数数组，资源等字典式访问为该数组的视图）"""
+        # 计数器以外的状态属性（复制与还原时逐个处理）
+        state_slots = (
+            'player_id', 'planning_card_id', 'faction_id', 'palace_tile_id', 'booster_ids',
+            'temp_navigation', 'controlled_map_ids', 'adjacent_map_ids', 'reachable_mask',
+            'settlements_and_cities', 'settlement_stats', 'building_stats', 'chain_parents', 'chain_sizes',
+            'terrain_id_need_shovel_times', 'science_tile_ids', 'ability_tile_ids', 'all_effect_objects',
+            'is_got_palace', 'main_action_is_done', 'ispass', 'choice_position',
+            'income_effect_list', 'pass_effect_list', 'setup_effect_list', 'additional_actions_dict',
+            'hashed_counters', 'counters_hash',
+        )
+        __slots__ = state_slots + ('counters', 'resources', 'buildings', 'tracks', 'track_rank_scores', 'magics', 'version')
+
+        # 航行和铲子等级
+        navigation_level = counter_property(NAVIGATION_LEVEL)
+        shovel_level = counter_property(SHOVEL_LEVEL)
+
+        citys_amount = counter_property(CITYS_AMOUNT)                    # 当前城市数量（城片数量）
+        tracks_over_7_amount = counter_property(TRACKS_OVER_7_AMOUNT)    # 当前科技轨超过7数量
+        largest_chain = counter_property(LARGEST_CHAIN)                  # 最大链的建筑地块数量（随建造、建桥与航行等级变化增量维护）
+
+        boardscore = counter_property(BOARDSCORE)          # 当前板面分数
+        trackscore = counter_property(TRACKSCORE)          # 当前科技轨分数
+        chainscore = counter_property(CHAINSCORE)          # 当前大链分数
+        resourcescore = counter_property(RESOURCESCORE)    # 当前资源分数
+
         def __init__(self, player_id: int):
             self.player_id = player_id    # 玩家ID
             self.planning_card_id = 0     # 选择的规划卡ID
             self.faction_id = 0           # 选择的派系ID
             self.palace_tile_id = 0       # 选择的宫殿板块ID
             self.booster_ids = []         # 使用过的助推板ID
-            self.ability_tile_ids = []    # 获取的能力板块ID
-            self.science_tile_ids = []    # 获取的科学板块ID
-            
-            # 资源系统
-            self.resources = {
-                'money': 0,            # 钱
-                'ore': 0,               # 矿
-                'bank_book': 0,         # 银行书
-                'law_book': 0,          # 法律书
-                'engineering_book': 0,  # 工程书
-                'medical_book': 0,      # 医学书
-                'meeples': 0,           # 米宝
-                'all_meeples': 7,       # 所有米宝
-                'all_bridges': 3         # 所有桥
-            }
-
-            # 建筑系统
-            self.buildings = {
-                1: 9,  # 车间
-                2: 4,  # 工会
-                3: 1,  # 宫殿
-                4: 3,  # 学校
-                5: 1,  # 大学
-                6: 0,  # 中立塔楼
-                7: 0,  # 中立纪念碑
-                8: 0,  # 侧楼
-                9: 0,  # 中立车间
-                10: 0, # 中立工会
-                11: 0, # 中立宫殿
-                12: 0, # 中立学校
-                13: 0, # 中立大学
-            }
 
-            # 航行和铲子等级
-            self.navigation_level = 0
-            self.shovel_level = 3
+            # 计数器数组（资源、建筑、科技轨、科技轨排名分、魔力、航行和铲子等级、城市数量与各项分数，布局见 initial_counters）
+            self.counters = initial_counters()
+            self.bind_counter_views()
+            # 计数器的 Zobrist 哈希及其对应的计数器数组（计数器写入处众多，取哈希时再将两者之差计入）
+            self.hashed_counters = self.counters[:]
+            self.counters_hash = sequence_hash(ZOBRIST_PLAYER_BASE + player_id * NUM_COUNTERS, tuple(self.counters))
             self.temp_navigation = False
-            
-            # 科技轨系统
-            self.tracks:dict[str,int] = {
-                'bank': 0,         # 银行轨
-                'law': 0,          # 法律轨
-                'engineering': 0,  # 工程轨
-                'medical': 0,      # 医学轨
-            }
-            
-            # 魔力系统
-            self.magics = {
-                1: 5,  # 一区魔力
-                2: 7,  # 二区魔力
-                3: 0,  # 三区魔力
-            }
+            self.version = next(state_versions)    # 本玩家状态版本号（经状态调整或本玩家行动修改时更新，不随状态复制）
 
             self.controlled_map_ids = set()    # 当前控制的领土ID列表
             self.adjacent_map_ids = set()      # 相邻坐标列表（排除控制领土）
-            self.reachable_map_ids = set()     # 可抵达坐标列表（包含控制领土，不包含水域）
-            self.settlements_and_cities = {}   # 当前聚落与城市字典
+            self.reachable_mask = 0            # 可抵达地块位棋盘（仅含未被控制的陆地地块，随建造、建桥与航行变化增量维护）
+            self.settlements_and_cities = {}   # 当前聚落与城市字典（并查集：坐标 -> [父节点坐标, 是否城市]）
+            self.settlement_stats = {}         # 各聚落根节点的累计统计 [魔力点数之和, 建筑数量, 大学数量, 纪念碑数量]
+            self.building_stats = {}           # 各控制地块建筑计入所属聚落的统计 (魔力点数, 建筑数量, 大学数量, 纪念碑数量)
+            self.chain_parents = {}            # 大链并查集：控制地块 -> 父节点坐标（同一聚落或航行可抵达的建筑相连）
+            self.chain_sizes = {}              # 各大链根节点的建筑地块数量
 
             # 创建各地形id需要几铲才能成为原生地的初始空字典，在选择规划卡后更新
             self.terrain_id_need_shovel_times = {i: -1 for i in range(1,8)}
@@ -370,13 +784,6 @@ class GameStateBase:
             self.all_effect_objects = []       # 所有效果板块列表
             
             self.is_got_palace = False     # 是否已解锁宫殿板块
-            self.citys_amount = 0          # 当前城市数量（城片数量）
-            self.tracks_over_7_amount = 0  # 当前科技轨超过7数量
-                    
-            self.boardscore = 20    # 当前板面分数
-            self.trackscore = 0     # 当前科技轨分数
-            self.chainscore = 0     # 当前大链分数
-            self.resourcescore = 0  # 当前资源分数
 
             self.main_action_is_done = False # 主要行动是否完成
             self.ispass = False              # 是否已跳过
@@ -387,6 +794,39 @@ class GameStateBase:
             self.setup_effect_list: list[Callable[[int],None]] = []         # 初始设置效果列表
             self.additional_actions_dict: dict[str,Callable] = {}           # 额外行动列表
 
+        def bind_counter_views(self):
+            """建立计数器数组的字典式视图"""
+            self.resources = CounterView(self.counters, RESOURCE_INDEX)            # 资源系统
+            self.buildings = CounterView(self.counters, BUILDING_INDEX)            # 建筑系统
+            self.tracks = CounterView(self.counters, TRACK_INDEX)                  # 科技轨系统
+            self.track_rank_scores = CounterView(self.counters, TRACK_RANK_INDEX)  # 各科技轨当前的终局排名分（随各玩家科技轨等级变化更新，供分数估算直接读取）
+            self.magics = CounterView(self.counters, MAGIC_INDEX)                  # 魔力系统
+
+        def __deepcopy__(self, memo: dict):
+            """复制玩家状态：计数器数组整体复制一次，其余状态属性逐个深拷贝"""
+            other = memo[id(self)] = object.__new__(type(self))
+            other.counters = self.counters[:]
+            other.bind_counter_views()
+            for name in self.state_slots:
+                setattr(other, name, copy.deepcopy(getattr(self, name), memo))
+            return other
+
+        def sync_counters_hash(self) -> int:
+            """将计数器自上次同步以来的变化计入计数器哈希，返回当前计数器哈希"""
+            if self.counters != self.hashed_counters:
+                feature = ZOBRIST_PLAYER_BASE + self.player_id * NUM_COUNTERS
+                for idx, (hashed_value, value) in enumerate(zip(self.hashed_counters, self.counters)):
+                    if hashed_value != value:
+                        self.counters_hash ^= zobrist_key(feature + idx, hashed_value) ^ zobrist_key(feature + idx, value)
+                self.hashed_counters[:] = self.counters
+            return self.counters_hash
+
+        def load(self, other: 'GameStateBase.PlayerState'):
+            """原地载入另一玩家状态（计数器数组原地覆盖，已有的字典式视图保持有效）"""
+            self.counters[:] = other.counters
+            for name in self.state_slots:
+                setattr(self, name, getattr(other, name))
+
         def __str__(self):
             """玩家状态的中文表示"""
             # 初始状态
@@ -441,7 +881,7 @@ class GameStateBase:
             coords_str = ", ".join([
                 f"控制领土: {self.controlled_map_ids}",
                 f"相邻坐标: {self.adjacent_map_ids}",
-                f"可抵达坐标: {self.reachable_map_ids}"
+                f"可抵达坐标: {mask_to_positions(self.reachable_mask)}"
                 f"聚落与城市: {self.settlements_and_cities}"
             ])
             
@@ -474,7 +914,7 @@ class GameStateBase:
 
     class MapBoardState:
         """游戏地图状态"""
-        def __init__(self):
+        def __init__(self, num_players: int):
             # 地图尺寸
             self.width = 13
             self.height = 9
@@ -518,76 +958,28 @@ class GameStateBase:
             }
             
             # 地形网格 (二维数组)
-            self.terrain_grid = [
-                [4,0,3,2,1,6,5,0,3,2,1,7,0],
-                [5,0,0,4,3,4,7,0,4,5,3,0,2],
-                [6,3,2,0,5,1,2,0,0,6,0,0,6],
-                [7,5,6,0,7,6,0,2,0,0,1,5,4],
-                [1,4,1,7,0,0,0,4,5,3,6,7,1],
-                [2,0,0,0,3,5,0,7,1,0,2,3,6],
-                [3,0,1,2,0,4,1,0,0,0,0,0,0],
-                [0,7,3,0,6,2,7,6,2,3,4,2,0],
-                [4,5,6,0,7,5,1,3,4,5,6,7,1]
-            ]  # 每个元素是地形类型ID
+            self.terrain_grid = [list(row) for row in TERRAIN_GRID]  # 每个元素是地形类型ID
             
-            # 汇总地图网格
-            self.map_grid: list[list[list[int]]] = [
-                [
-                    [
-                        self.terrain_grid[i][j],    # 地形
-                        -1,                         # 控制玩家id
-                        0,                          # 建筑id
-                        0,                          # 侧楼数量
-                        False,                      # 是否中立建筑
-                    ] for j in range(13)
-                ] for i in range(9)
+            # 汇总地图网格（按行优先连续存放的定宽字节数组，各地块字段布局见 CELL_OFFSETS）
+            self.cells = array('b', bytes(MAP_HEIGHT * MAP_WIDTH * CELL_WIDTH))
+            for i in range(MAP_HEIGHT):
+                for j in range(MAP_WIDTH):
+                    offset = CELL_OFFSETS[i][j]
+                    self.cells[offset + CELL_TERRAIN] = self.terrain_grid[i][j]   # 地形
+                    self.cells[offset + CELL_CONTROLLER] = -1                     # 控制玩家id（建筑id、侧楼数量、是否中立建筑均为0）
+            # 地图网格的只读视图（兼容 map_grid[i][j][k] 读取方式）
+            self.map_grid = MapGridView(self.cells)
+
+            # 位棋盘（与地图网格同步更新，仅经 set_terrain 与 set_building 修改）
+            self.terrain_masks = [                                              # 各地形的地块（0为水域）
+                positions_to_mask((i, j) for i in range(9) for j in range(13) if self.terrain_grid[i][j] == terrain_id)
+                for terrain_id in self.terrain_types
             ]
-
-            # 可建桥的地块坐标
-            self.enable_bridge_pos_dict = {
-                (0, 2) : ((1, 0), (2, 2)) ,
-                (0, 8) : ((1, 6),) ,
-                (0, 11) : ((1, 12),) ,
-                (1, 0) : ((0, 2),) ,
-                (1, 3) : ((2, 2),) ,
-                (1, 6) : ((0, 8),) ,
-                (1, 10) : ((2, 12), (3, 10)) ,
-                (1, 12) : ((0, 11),) ,
-                (2, 2) : ((0, 2), (1, 3)) ,
-                (2, 4) : ((3, 2),) ,
-                (2, 6) : ((3, 7),) ,
-                (2, 9) : ((3, 7), (4, 9), (3, 10)) ,
-                (2, 12) : ((1, 10),) ,
-                (3, 2) : ((2, 4),) ,
-                (3, 4) : ((4, 3), (5, 4)) ,
-                (3, 5) : ((4, 7), (5, 5)) ,
-                (3, 7) : ((2, 6), (2, 9)) ,
-                (3, 10) : ((1, 10), (2, 9)) ,
-                (4, 2) : ((6, 2),) ,
-                (4, 3) : ((3, 4), (5, 4), (6, 3)) ,
-                (4, 7) : ((3, 5), (5, 5)) ,
-                (4, 9) : ((2, 9),) ,
-                (5, 0) : ((6, 2),) ,
-                (5, 4) : ((3, 4), (4, 3), (6, 3)) ,
-                (5, 5) : ((3, 5), (4, 7)) ,
-                (5, 7) : ((6, 6), (7, 7)) ,
-                (5, 8) : ((7, 8),) ,
-                (5, 10) : ((7, 10),) ,
-                (5, 11) : ((7, 11),) ,
-                (6, 0) : ((7, 1), (8, 0)) ,
-                (6, 2) : ((4, 2), (5, 0)) ,
-                (6, 3) : ((4, 3), (5, 4), (7, 4)) ,
-                (6, 6) : ((5, 7),) ,
-                (7, 1) : ((6, 0),) ,
-                (7, 2) : ((8, 4),) ,
-                (7, 4) : ((6, 3),) ,
-                (7, 7) : ((5, 7),) ,
-                (7, 8) : ((5, 8),) ,
-                (7, 10) : ((5, 10),) ,
-                (7, 11) : ((5, 11),) ,
-                (8, 0) : ((6, 0),) ,
-                (8, 4) : ((7, 2),) ,
-            }
+            self.player_masks = [0] * num_players                               # 各玩家控制的地块
+            self.occupied_mask = 0                                              # 已被控制的地块
+            self.building_masks = {building_id: 0 for building_id in self.building_types}   # 各建筑所在的地块
+            self.building_masks[0] = FULL_MASK
+            self.neutral_mask = 0                                               # 中立建筑所在的地块
 
             # 该桥位是否已被建造
             self.bridges_is_conneted = {
@@ -623,6 +1015,71 @@ class GameStateBase:
                 ((6, 3), (7, 4)): -1,
                 ((7, 2), (8, 4)): -1,
             }
+
+            # 地图状态版本号（经 write_cell 与 set_bridge 修改时更新）
+            self.version = next(state_versions)
+
+            # 地图网格与桥位的 Zobrist 哈希（仅经 set_terrain、set_building 与 set_bridge 增量更新）
+            self.zobrist_hash = sequence_hash(ZOBRIST_CELL_BASE, tuple(self.cells))
+            for bridge_key, controller in self.bridges_is_conneted.items():
+                self.zobrist_hash ^= zobrist_key(bridge_feature(bridge_key), controller)
+
+        def __deepcopy__(self, memo: dict):
+            """复制地图状态：地图网格整体复制一次，位棋盘与桥位浅复制，地形与建筑类型定义等常量共享"""
+            other = memo[id(self)] = object.__new__(type(self))
+            other.__dict__.update(self.__dict__)
+            other.cells = self.cells[:]
+            other.map_grid = MapGridView(other.cells)
+            other.terrain_masks = self.terrain_masks.copy()
+            other.player_masks = self.player_masks.copy()
+            other.building_masks = self.building_masks.copy()
+            other.bridges_is_conneted = self.bridges_is_conneted.copy()
+            return other
+
+        def foreign_mask(self, player_id: int) -> int:
+            """其他玩家控制的地块"""
+            return self.occupied_mask & ~self.player_masks[player_id]
+
+        def set_terrain(self, i: int, j: int, terrain_id: int):
+            """修改地块地形"""
+            bit = POS_BITS[i][j]
+            offset = CELL_OFFSETS[i][j]
+            self.terrain_masks[self.cells[offset + CELL_TERRAIN]] &= ~bit
+            self.terrain_masks[terrain_id] |= bit
+            self.write_cell(offset + CELL_TERRAIN, terrain_id)
+
+        def set_building(self, i: int, j: int, player_id: int, building_id: int, annex_amount: int, is_neutral: bool):
+            """修改地块控制玩家id、建筑id、侧楼数量与建筑性质"""
+            bit = POS_BITS[i][j]
+            offset = CELL_OFFSETS[i][j]
+            pre_player_id, pre_building_id = self.cells[offset + CELL_CONTROLLER:offset + CELL_ANNEX]
+            if pre_player_id != -1:
+                self.player_masks[pre_player_id] &= ~bit
+            if player_id != -1:
+                self.player_masks[player_id] |= bit
+                self.occupied_mask |= bit
+            else:
+                self.occupied_mask &= ~bit
+            self.building_masks[pre_building_id] &= ~bit
+            self.building_masks[building_id] |= bit
+            self.neutral_mask = self.neutral_mask | bit if is_neutral else self.neutral_mask & ~bit
+            self.write_cell(offset + CELL_CONTROLLER, player_id)
+            self.write_cell(offset + CELL_BUILDING, building_id)
+            self.write_cell(offset + CELL_ANNEX, annex_amount)
+            self.write_cell(offset + CELL_NEUTRAL, is_neutral)
+
+        def write_cell(self, idx: int, value: int):
+            """写入地图网格字节数组第idx项，并更新地图哈希"""
+            self.zobrist_hash ^= zobrist_key(ZOBRIST_CELL_BASE + idx, self.cells[idx]) ^ zobrist_key(ZOBRIST_CELL_BASE + idx, value)
+            self.cells[idx] = value
+            self.version = next(state_versions)
+
+        def set_bridge(self, bridge_key: tuple[tuple[int, int], tuple[int, int]], player_id: int):
+            """修改桥位的建造玩家id"""
+            feature = bridge_feature(bridge_key)
+            self.zobrist_hash ^= zobrist_key(feature, self.bridges_is_conneted[bridge_key]) ^ zobrist_key(feature, player_id)
+            self.bridges_is_conneted[bridge_key] = player_id
+            self.version = next(state_versions)
     
     class DisplayBoardState:
         """展示板状态"""
@@ -668,19 +1125,24 @@ class GameStateBase:
         if num_players:
             self.num_players = num_players                                                                          # 玩家数量
             self.game_args = game_args
-            global io
-            io = game_args['web_io']                                                                                # 网页IO接口
-            self.io = io
-            self.setup = __class__.GameSetup(num_players, (game_args['setup_mode'],game_args['setup_tile_args']))   # 游戏初始状态设置
+            self.io = game_args['web_io']                                                                           # 网页IO接口（各对局独立）
+            self.headless = game_args.get('headless', isinstance(self.io, Silence_IO))                              # 无界面模式（不生成任何说明文本与界面更新）
+            if game_args.get('seed') is None:                                                                       # 对局随机种子（64位，未指定时随机生成）
+                game_args['seed'] = random.getrandbits(64)
+            self.seed = game_args['seed']
+            self.rng = random.Random(self.seed)                                                                     # 对局随机数生成器（初始设置与随机行动共用）
+            self.setup = __class__.GameSetup(num_players, (game_args['setup_mode'],game_args['setup_tile_args']), self.rng, self.seed, self.io)   # 游戏初始状态设置
             self.players:list[__class__.PlayerState] = [__class__.PlayerState(i) for i in range(num_players)]       # 玩家状态
-            self.map_board_state = __class__.MapBoardState()                                                        # 地图状态
+            for typ in TRACK_TYPES:
+                self.update_track_rank_scores(typ)
+            self.map_board_state = __class__.MapBoardState(num_players)                                             # 地图状态
             self.display_board_state = __class__.DisplayBoardState(num_players)                                     # 展示板状态
             self.round = 0                                                                                          # 当前回合 (0表示设置阶段)
             match game_args['setup_mode']:                                                                          # 初始玩家顺位
                 case 'random':
-                    self.init_player_order = random.sample(list(range(num_players)),num_players)
+                    self.init_player_order = self.rng.sample(list(range(num_players)),num_players)
                 case 'input':
-                    self.init_player_order = [int(i)-1 for i in io.get_input(f"请输入初始玩家顺位（1-{num_players}）: ").split()]
+                    self.init_player_order = [int(i)-1 for i in self.io.get_input(f"请输入初始玩家顺位（1-{num_players}）: ").split()]
                     assert (
                         len(self.init_player_order) == num_players 
                         and min(self.init_player_order) > 0 
@@ -691,99 +1153,194 @@ class GameStateBase:
             self.current_player_order = self.init_player_order.copy()                                               # 当前玩家顺位
             self.pass_order = list(reversed(self.current_player_order))                                             # 本回合玩家结束顺序
             self.setup_choice_is_completed = False                                                                  # 初始选择是否完成
-            self.check = self.init_check()                                                                          # 初始化检查函数
+            self.phase = 'setup_draft'                                                                              # 当前游戏阶段
+            self.setup_round = 0                                                                                    # 当前初始设置轮抽轮次
+            self.turn_queue: list[int] = []                                                                         # 本阶段待行动玩家队列（队首为当前行动玩家）
+            self.ownership_hash = 0                                                                                 # 效果板块持有关系与附加行动标记的 Zobrist 哈希（随效果板块获取、交还与附加行动执行增量更新）
+            self.adjust_version = next(state_versions)                                                              # 任一玩家状态调整的版本号（公共书堆、科技轨登顶等随调整变化）
+            self.objects_version = next(state_versions)                                                             # 效果板块持有关系的版本号
+            self.decision_version = next(state_versions)                                                            # 立即行动决策点的版本号（每次调起立即行动时更新）
+            self.check, self.check_cost, self.check_costs = self.init_check()                                       # 初始化检查函数（检查列表、编译后的花费、批量编译后的花费）
             self.adjust = self.init_adjust()                                                                        # 初始化调整函数
 
+    def state_refs(self) -> dict:
+        """汇总构成游戏状态的全部可变对象（未复制）"""
+        return {
+            'owner': self,
+            'players': self.players,
+            'map_board_state': self.map_board_state,
+            'display_board_state': self.display_board_state,
+            'setup': self.setup,
+            'rng': self.rng,
+            'all_available_object_dict': self.all_available_object_dict,
+            'progress': (
+                self.round, self.init_player_order, self.current_player_order, self.pass_order,
+                self.setup_choice_is_completed, self.phase, self.setup_round, self.turn_queue, self.ownership_hash,
+            ),
+        }
+
+    def snapshot(self) -> dict:
+        """生成当前游戏状态快照（深拷贝，可被多次还原）"""
+        # 效果板块与其绑定方法引用的游戏状态保持为自身，不随快照复制
+        return copy.deepcopy(self.state_refs(), {id(self): self})
+
+    def restore(self, snapshot: dict):
+        """将快照还原至当前游戏状态（快照可来自其他同设置的游戏状态）"""
+        # 将快照中对原游戏状态的引用重定向至当前游戏状态
+        self.load_state(copy.deepcopy(snapshot, {id(snapshot['owner']): self}))
+
+    def copy_to(self, other: 'GameStateBase'):
+        """将当前游戏状态直接复制至另一同设置的游戏状态（仅一次深拷贝，用于分叉对局）"""
+        other.load_state(copy.deepcopy(self.state_refs(), {id(self): other}))
+
+    def load_state(self, state: dict):
+        """载入已重定向至自身的游戏状态对象"""
+        # 原地还原玩家状态，保持行动系统与代理持有的玩家引用有效
+        for player, saved_player in zip(self.players, state['players']):
+            player.load(saved_player)
+        self.map_board_state = state['map_board_state']
+        self.display_board_state = state['display_board_state']
+        self.setup = state['setup']
+        self.rng = state['rng']
+        # 原地还原效果板块字典，保持行动系统持有的字典引用有效
+        self.all_available_object_dict.clear()
+        self.all_available_object_dict.update(state['all_available_object_dict'])
+        (
+            self.round, self.init_player_order, self.current_player_order, self.pass_order,
+            self.setup_choice_is_completed, self.phase, self.setup_round, self.turn_queue, self.ownership_hash,
+        ) = state['progress']
+        # 载入的状态不沿用任何已缓存的检查结果
+        self.touch_versions()
+
+    def touch_versions(self):
+        """更新全部状态版本号"""
+        for player in self.players:
+            player.version = next(state_versions)
+        self.map_board_state.version = next(state_versions)
+        self.adjust_version = next(state_versions)
+        self.objects_version = next(state_versions)
+        self.decision_version = next(state_versions)
+
+    def zobrist_hash(self) -> int:
+        """当前游戏状态的64位 Zobrist 哈希（用于置换表、模拟间等价局面去重与重放校验）：
+        地图网格、桥位、效果板块持有关系与每回合一次的附加行动标记随修改增量维护，各玩家计数器取哈希时计入自上次以来的变化，对局进度逐项计入；
+        随机数状态不计入"""
+        state_hash = self.map_board_state.zobrist_hash ^ self.ownership_hash ^ self.progress_hash()
+        for player in self.players:
+            state_hash ^= player.sync_counters_hash()
+        return state_hash
+
+    def progress_hash(self) -> int:
+        """对局进度的 Zobrist 哈希分量：回合、阶段、玩家顺位、行动队列、各玩家跳过与主要行动标记、科技轨米宝位与登顶"""
+        state_hash = 0
+        for player in self.players:
+            state_hash ^= zobrist_key(ZOBRIST_PROGRESS_BASE + player.player_id, player.ispass | player.main_action_is_done << 1 | player.temp_navigation << 2)
+        feature = ZOBRIST_PROGRESS_BASE + self.num_players
+        state_hash ^= zobrist_key(feature, self.round) ^ zobrist_key(feature + 1, self.setup_round) ^ zobrist_key(feature + 2, GAME_PHASES.index(self.phase))
+        feature += 3
+        for order in (self.current_player_order, self.pass_order, self.turn_queue):
+            # 各顺位列表按位置计入（至多31个位置），并计入列表长度
+            for position, player_id in enumerate(order):
+                state_hash ^= zobrist_key(feature + position, player_id)
+            state_hash ^= zobrist_key(feature + 31, len(order))
+            feature += 32
+        for typ in TRACK_TYPES:
+            science_track = self.display_board_state.science_tracks[typ]
+            slots = science_track['is_crowned'] << 4
+            for position, is_occupied in enumerate(science_track['meeples']):
+                slots |= is_occupied << position
+            state_hash ^= zobrist_key(feature, slots)
+            feature += 1
+        return state_hash
+
     def invoke_immediate_aciton(self, player_id: int, args: tuple):
-        return
+        """调起立即行动（生成器）：产出决策点，并返回传入的所选行动ID"""
+        self.decision_version = next(state_versions)
+        action_id = yield player_id, 'immediate', args
+        return action_id
     
-    def update_reachable_map_ids_set(self, player_id: int, update_pos: tuple = tuple()):
-        """更新可抵达的坐标列表"""
+    def display_board_bank_tracks_9(self, player_idx: int):
+        """银行轨道等级9 -> 3块钱"""
+        yield from self.adjust(player_idx, [('money', 'get', 3)])
 
-        def update_reachable_map_ids(pos: tuple[int, int], navigation_distance: int = 1, visited: set = set()):
-            
-            # 如果已经访问过这个位置，直接返回
-            if pos in visited:
-                return
-    
-            # 标记当前位置为已访问
-            visited.add(pos)
-
-            # 判断该地块是否是可建桥位两侧中的一测
-            if pos in self.map_board_state.enable_bridge_pos_dict:
-                # 如是，则遍历其对侧地块
-                for corres_pos in self.map_board_state.enable_bridge_pos_dict[pos]:
-                    (i,j),(p,q) = pos, corres_pos
-                    # 判断对侧地块是否已被其他玩家占领
-                    if self.map_board_state.map_grid[p][q][1] in (-1, player_id):
-                        # 若未被其他玩家占领，则排序两侧地块坐标，生成桥键
-                        if i > p or (i == p and q > j):
-                            bridge_key = ((p,q),(i,j))
-                        else:
-                            bridge_key = ((i,j),(p,q))
-                        # 根据桥键查询该桥位是否已被该玩家连接
-                        if self.map_board_state.bridges_is_conneted[bridge_key] == player_id:
-                            # 如已被连接，则将对侧地块加入可抵地块集合中
-                            player.reachable_map_ids.add((p,q))
-
-            i,j = pos
-            direction = [(-1,i%2-1),(-1,i%2),(0,-1),(0,1),(1,i%2-1),(1,i%2)]
-
-            for dx,dy in direction:
-                new_i, new_j = i + dx, j + dy
-                if (
-                    # 在合法边界内
-                    0 <= new_i <= 8 and 0 <= new_j <= 12
-                    # 没有被其他玩家控制
-                    and self.map_board_state.map_grid[new_i][new_j][1] == -1
-                ):
-                    if (
-                        # 如果该地块不是水域
-                        self.map_board_state.map_grid[new_i][new_j][0] != 0
-                    ):
-                        # 添加该地块到可抵达集合中
-                        player.reachable_map_ids.add((new_i,new_j))
-                    elif (
-                        # 如果该玩家有航行能力
-                        current_navigation_level >= navigation_distance
-                    ):
-                        # 递归查找可抵达地块
-                        update_reachable_map_ids((new_i,new_j), navigation_distance+1, visited)
+    def display_board_law_tracks_9(self, player_idx: int):
+        """法律轨道等级9 -> 6转魔"""
+        yield from self.adjust(player_idx, [('magics', 'get', 6)])
 
-        player = self.players[player_id]
-        current_navigation_level = player.navigation_level + 1 if player.temp_navigation else 0
+    def display_board_engineering_tracks_9(self, player_idx: int):
+        """工程轨道等级9 -> 1矿"""
+        yield from self.adjust(player_idx, [('ore', 'get', 1)])
 
-        # 移除原可抵达地块坐标集合中已被控制的
-        for pos in player.reachable_map_ids.copy():
-            i,j = pos
-            if self.map_board_state.map_grid[i][j][1] != -1:
-                player.reachable_map_ids.remove(pos)
+    def display_board_medical_tracks_9(self, player_idx: int):
+        """医疗轨道等级9 -> 3分"""
+        yield from self.adjust(player_idx, [('score', 'get', 'board', 3)])
+    
+    def search_reachable_mask(self, origins_mask: int, navigation_budget: int, only_unoccupied: bool) -> int:
+        """查询航行距离表：自起点地块出发，直接相邻或经不超过航行预算格数的水域可抵达的陆地地块
+        （only_unoccupied 为真时仅包含未被控制的陆地）"""
+        navigation_masks = NAVIGATION_MASKS[min(navigation_budget, len(NAVIGATION_MASKS) - 1)]
+        reachable_mask = 0
+        for i, j in mask_to_positions(origins_mask):
+            reachable_mask |= navigation_masks[i][j]
+        if only_unoccupied:
+            reachable_mask &= ~self.map_board_state.occupied_mask
+        return reachable_mask
+
+    def update_reachable_mask(self, player_id: int, update_pos: tuple = tuple()):
+        """更新可抵达的地块（仅含未被控制的陆地地块）
+        指定新控制的坐标时增量更新：该坐标对全部玩家均不再可抵达，并以其为原点补充新可抵达的地块；
+        未指定时以全部控制地块为原点完整重新计算（航行等级或临时航行变化时使用）"""
+        player = self.players[player_id]
+        # 航行预算（临时航行效果额外+1）
+        navigation_budget = player.navigation_level + (1 if player.temp_navigation else 0)
 
-        # 如有指定更新的控制坐标，则以该坐标为原点进行查找
         if update_pos:
-            update_reachable_map_ids(update_pos)
+            # 新控制的地块对所有玩家均不再可抵达
+            update_bit = POS_BITS[update_pos[0]][update_pos[1]]
+            for each_player in self.players:
+                each_player.reachable_mask &= ~update_bit
+            origins_mask = update_bit
         else:
-            # 如无，则遍历控制列表添加（如有新增）新的可抵达地块坐标进入集合
-            for pos in player.controlled_map_ids:
-                update_reachable_map_ids(pos)
+            player.reachable_mask = 0
+            origins_mask = self.map_board_state.player_masks[player_id]
+        player.reachable_mask |= self.search_reachable_mask(origins_mask, navigation_budget, only_unoccupied=True)
+
+        # 起点地块若是可建桥位两侧中的一侧，则其对侧地块在该玩家已建桥时同样可抵达
+        for i, j in mask_to_positions(origins_mask & BRIDGE_MASK):
+            for p, q in BRIDGE_PARTNERS[(i, j)]:
+                # 判断对侧地块是否未被控制
+                if not self.map_board_state.occupied_mask & POS_BITS[p][q]:
+                    # 若未被控制，则排序两侧地块坐标，生成桥键
+                    if i > p or (i == p and q > j):
+                        bridge_key = ((p,q),(i,j))
+                    else:
+                        bridge_key = ((i,j),(p,q))
+                    # 根据桥键查询该桥位是否已被该玩家连接
+                    if self.map_board_state.bridges_is_conneted[bridge_key] == player_id:
+                        # 如已被连接，则将对侧地块加入可抵地块中
+                        player.reachable_mask |= POS_BITS[p][q]
+
+    def terrain_mask_by_shovel_times(self, player_id: int, min_shovel_times: int = -1, max_shovel_times: int = 3) -> int:
+        """该玩家需铲次数在[min_shovel_times, max_shovel_times]内的陆地地形所在的地块"""
+        terrain_mask = 0
+        for terrain_id, need_shovel_times in self.players[player_id].terrain_id_need_shovel_times.items():
+            if min_shovel_times <= need_shovel_times <= max_shovel_times:
+                terrain_mask |= self.map_board_state.terrain_masks[terrain_id]
+        return terrain_mask
 
     def absorb_magics_check(self, player_id: int, pos: tuple[int, int]):
         
         i,j = pos
-        direction = [(-1,i%2-1),(-1,i%2),(0,-1),(0,1),(1,i%2-1),(1,i%2)]
         player_get_magics = {i:0 for i in range(self.num_players)}
 
-        # 遍历相邻地块
-        for dx,dy in direction:
-            new_i, new_j = i + dx, j + dy
-            if 0 <= new_i <= 8 and 0 <= new_j <= 12:
-                # 若相邻建筑为其他派系控制，则加入计算其他派系获取魔力点数
-                if self.map_board_state.map_grid[new_i][new_j][1] not in (-1, player_id): 
-                    get_magics_player_id, building_id, num_side_building = self.map_board_state.map_grid[new_i][new_j][1:4]
-                    # 计算该其他玩家该地块可吸取的魔力点数
-                    get_magics_num = self.map_board_state.building_magic[building_id] + num_side_building
-                    # 将该其他玩家该地块可吸取魔力点数加入该其他玩家本次可获取魔力点数之和中
-                    player_get_magics[get_magics_player_id] += get_magics_num
+        # 遍历其他派系控制的相邻地块，加入计算其他派系获取魔力点数
+        for new_i, new_j in mask_to_positions(NEIGHBOR_MASKS[i][j] & self.map_board_state.foreign_mask(player_id)):
+            offset = CELL_OFFSETS[new_i][new_j]
+            get_magics_player_id, building_id, num_side_building = self.map_board_state.cells[offset + CELL_CONTROLLER:offset + CELL_NEUTRAL]
+            # 计算该其他玩家该地块可吸取的魔力点数
+            get_magics_num = self.map_board_state.building_magic[building_id] + num_side_building
+            # 将该其他玩家该地块可吸取魔力点数加入该其他玩家本次可获取魔力点数之和中
+            player_get_magics[get_magics_player_id] += get_magics_num
 
         if self.round != 0: # 初始建筑摆放不触发吸魔行动
             for player_idx, get_magics_nums in player_get_magics.items():
@@ -793,33 +1350,93 @@ class GameStateBase:
                     self.players[player_idx].boardscore + 1                                         # 最大可支付版面分数
                 )
                 if actual_num:
-                    if self.invoke_immediate_aciton(player_idx, ('gain_magics', actual_num)): return 
+                    yield from self.invoke_immediate_aciton(player_idx, ('gain_magics', actual_num))
+
+    def find_settlement(self, player_id: int, pos: tuple[int, int]) -> tuple[tuple[int, int], bool]:
+        """并查集查找：返回该控制地块所属聚落的根节点坐标及其是否为城市"""
+        settlements_and_cities = self.players[player_id].settlements_and_cities
+        # 路径压缩优化
+        stack = []
+        current = pos
+        # 找到根节点
+        while settlements_and_cities[current][0] != current:
+            stack.append(current)
+            current = settlements_and_cities[current][0]
+        root = current
+        root_is_city = settlements_and_cities[root][1]
+        
+        # 路径压缩：将所有节点直接指向根节点
+        for node in stack:
+            settlements_and_cities[node] = [root, root_is_city]
+        return root, root_is_city
+
+    def update_settlement_stats(self, player_id: int, pos: tuple[int, int]):
+        """将该地块建筑（新建、升级、降级或建侧楼）的统计变化计入所属聚落；新控制的地块先作为独立聚落加入并查集"""
+        player = self.players[player_id]
+        if pos not in player.settlements_and_cities:
+            player.settlements_and_cities[pos] = [pos, False]
+            player.settlement_stats[pos] = [0, 0, 0, 0]
+        root, _ = self.find_settlement(player_id, pos)
+
+        i,j = pos
+        offset = CELL_OFFSETS[i][j]
+        building_id, num_side_building = self.map_board_state.cells[offset + CELL_BUILDING:offset + CELL_NEUTRAL]
+        new_building_stats = (
+            self.map_board_state.building_magic[building_id] + num_side_building,   # 魔力点数
+            1 + num_side_building,                                                  # 建筑数量
+            int(building_id == 5),                                                  # 大学
+            int(building_id == 7),                                                  # 纪念碑
+        )
+        pre_building_stats = player.building_stats.get(pos, (0, 0, 0, 0))
+        for stat_idx in range(4):
+            player.settlement_stats[root][stat_idx] += new_building_stats[stat_idx] - pre_building_stats[stat_idx]
+        player.building_stats[pos] = new_building_stats
+
+    def find_chain(self, player_id: int, pos: tuple[int, int]) -> tuple[int, int]:
+        """大链并查集查找（路径压缩）：返回该控制地块所属大链的根节点坐标"""
+        chain_parents = self.players[player_id].chain_parents
+        root = pos
+        while chain_parents[root] != root:
+            root = chain_parents[root]
+        while chain_parents[pos] != root:
+            chain_parents[pos], pos = root, chain_parents[pos]
+        return root
+
+    def merge_chains(self, player_id: int, pos_a: tuple[int, int], pos_b: tuple[int, int]):
+        """合并两控制地块所属的大链（按规模合并），并更新最大链"""
+        player = self.players[player_id]
+        root_a = self.find_chain(player_id, pos_a)
+        root_b = self.find_chain(player_id, pos_b)
+        if root_a == root_b:
+            return
+        if player.chain_sizes[root_a] > player.chain_sizes[root_b]:
+            root_a, root_b = root_b, root_a
+        player.chain_parents[root_a] = root_b
+        player.chain_sizes[root_b] += player.chain_sizes.pop(root_a)
+        player.largest_chain = max(player.largest_chain, player.chain_sizes[root_b])
+
+    def connect_chain(self, player_id: int, pos: tuple[int, int]):
+        """将控制地块接入大链：与其航行可抵达范围内（按航行等级，不含临时航行）的全部己方建筑合并"""
+        player = self.players[player_id]
+        if pos not in player.chain_parents:
+            player.chain_parents[pos] = pos
+            player.chain_sizes[pos] = 1
+            player.largest_chain = max(player.largest_chain, 1)
+        i,j = pos
+        navigation_masks = NAVIGATION_MASKS[min(player.navigation_level, len(NAVIGATION_MASKS) - 1)]
+        for other_pos in mask_to_positions(navigation_masks[i][j] & self.map_board_state.player_masks[player_id]):
+            self.merge_chains(player_id, pos, other_pos)
 
     def city_establishment_check(self, player_id: int, mode: str, pos: tuple[int, int], bridge_key: tuple[tuple[int,int],tuple[int,int]] = tuple()):
 
         settlements_and_cities = self.players[player_id].settlements_and_cities
-        if pos not in settlements_and_cities:
-            settlements_and_cities[pos] = [pos, False]
-
-        def find(pos: tuple[int,int]):
-            # 路径压缩优化
-            stack = []
-            current = pos
-            # 找到根节点
-            while settlements_and_cities[current][0] != current:
-                stack.append(current)
-                current = settlements_and_cities[current][0]
-            root = current
-            root_is_city = settlements_and_cities[root][1]
-            
-            # 路径压缩：将所有节点直接指向根节点
-            for node in stack:
-                settlements_and_cities[node] = [root, root_is_city]
-            return root, root_is_city
-        
+        settlement_stats = self.players[player_id].settlement_stats
+
         def merge(pos_a: tuple[int,int], pos_b: tuple[int,int]):
-            root_a, is_city_a = find(pos_a)
-            root_b, is_city_b = find(pos_b)
+            # 同一聚落的建筑必属同一大链（经桥连接的两侧建筑仅在此合并）
+            self.merge_chains(player_id, pos_a, pos_b)
+            root_a, is_city_a = self.find_settlement(player_id, pos_a)
+            root_b, is_city_b = self.find_settlement(player_id, pos_b)
 
             if root_a == root_b:
                 return root_a, is_city_a  # 已经在同一聚落
@@ -830,10 +1447,13 @@ class GameStateBase:
             settlements_and_cities[root_a] = [root_b, new_is_city]
             # 更新父节点b的城市状态
             settlements_and_cities[root_b] = [root_b, new_is_city]
+            # 将a的累计统计并入b
+            for stat_idx, stat in enumerate(settlement_stats.pop(root_a)):
+                settlement_stats[root_b][stat_idx] += stat
 
             return root_b, new_is_city
 
-        current_root, current_is_city = find(pos)
+        current_root, current_is_city = self.find_settlement(player_id, pos)
 
         match mode:
             # 新建一座桥的情况
@@ -843,7 +1463,7 @@ class GameStateBase:
                         continue
                     i,j = temp_pos
                     # 若桥对侧地块已被己方控制
-                    if self.map_board_state.map_grid[i][j][1] == player_id:
+                    if self.map_board_state.cells[CELL_OFFSETS[i][j] + CELL_CONTROLLER] == player_id:
                         # 则合并两侧聚落
                         current_root, current_is_city = merge(pos, temp_pos)
                         break
@@ -855,11 +1475,11 @@ class GameStateBase:
                 i,j = pos
                 need_following_check = False
                 # 判断桥对侧地块是否已连接（若存在）
-                if pos in self.map_board_state.enable_bridge_pos_dict:
-                    for corres_pos in self.map_board_state.enable_bridge_pos_dict[pos]:
+                if pos in BRIDGE_PARTNERS:
+                    for corres_pos in BRIDGE_PARTNERS[pos]:
                         p,q = corres_pos
                         # 若桥对侧地块被己方控制
-                        if self.map_board_state.map_grid[p][q][1] == player_id:
+                        if self.map_board_state.cells[CELL_OFFSETS[p][q] + CELL_CONTROLLER] == player_id:
                             # 获取桥键
                             if i > p or (i == p and j > q):
                                 bridge_key = (corres_pos, pos)
@@ -871,16 +1491,11 @@ class GameStateBase:
                                 current_root, current_is_city = merge(corres_pos, pos)
                                 need_following_check = True
                             
-                direction = [(-1,i%2-1),(-1,i%2),(0,-1),(0,1),(1,i%2-1),(1,i%2)]
-                # 遍历判断相邻地块
-                for dx,dy in direction:
-                    new_i, new_j = i + dx, j + dy
-                    if 0 <= new_i <= 8 and 0 <= new_j <= 12:
-                        # 若相邻建筑为己方
-                        if self.map_board_state.map_grid[new_i][new_j][1] == player_id:
-                            # 合并并更新当前聚落信息
-                            current_root, current_is_city = merge((new_i, new_j), (i, j))
-                            need_following_check = True
+                # 遍历己方控制的相邻地块
+                for new_i, new_j in mask_to_positions(NEIGHBOR_MASKS[i][j] & self.map_board_state.player_masks[player_id]):
+                    # 合并并更新当前聚落信息
+                    current_root, current_is_city = merge((new_i, new_j), (i, j))
+                    need_following_check = True
                 # 若建立该新建筑后，不存在任何相邻地块（含桥对侧地块，如有）上有己方建筑
                 # 则无需后续建城检查，直接跳出，因为该聚落魔力点数不会更新
                 if need_following_check == False:
@@ -892,32 +1507,15 @@ class GameStateBase:
 
         # 使用合并后最新的根节点和城市状态
         if not current_is_city:  # 如果当前聚落还不是城市
-            curent_settlement_magics_total = 0  # 当前聚落魔力点之和
-            curent_settlement_building_nums = 0 # 当前聚落建筑数量
-
-            # 统计当前聚落的所有建筑
-            # 遍历所有控制地块，获取其上建筑所需聚落
-            city_min_needed_building_nums = 4
-            for building_pos in self.players[player_id].controlled_map_ids:
-                building_root, _ = find(building_pos)
-                # 若与当前聚落所属同一聚落
-                if building_root == current_root:
-                    cur_i, cur_j = building_pos
-                    # 则获取该建筑对应魔力点
-                    building_id, num_side_building = self.map_board_state.map_grid[cur_i][cur_j][2:4]
-                    magics_num = self.map_board_state.building_magic[building_id] + num_side_building
-                    # 累加计算该聚落魔力点总数
-                    curent_settlement_magics_total += magics_num
-                    # 累加计算该聚落建筑总数
-                    curent_settlement_building_nums += 1 + num_side_building
-                    # 计算建城最低所需建筑数
-                    match building_id:
-                        case 5: # 聚落中有大学允许最低3个建筑建城
-                            if city_min_needed_building_nums > 3:
-                                city_min_needed_building_nums = 3 
-                        case 7: # 聚落中有纪念碑允许最低2个建筑建城
-                            if city_min_needed_building_nums > 2:
-                                city_min_needed_building_nums = 2 
+            # 读取当前聚落的累计统计：魔力点之和、建筑数量、大学与纪念碑数量
+            curent_settlement_magics_total, curent_settlement_building_nums, university_nums, monument_nums = settlement_stats[current_root]
+            # 计算建城最低所需建筑数（聚落中有纪念碑允许最低2个建筑建城，有大学允许最低3个）
+            if monument_nums:
+                city_min_needed_building_nums = 2
+            elif university_nums:
+                city_min_needed_building_nums = 3
+            else:
+                city_min_needed_building_nums = 4
             
             # TODO 独特建城条件判断
             if (
@@ -931,199 +1529,56 @@ class GameStateBase:
                 # 触发立即行动，选取城片（保证一定存在可选城片）
                 for city_tile_id in range(1,8):
                     if self.all_available_object_dict['city_tile'][city_tile_id].check_get(player_id):                 
-                        if self.invoke_immediate_aciton(player_id, ('select_city_tile',)): return
+                        yield from self.invoke_immediate_aciton(player_id, ('select_city_tile',))
                         break
         
-    def calculate_players_total_score(self):
-
-        def search_reachable_settlements(player_id: int, pos: tuple[int, int], navigation_distance: int = 1, visited: set = set(), all_reachable_pos: set = set()):
-            
-            # 如果已经访问过这个位置，直接返回
-            if pos in visited:
-                return
-    
-            # 标记当前位置为已访问
-            visited.add(pos)
-
-            i,j = pos
-            direction = [(-1,i%2-1),(-1,i%2),(0,-1),(0,1),(1,i%2-1),(1,i%2)]
-
-            for dx,dy in direction:
-                new_i, new_j = i + dx, j + dy
-                if (
-                    # 在合法边界内
-                    0 <= new_i <= 8 and 0 <= new_j <= 12
-                ):
-                    if (
-                        # 如果该地块是水域
-                        self.map_board_state.map_grid[new_i][new_j][0] == 0
-                        # 航行距离未超过最大航行能力
-                        and navigation_distance <= self.players[player_id].navigation_level
-                    ):
-                        search_reachable_settlements(player_id, (new_i,new_j), navigation_distance+1, visited, all_reachable_pos)
-                    else:
-                        all_reachable_pos.add((new_i,new_j))
-
-        def find_all_settlement_clusters(settlement_dict):
+    def update_track_rank_scores(self, typ: str):
+        """科技轨等级变化后，更新全部玩家在该轨的终局排名分"""
+        for player, score in zip(self.players, rank_scores(tuple([player.tracks[typ] for player in self.players]), TRACK_PRIZES)):
+            player.track_rank_scores[typ] = score
+
+    def project_scores(self) -> dict[int, dict[str, int]]:
+        """按终局计分规则估算各玩家当前的分数构成（版面、大链、科技轨、资源及总分）；
+        不修改任何玩家状态，可在对局中任意时刻重复调用"""
+        players = self.players
+        # 最大链与各科技轨排名分均已随对局增量维护，大链排名分按各玩家最大链组合缓存；各项直接读取计数器数组，不经字典式视图
+        chain_scores = rank_scores(tuple([player.counters[LARGEST_CHAIN] for player in players]), CHAIN_PRIZES)
+
+        projected_scores = {}
+        for player_id, player in enumerate(players):
+            counters = player.counters
+            # 资源分数：每5个资源（钱、矿、四类书、米宝，含3区魔力与2区每2个魔力）折合1分
+            resource_score = (sum(counters[MONEY:MEEPLES + 1]) + counters[MAGIC_3] + counters[MAGIC_2] // 2) // 5
+            board_score, chain_score = counters[BOARDSCORE], chain_scores[player_id]
+            track_score = sum(counters[TRACK_RANK_START:TRACK_RANK_STOP])
+            projected_scores[player_id] = {
+                'board': board_score,
+                'chain': chain_score,
+                'track': track_score,
+                'resource': resource_score,
+                'total': board_score + chain_score + track_score + resource_score,
+            }
+        return projected_scores
 
-            # 收集所有聚落ID
-            all_settlements = set()
-            for src, dests in settlement_dict.items():
-                all_settlements.add(src)
-                all_settlements.update(dests)
-            
-            # 构建双向连接图
-            graph = {}
-            for settlement in all_settlements:
-                graph[settlement] = set()
-            
-            for src, dests in settlement_dict.items():
-                for dest in dests:
-                    graph[src].add(dest)
-                    graph[dest].add(src)  # 双向连接
-            
-            # 使用BFS找到所有连通分量
-            visited = set()
-            all_clusters = []
-            
-            for settlement in sorted(all_settlements):  # 按ID排序处理
-                if settlement not in visited:
-                    # 新的连通分量
-                    cluster = []
-                    queue = deque([settlement])
-                    visited.add(settlement)
-                    
-                    while queue:
-                        node = queue.popleft()
-                        cluster.append(node)
-                        
-                        for neighbor in graph[node]:
-                            if neighbor not in visited:
-                                visited.add(neighbor)
-                                queue.append(neighbor)
-                    
-                    # 将当前分量添加到结果中
-                    all_clusters.append(sorted(cluster))
-            
-            return all_clusters
-
-        # 计算各玩家大链分数
-        all_players_largest_chain_num = {i:0 for i in range(self.num_players)}
-
-        for player_id in range(self.num_players):
-
-            player = self.players[player_id]
-            chains = defaultdict(set)
-            root_index = []
-            can_achieve_settlement = defaultdict(set)
-            for controlled_pos, root_info in player.settlements_and_cities.items():
-                if root_info[0] not in root_index:
-                    root_index.append(root_info[0])
-                chains[root_index.index(root_info[0])].add(controlled_pos)
-
-            for settlement_id, controlled_pos_set in chains.items():
-                temp_check_set = set()
-                for tmp_settlement_id, tmp_controlled_pos_set in chains.items():
-                    if tmp_settlement_id > settlement_id:
-                        temp_check_set |= tmp_controlled_pos_set
-                
-                for pos in controlled_pos_set:
-                    all_reachable_pos = set()
-                    search_reachable_settlements(player_id, pos, all_reachable_pos=all_reachable_pos)
-                    reachable_check_pos_set = all_reachable_pos & temp_check_set
-                    for can_reach_pos in reachable_check_pos_set:
-                        can_reach_pos_root = player.settlements_and_cities[can_reach_pos][0]
-                        can_achieve_settlement[settlement_id].add(root_index.index(can_reach_pos_root))
-
-            all_clusters = find_all_settlement_clusters(can_achieve_settlement)
-            largest_clusters = 0
-            for cluster in all_clusters:
-                building_num = 0
-                for settlement_id in cluster:
-                    building_num += len(chains[settlement_id])
-                if building_num > largest_clusters:
-                    largest_clusters = building_num
-            all_players_largest_chain_num[player_id] = largest_clusters
-
-        sorted_largest_chain_players = sorted(all_players_largest_chain_num.items(), key=lambda x:x[1], reverse=True)
-        chain_score = [18,12,6]
-        order_id = 1
-        while order_id <= 3:
-            for tie_place in range(order_id+1,self.num_players+1):
-                if sorted_largest_chain_players[order_id-1][1] > sorted_largest_chain_players[tie_place-1][1]:
-                    break
-            else:
-                tie_place = self.num_players + 1
-            get_score_num = sum(chain_score[order_id-1: tie_place-1]) // (tie_place - order_id)
-            for rank in range(order_id, tie_place):
-                self.players[sorted_largest_chain_players[rank-1][0]].chainscore = get_score_num
-            order_id = tie_place
-
-        # 计算各玩家科技轨分数
-        track_score = [8,4,2]
-        for typ in ['bank', 'law', 'engineering', 'medical']:
-            tracks_all_players = []
-            for player_id in range(self.num_players):
-                tracks_all_players.append((player_id, self.players[player_id].tracks[typ]))
-            tracks_all_players.sort(key=lambda x:x[1], reverse=True)
-            order_id = 1
-            while order_id <= 3:
-                for tie_place in range(order_id+1,self.num_players+1):
-                    if tracks_all_players[order_id-1][1] > tracks_all_players[tie_place-1][1]:
-                        break
-                else:
-                    tie_place = self.num_players + 1
-                get_score_num = sum(track_score[order_id-1: tie_place-1]) // (tie_place - order_id)
-                for rank in range(order_id, tie_place):
-                    self.players[tracks_all_players[rank-1][0]].trackscore += get_score_num
-                order_id = tie_place
-
-        # 计算各玩家资源分数
-        for player_id in range(self.num_players):
-            self.players[player_id].resourcescore = sum(
-                [
-                    sum(
-                        self.players[player_id].resources[x]
-                        for x in [
-                            'money', 'ore', 'meeples',
-                            'bank_book', 'law_book', 'engineering_book', 'medical_book',
-                        ]
-                    ),
-                    self.players[player_id].magics[3],
-                    self.players[player_id].magics[2]//2,
-                ]
-            ) // 5
-        #     print(self.players[player_id].resources,self.players[player_id].magics)
-        # print({
-        #     player_idx:[
-        #         self.players[player_idx].boardscore,
-        #         self.players[player_idx].chainscore,
-        #         self.players[player_idx].trackscore,
-        #         self.players[player_idx].resourcescore
-        #     ]
-        #     for player_idx in range(self.num_players)
-        # })
-        return {
-            player_idx: sum([
-                self.players[player_idx].boardscore,
-                self.players[player_idx].chainscore,
-                self.players[player_idx].trackscore,
-                self.players[player_idx].resourcescore
-            ])
-            for player_idx in range(self.num_players)
-        }
-        
+    def calculate_players_total_score(self):
+        """终局计分：将大链、科技轨与资源分数写入各玩家状态，返回各玩家总分（重复调用结果不变）"""
+        projected_scores = self.project_scores()
+        for player_id, player in enumerate(self.players):
+            player.chainscore = projected_scores[player_id]['chain']
+            player.trackscore = projected_scores[player_id]['track']
+            player.resourcescore = projected_scores[player_id]['resource']
+        return {player_id: projected_scores[player_id]['total'] for player_id in range(self.num_players)}
 
     def init_check(self):
 
         def check_money(player_id: int, num: int) -> bool:
-            if self.players[player_id].resources['money'] >= num:
+            if self.players[player_id].counters[MONEY] >= num:
                 return True
             else:
                 return False
         
         def check_ore(player_id: int, num: int) -> bool:
-            if self.players[player_id].resources['ore'] >= num:
+            if self.players[player_id].counters[ORE] >= num:
                 return True
             else:
                 return False
@@ -1132,10 +1587,10 @@ class GameStateBase:
             
             match where, typ:
                 case 'self', 'any':
-                    if sum([self.players[player_id].resources[f'{x}_book'] for x in ['bank','law','engineering','medical']]) >= num:
+                    if sum(self.players[player_id].counters[BANK_BOOK:MEDICAL_BOOK + 1]) >= num:
                         return True
                 case 'self', _:
-                    if self.players[player_id].resources[f'{typ}_book'] >= num:
+                    if self.players[player_id].counters[BOOK_INDEX[typ]] >= num:
                         return True
                 case 'all', 'any':
                     if sum([self.setup.current_global_books[f'{x}_book'] for x in ['bank','law','engineering','medical']]) >= num:
@@ -1152,23 +1607,23 @@ class GameStateBase:
 
             match where:
                 case 'self':
-                    if self.players[player_id].resources['meeples'] >= num:
+                    if self.players[player_id].counters[MEEPLES] >= num:
                         return True
                 case 'all':
-                    if self.players[player_id].resources['all_meeples'] >= num:
+                    if self.players[player_id].counters[ALL_MEEPLES] >= num:
                         return True                    
                 case _:
                     raise ValueError(f'不存在【{where}】处的米宝')
             return False
         
         def check_magics(player_id: int, zone: int, num: int) -> bool:
-            if self.players[player_id].magics[zone] >= num:
+            if self.players[player_id].counters[MAGIC_INDEX[zone]] >= num:
                 return True
             else:
                 return False
         
         def check_score(player_id: int, num: int) -> bool:
-            if self.players[player_id].boardscore >= num:
+            if self.players[player_id].counters[BOARDSCORE] >= num:
                 return True
             else:
                 return False
@@ -1186,21 +1641,21 @@ class GameStateBase:
                 return True
         
         def check_build(player_id: int, building_id: int) -> bool:
-            if self.players[player_id].buildings[building_id] >= 1:
+            if self.players[player_id].counters[BUILDING_INDEX[building_id]] >= 1:
                 return True
             return False
         
         def check_bridge(player_id: int) -> bool:
-            if self.players[player_id].resources['all_bridges'] >= 1:
+            if self.players[player_id].counters[ALL_BRIDGES] >= 1:
                 '''判断是否可建桥（有控制地块是可建桥地块，且其桥连接对侧地块未被其他玩家占领，且该桥位尚未被建造）'''
                 # 获取以控制的可建桥位
                 for pos in self.players[player_id].controlled_map_ids:
-                    if pos in self.map_board_state.enable_bridge_pos_dict.keys():
-                        for corresponding_pos in self.map_board_state.enable_bridge_pos_dict[pos]:
+                    if pos in BRIDGE_PARTNERS:
+                        for corresponding_pos in BRIDGE_PARTNERS[pos]:
                             p,q = pos
                             i,j = corresponding_pos
                             # 判断对侧地块是否被其他玩家控制
-                            if self.map_board_state.map_grid[i][j][1] in (-1, player_id):
+                            if self.map_board_state.cells[CELL_OFFSETS[i][j] + CELL_CONTROLLER] in (-1, player_id):
                                 # 如无，则排序可建桥位两侧坐标（小者在前）
                                 if p > i or (p == i and q > j):
                                     bridge_key = ((i,j),(p,q))
@@ -1216,12 +1671,7 @@ class GameStateBase:
             
         def check_shovel(player_id: int) -> bool:
             # 判断是否存在可铲地（至少一铲）
-            for i,j in self.players[player_id].reachable_map_ids:
-                terrain = self.map_board_state.map_grid[i][j][0]
-                # 如有则跳出是否可铲判断
-                if self.players[player_id].terrain_id_need_shovel_times[terrain] >= 1:
-                    return True
-            return False
+            return bool(self.players[player_id].reachable_mask & self.terrain_mask_by_shovel_times(player_id, min_shovel_times=1))
                  
         all_check_list = {
             'money': check_money,
@@ -1236,28 +1686,55 @@ class GameStateBase:
             'spade': check_shovel,
         }
 
-        def check(player_id: int, list_to_be_checked: list) -> bool:
-            for check_item, *check_args in list_to_be_checked:
-                if check_item not in all_check_list:
-                    raise ValueError(f'非法状态检查对象：{check_item}')
-                else:
-                    if all_check_list[check_item](player_id,*check_args) == False:
-                        return False
+        def check_cost(player_id: int, cost: tuple) -> bool:
+            """检查编译后的花费（见 compile_cost）"""
+            requirements, book_total, special_items = cost
+            counters = self.players[player_id].counters
+            for idx, num in requirements:
+                if counters[idx] < num:
+                    return False
+            if book_total and counters[BANK_BOOK] + counters[LAW_BOOK] + counters[ENGINEERING_BOOK] + counters[MEDICAL_BOOK] < book_total:
+                return False
+            for check_item, *check_args in special_items:
+                if all_check_list[check_item](player_id, *check_args) == False:
+                    return False
             return True
-        
-        return check
+
+        def check_costs(player_id: int, costs) -> list[bool]:
+            """一次检查多项编译后的花费，返回各项是否可支付（共用同一玩家的计数器与书合计）"""
+            counters = self.players[player_id].counters
+            books = counters[BANK_BOOK] + counters[LAW_BOOK] + counters[ENGINEERING_BOOK] + counters[MEDICAL_BOOK]
+            affordable = []
+            for requirements, book_total, special_items in costs:
+                for idx, num in requirements:
+                    if counters[idx] < num:
+                        affordable.append(False)
+                        break
+                else:
+                    affordable.append(
+                        books >= book_total
+                        and all(all_check_list[check_item](player_id, *check_args) != False for check_item, *check_args in special_items)
+                    )
+            return affordable
+
+        def check(player_id: int, list_to_be_checked: list) -> bool:
+            return check_cost(player_id, compile_cost(tuple(list_to_be_checked)))
+
+        return check, check_cost, check_costs
 
     def init_adjust(self):
 
         def adjust_money(player_id: int, mode: str, num: int):
             mode_factor = 1 if mode == 'get' else -1
-            self.players[player_id].resources['money'] += mode_factor * num
-            self.io.update_player_state(player_id, {'money': self.players[player_id].resources['money']})
+            self.players[player_id].counters[MONEY] += mode_factor * num
+            if not self.headless:
+                self.io.update_player_state(player_id, {'money': self.players[player_id].counters[MONEY]})
         
         def adjust_ore(player_id:int , mode: str, num:int):
             mode_factor = 1 if mode == 'get' else -1
-            self.players[player_id].resources['ore'] += mode_factor * num
-            self.io.update_player_state(player_id, {'ore': self.players[player_id].resources['ore']})
+            self.players[player_id].counters[ORE] += mode_factor * num
+            if not self.headless:
+                self.io.update_player_state(player_id, {'ore': self.players[player_id].counters[ORE]})
         
         def adjust_book(player_id:int , mode: str, typ: str, num: int):
             match mode, typ:
@@ -1265,40 +1742,41 @@ class GameStateBase:
                     act_num = min(sum(self.setup.current_global_books.values()), num)
                     for time in range(act_num):
                         # print(f'请选择您想获取的第{time + 1}本书的类型')
-                        if self.invoke_immediate_aciton(player_id, ('select_book', 'get')): return 
+                        yield from self.invoke_immediate_aciton(player_id, ('select_book', 'get'))
                 case 'get', _:
                     act_num = min(self.setup.current_global_books[f'{typ}_book'], num)
                     self.setup.current_global_books[f'{typ}_book'] -= act_num
-                    self.players[player_id].resources[f'{typ}_book'] += act_num
+                    self.players[player_id].counters[BOOK_INDEX[typ]] += act_num
                 case 'use', 'any':
                     for time in range(num):
                         # print(f'请选择您想使用的第{time + 1}本书的类型')
-                        if self.invoke_immediate_aciton(player_id, ('select_book', 'use')): return 
+                        yield from self.invoke_immediate_aciton(player_id, ('select_book', 'use'))
                 case 'use', _:
-                    if num <= self.players[player_id].resources[f'{typ}_book']:
-                        self.players[player_id].resources[f'{typ}_book'] -= num
+                    if num <= self.players[player_id].counters[BOOK_INDEX[typ]]:
+                        self.players[player_id].counters[BOOK_INDEX[typ]] -= num
                         self.setup.current_global_books[f'{typ}_book'] += num
                     else:
                         raise ValueError(f'{player_id + 1}号玩家未拥有{typ}书{num}本')
-            self.io.update_player_state(player_id, {f'{x}_book': self.players[player_id].resources[f'{x}_book'] for x in ['bank', 'law', 'engineering', 'medical']})
+            if not self.headless:
+                self.io.update_player_state(player_id, {f'{x}_book': self.players[player_id].resources[f'{x}_book'] for x in ['bank', 'law', 'engineering', 'medical']})
 
         def adjust_meeple(player_id: int, mode: str, args):
             match mode:
                 case 'get':
                     num = args
-                    act_num = min(num, self.players[player_id].resources['all_meeples'])
-                    self.players[player_id].resources['all_meeples'] -=  act_num
-                    self.players[player_id].resources['meeples'] += act_num
+                    act_num = min(num, self.players[player_id].counters[ALL_MEEPLES])
+                    self.players[player_id].counters[ALL_MEEPLES] -=  act_num
+                    self.players[player_id].counters[MEEPLES] += act_num
                 case 'use':
                     num = args
-                    if num <= self.players[player_id].resources['meeples']:
-                        self.players[player_id].resources['meeples'] -= num 
-                        self.players[player_id].resources['all_meeples'] +=  num
+                    if num <= self.players[player_id].counters[MEEPLES]:
+                        self.players[player_id].counters[MEEPLES] -= num 
+                        self.players[player_id].counters[ALL_MEEPLES] +=  num
                     else:
                         raise ValueError(f'{player_id + 1}号玩家未拥有{num}个米宝')
                 case 'climb':
                     typ = args
-                    self.players[player_id].resources['meeples'] -= 1
+                    self.players[player_id].counters[MEEPLES] -= 1
                     for i in range(4):
                         if self.display_board_state.science_tracks[typ]['meeples'][i] == False:
                             self.display_board_state.science_tracks[typ]['meeples'][i] = True
@@ -1309,26 +1787,28 @@ class GameStateBase:
                             break
                     else:
                         climb_num = 1
-                        self.players[player_id].resources['all_meeples'] +=  1
-                    climb_track(player_id, typ, climb_num)
+                        self.players[player_id].counters[ALL_MEEPLES] +=  1
+                    yield from climb_track(player_id, typ, climb_num)
                     # 插入米宝行动效果触发
-                    self.action_effect(player_id=player_id, insert_meeple=True)
-            self.io.update_player_state(player_id, {'meeple': self.players[player_id].resources['meeples']})
+                    yield from self.action_effect(player_id=player_id, insert_meeple=True)
+            if not self.headless:
+                self.io.update_player_state(player_id, {'meeple': self.players[player_id].counters[MEEPLES]})
                 
         def adjust_score(player_id: int, mode: str, which: str, num: int):
             mode_factor = 1 if mode == 'get' else -1
             match which:
                 case 'board':
-                    self.players[player_id].boardscore += mode_factor * num
+                    self.players[player_id].counters[BOARDSCORE] += mode_factor * num
                 case 'track':
-                    self.players[player_id].trackscore += mode_factor * num
+                    self.players[player_id].counters[TRACKSCORE] += mode_factor * num
                 case 'chain':
-                    self.players[player_id].chainscore += mode_factor * num
+                    self.players[player_id].counters[CHAINSCORE] += mode_factor * num
                 case 'resource':
-                    self.players[player_id].resourcescore += mode_factor * num
+                    self.players[player_id].counters[RESOURCESCORE] += mode_factor * num
                 case _:
                     raise ValueError(f'不存在【{which}】板块分数')
-            self.io.update_player_state(player_id, {'score': self.players[player_id].boardscore})
+            if not self.headless:
+                self.io.update_player_state(player_id, {'score': self.players[player_id].counters[BOARDSCORE]})
     
         def magic_rotation(player_id: int, mode:str, num:int):
             match mode:
@@ -1358,7 +1838,8 @@ class GameStateBase:
                 case 'science_tile_18':
                     self.players[player_id].magics[3] += num
                     # 科技板块效果-宫殿
-            self.io.update_player_state(player_id, {f'magics_{x}': self.players[player_id].magics[x] for x in range(1, 4)})
+            if not self.headless:
+                self.io.update_player_state(player_id, {f'magics_{x}': self.players[player_id].magics[x] for x in range(1, 4)})
 
         def climb_track(player_id: int, typ: str, num: int):
 
@@ -1386,6 +1867,8 @@ class GameStateBase:
                 
                 after_climb = self.players[player_id].tracks[typ]
                 actual_num = after_climb - before_climb
+                if actual_num:
+                    self.update_track_rank_scores(typ)
 
                 if before_climb < 3 <= after_climb:
                     magic_rotation(player_id, 'get', 1)
@@ -1394,27 +1877,16 @@ class GameStateBase:
                 if before_climb < 7 <= after_climb:
                     magic_rotation(player_id, 'get', 2)
                 if before_climb < 9 <= after_climb:
+                    # 轨道等级9的收入效果为游戏状态的绑定方法，以便随快照复制
                     match typ:
                         case 'bank':
-                            def display_board_bank_tracks_9(player_idx):
-                                self.adjust(player_idx, [('money', 'get', 3)])
-                                # print(f'银行轨道等级9 -> 3块钱')
-                            self.players[player_id].income_effect_list.append(display_board_bank_tracks_9)
+                            self.players[player_id].income_effect_list.append(self.display_board_bank_tracks_9)
                         case 'law':
-                            def display_board_law_tracks_9(player_idx):
-                                self.adjust(player_idx, [('magics', 'get', 6)])
-                                # print(f'法律轨道等级9 -> 6转魔')
-                            self.players[player_id].income_effect_list.append(display_board_law_tracks_9)
+                            self.players[player_id].income_effect_list.append(self.display_board_law_tracks_9)
                         case 'engineering':
-                            def display_board_engineering_tracks_9(player_idx):
-                                self.adjust(player_idx, [('ore', 'get', 1)])
-                                # print(f'工程轨道等级9 -> 1矿')
-                            self.players[player_id].income_effect_list.append(display_board_engineering_tracks_9)
+                            self.players[player_id].income_effect_list.append(self.display_board_engineering_tracks_9)
                         case 'medical':
-                            def display_board_medical_tracks_9(player_idx):
-                                self.adjust(player_idx, [('score', 'get', 'board', 3)])
-                                # print(f'医疗轨道等级9 -> 3分')
-                            self.players[player_id].income_effect_list.append(display_board_medical_tracks_9)
+                            self.players[player_id].income_effect_list.append(self.display_board_medical_tracks_9)
                         case _:
                             raise ValueError(f'不存在{typ}轨道效果')
                 if before_climb < 12 <= after_climb:
@@ -1432,10 +1904,10 @@ class GameStateBase:
                     else:
                         # 如无，则跳出循环，取消后续立即行动调起
                         break
-                    if self.invoke_immediate_aciton(player_id, ('select_track',)): return 
+                    yield from self.invoke_immediate_aciton(player_id, ('select_track',))
 
             # 爬轨行动效果
-            self.action_effect(player_id=player_id, climb_track_nums=actual_num)
+            yield from self.action_effect(player_id=player_id, climb_track_nums=actual_num)
 
         def adjust_terrain(player_id: int, shovel_times: int):
 
@@ -1453,9 +1925,9 @@ class GameStateBase:
             else:
                 new_terrain_id = current_terrain_id - factor * shovel_times
 
-            self.map_board_state.map_grid[i][j][0] = new_terrain_id
+            self.map_board_state.set_terrain(i, j, new_terrain_id)
             # 铲子行动效果
-            self.action_effect(player_id=player_id, shovel_times=shovel_times)
+            yield from self.action_effect(player_id=player_id, shovel_times=shovel_times)
 
             self.io.update_terrain(i,j,self.map_board_state.map_grid[i][j][0])
 
@@ -1485,10 +1957,10 @@ class GameStateBase:
                 ):
                     if mode == 'build_setup':
                         # 立即选择位置
-                        if self.invoke_immediate_aciton(
+                        yield from self.invoke_immediate_aciton(
                             player_id, 
                             ('select_position', 'anywhere', set([self.players[player_id].planning_card_id]))
-                        ): return 
+                        )
                         # 获取选择的位置
                         i,j = self.players[player_id].choice_position
 
@@ -1496,7 +1968,7 @@ class GameStateBase:
                         # 获取之前第一铲地位置
                         i,j = self.players[player_id].choice_position
                         # 支付建造工会费用
-                        self.adjust(player_id, [('money', 'use', 2), ('ore', 'use', 1)])
+                        yield from self.adjust(player_id, [('money', 'use', 2), ('ore', 'use', 1)])
 
                     elif mode == 'build_special_palace_tile_n':
                         pass
@@ -1516,33 +1988,26 @@ class GameStateBase:
                                 self.players[player_id].resources['ore']
                                 // self.players[player_id].shovel_level
                             )
-                        # 判断是否存在可建地
-                        for p,q in self.players[player_id].reachable_map_ids:
-                            terrain, controller = self.map_board_state.map_grid[p][q][:2]
-                            # 如有则选择可建地并跳出判断
-                            if (
-                                self.players[player_id].terrain_id_need_shovel_times[terrain] <= max_shovel_times
-                                and controller == -1    
-                            ):
-                                if self.invoke_immediate_aciton(
-                                    player_id, 
-                                    ('select_position', 'reachable', ('build', max_shovel_times))
-                                ): return 
-                                i,j = self.players[player_id].choice_position
-                                cur_terrain = self.map_board_state.map_grid[i][j][0]
-                                need_shovel_times = self.players[player_id].terrain_id_need_shovel_times[cur_terrain]
-                                # 支付铲地费用
-                                self.adjust(
-                                    player_id, 
-                                    [
-                                        ('ore', 'use', need_shovel_times * self.players[player_id].shovel_level),
-                                        ('land', need_shovel_times),
-                                    ],
-                                )
-                                if mode == 'build_normal':
-                                    # 支付建造工会费用
-                                    self.adjust(player_id, [('money', 'use', 2), ('ore', 'use', 1)])
-                                break
+                        # 判断是否存在可建地，如有则选择可建地
+                        if self.players[player_id].reachable_mask & self.terrain_mask_by_shovel_times(player_id, max_shovel_times=max_shovel_times):
+                            yield from self.invoke_immediate_aciton(
+                                player_id, 
+                                ('select_position', 'reachable', ('build', max_shovel_times))
+                            )
+                            i,j = self.players[player_id].choice_position
+                            cur_terrain = self.map_board_state.map_grid[i][j][0]
+                            need_shovel_times = self.players[player_id].terrain_id_need_shovel_times[cur_terrain]
+                            # 支付铲地费用
+                            yield from self.adjust(
+                                player_id, 
+                                [
+                                    ('ore', 'use', need_shovel_times * self.players[player_id].shovel_level),
+                                    ('land', need_shovel_times),
+                                ],
+                            )
+                            if mode == 'build_normal':
+                                # 支付建造工会费用
+                                yield from self.adjust(player_id, [('money', 'use', 2), ('ore', 'use', 1)])
                         else:
                             if mode == 'build_normal':
                                 raise ValueError(f'无可建地')
@@ -1562,8 +2027,9 @@ class GameStateBase:
                         case [_, _, pre_building_id, pre_side_building_num, pre_is_neutral] if pre_building_id != 0:    
                             raise ValueError(f'{chr(ord('A')+i)}{j+1}处已存在建筑')          
                     # 修改地块控制玩家id和建筑id和建筑性质
-                    self.map_board_state.map_grid[i][j][1:3] = player_id, to_build_id
-                    self.map_board_state.map_grid[i][j][4] = is_neutral
+                    self.map_board_state.set_building(i, j, player_id, to_build_id, self.map_board_state.map_grid[i][j][3], is_neutral)
+                    self.update_settlement_stats(player_id, (i,j))
+                    self.connect_chain(player_id, (i,j))
                     panel_update((i,j))
                     # 调整玩家规划板上建筑数量
                     if mode == 'build_setup':
@@ -1589,7 +2055,7 @@ class GameStateBase:
                         self.players[player_id].buildings[to_build_id] -= 1
                     # 更新控制地块与可抵地块
                     self.players[player_id].controlled_map_ids.add((i,j))
-                    self.update_reachable_map_ids_set(player_id, (i,j))
+                    self.update_reachable_mask(player_id, (i,j))
                     # 定义检查模式为建造
                     check_mode = 'build'
 
@@ -1611,31 +2077,25 @@ class GameStateBase:
                                         # 升级为工会时
                                         case 2:
                                             # 判读该地块相邻是否有邻居
-                                            direction = [(-1,i%2-1),(-1,i%2),(0,-1),(0,1),(1,i%2-1),(1,i%2)]
-                                            for dx, dy in direction:
-                                                new_i, new_j = i+dx, j+dy
-                                                if 0 <= new_i <= 8 and 0 <= new_j <= 12:
-                                                    controlled_id = self.map_board_state.map_grid[new_i][new_j][1]
-                                                    if controlled_id != -1 and controlled_id != player_id:
-                                                        # 支付有邻居的升级费用
-                                                        self.adjust(player_id, [('money', 'use', 3), ('ore', 'use', 2)])
-                                                        break
+                                            if NEIGHBOR_MASKS[i][j] & self.map_board_state.foreign_mask(player_id):
+                                                # 支付有邻居的升级费用
+                                                yield from self.adjust(player_id, [('money', 'use', 3), ('ore', 'use', 2)])
                                             else:
                                                 # 支付无邻居的升级费用
-                                                self.adjust(player_id, [('money', 'use', 6), ('ore', 'use', 2)])
+                                                yield from self.adjust(player_id, [('money', 'use', 6), ('ore', 'use', 2)])
                                         # 升级为宫殿时
                                         case 3:
                                             # 支付升级费用
-                                            self.adjust(player_id, [('money', 'use', 6), ('ore', 'use', 4)])
+                                            yield from self.adjust(player_id, [('money', 'use', 6), ('ore', 'use', 4)])
                                             # 标记宫殿已经获得
                                             self.players[player_id].is_got_palace = True
                                             # 激活宫殿板块
                                             cur_player_palace_tile_id = self.players[player_id].palace_tile_id
-                                            self.all_available_object_dict['palace_tile'][cur_player_palace_tile_id].activate(player_id)
+                                            yield from self.all_available_object_dict['palace_tile'][cur_player_palace_tile_id].activate(player_id)
                                         # 升级为学院时
                                         case 4:
                                             # 支付升级费用 并 立即获取一个能力板块
-                                            self.adjust(player_id, [
+                                            yield from self.adjust(player_id, [
                                                 ('money', 'use', 5),
                                                 ('ore', 'use', 3),
                                                 ('ability_tile',)
@@ -1643,7 +2103,7 @@ class GameStateBase:
                                         # 升级为大学时
                                         case 5:
                                             # 支付升级费用 并 立即获取一个能力板块
-                                            self.adjust(player_id, [
+                                            yield from self.adjust(player_id, [
                                                 ('money', 'use', 8), 
                                                 ('ore', 'use', 5),
                                                 ('ability_tile',)
@@ -1659,10 +2119,11 @@ class GameStateBase:
                             
                             # 修改地块的建筑id和侧楼数量和建筑性质 与 玩家规划板上建筑数量
                             if to_build_id != 8:
-                                self.map_board_state.map_grid[i][j][2:] = to_build_id, pre_side_building_num, is_neutral
+                                self.map_board_state.set_building(i, j, player_id, to_build_id, pre_side_building_num, is_neutral)
                                 self.players[player_id].buildings[pre_building_id] += 1
                             else:
-                                self.map_board_state.map_grid[i][j][2:] = pre_building_id, 1, pre_is_neutral
+                                self.map_board_state.set_building(i, j, player_id, pre_building_id, 1, pre_is_neutral)
+                            self.update_settlement_stats(player_id, (i,j))
                             panel_update((i,j))
                             self.players[player_id].buildings[to_build_id] -= 1
                             # 定义检查模式为升级
@@ -1682,33 +2143,24 @@ class GameStateBase:
                     # 判断是否处于地图边缘
                     if i == 0 or i == 8 or j == 0 or j == 12:
                         is_edge =True
-                    # 判断是否处于河边
-                    direction = [(-1,i%2-1),(-1,i%2),(0,-1),(0,1),(1,i%2-1),(1,i%2)]
-                    for dx,dy in direction:
-                        new_i, new_j = i + dx, j + dy
-                        if (
-                            # 在合法边界内
-                            0 <= new_i <= 8 and 0 <= new_j <= 12
-                            # 是水域地形
-                            and self.map_board_state.map_grid[new_i][new_j][0] == 0
-                        ):
-                            is_riverside = True
-                            break
+                    # 判断是否处于河边（相邻地块中存在水域）
+                    if NEIGHBOR_MASKS[i][j] & self.map_board_state.terrain_masks[0]:
+                        is_riverside = True
                 # 建筑行动效果触发
-                self.action_effect(player_id=player_id, building_id=to_build_id, is_edge=is_edge, is_riverside=is_riverside)
+                yield from self.action_effect(player_id=player_id, building_id=to_build_id, is_edge=is_edge, is_riverside=is_riverside)
 
             # 初始建造和建造侧楼不会触发吸取魔力立即行动
             if not (mode == 'build_annex' or mode == 'build_setup'):
                 # 执行吸取魔力立即行动（如有）
-                self.absorb_magics_check(player_id, (i,j))
+                yield from self.absorb_magics_check(player_id, (i,j))
             # 更新聚落及检查城市建立
-            self.city_establishment_check(player_id,check_mode,(i,j))
+            yield from self.city_establishment_check(player_id,check_mode,(i,j))
 
         def build_bridge(player_id: int):
             # 调起建桥立即行动（保证一定可建）
             if self.check(player_id, [('bridge',)]):
                 self.players[player_id].resources['all_bridges'] -= 1
-                if self.invoke_immediate_aciton(player_id, ('build_bridge',)): return 
+                yield from self.invoke_immediate_aciton(player_id, ('build_bridge',))
              
         def shovel(player_id: int, shovel_times: int, can_build_after_shovel: bool = True):
             # 初始化第一铲地标记和位置
@@ -1716,17 +2168,11 @@ class GameStateBase:
             first_pos = tuple()
             # 当仍然存在剩余铲数时
             while shovel_times > 0:
-                # 判断是否存在可铲地（至少一铲）
-                for i,j in self.players[player_id].reachable_map_ids:
-                    terrain = self.map_board_state.map_grid[i][j][0]
-                    # 如有则跳出是否可铲判断
-                    if self.players[player_id].terrain_id_need_shovel_times[terrain] >= 1:
-                        break
-                else:
-                    # 未跳出，则代表无可铲地块，则跳出铲行动
+                # 判断是否存在可铲地（至少一铲），无可铲地块则跳出铲行动
+                if not self.players[player_id].reachable_mask & self.terrain_mask_by_shovel_times(player_id, min_shovel_times=1):
                     break
                 # 选择可铲位置（保证一定存在可铲地）
-                if self.invoke_immediate_aciton(player_id, ('select_position', 'reachable', ('shovel', 1))): return 
+                yield from self.invoke_immediate_aciton(player_id, ('select_position', 'reachable', ('shovel', 1)))
                 # 记录一铲地坐标
                 if first_shovel:
                     first_pos = self.players[player_id].choice_position
@@ -1739,7 +2185,7 @@ class GameStateBase:
                 # 判断铲当前地块的实际用铲量（需铲次数 和 剩余铲数 的两者小值）
                 act_current_shovel_times = min(self.players[player_id].terrain_id_need_shovel_times[terrain], shovel_times)
                 # 将该地块铲 实际用铲量 下
-                adjust_terrain(player_id, act_current_shovel_times)
+                yield from adjust_terrain(player_id, act_current_shovel_times)
                 # 更新剩余铲数
                 shovel_times -= act_current_shovel_times
 
@@ -1756,13 +2202,17 @@ class GameStateBase:
                     ('building', 1)
                 ]):
                     self.players[player_id].choice_position = first_pos
-                    if self.invoke_immediate_aciton(player_id,('build_workshop',)): return 
+                    yield from self.invoke_immediate_aciton(player_id,('build_workshop',))
 
         def improve_navigation(player_id):
             # 判断是否可升级
             if self.players[player_id].navigation_level < 3:
                 # 执行提升航行等级动作
                 self.players[player_id].navigation_level += 1
+                self.update_reachable_mask(player_id)
+                # 航行等级提升后，各建筑可能与更远的己方建筑相连
+                for pos in self.players[player_id].controlled_map_ids:
+                    self.connect_chain(player_id, pos)
                 # 查询本次提升奖励
                 reward = []
                 if self.players[player_id].planning_card_id == 3:
@@ -1780,11 +2230,12 @@ class GameStateBase:
                         case 3:
                             reward.append(('score', 'get', 'board', 4))
                 # 获取本次提升奖励
-                self.adjust(player_id, reward)
+                yield from self.adjust(player_id, reward)
                 # 升级航行行动效果触发
-                self.action_effect(player_id=player_id, improve_navigation_or_shovel=True)
+                yield from self.action_effect(player_id=player_id, improve_navigation_or_shovel=True)
 
-            self.io.update_player_state(player_id, {'navigation_level': self.players[player_id].navigation_level})
+            if not self.headless:
+                self.io.update_player_state(player_id, {'navigation_level': self.players[player_id].navigation_level})
 
 
         def improve_shovel(player_id: int):
@@ -1800,16 +2251,17 @@ class GameStateBase:
                     case 1:
                         reward.append(('score', 'get', 'board', 6))
                 # 获取本次提升奖励
-                self.adjust(player_id, reward)
+                yield from self.adjust(player_id, reward)
                 # 升级铲子行动效果触发
-                self.action_effect(player_id=player_id, improve_navigation_or_shovel=True)
+                yield from self.action_effect(player_id=player_id, improve_navigation_or_shovel=True)
         
-            self.io.update_player_state(player_id, {'shovel_level': self.players[player_id].shovel_level})
+            if not self.headless:
+                self.io.update_player_state(player_id, {'shovel_level': self.players[player_id].shovel_level})
 
         def get_ability_tile(player_id: int):
             for ability_tile_id in range(1,13):
                 if self.all_available_object_dict['ability_tile'][ability_tile_id].check_get(player_id):
-                    if self.invoke_immediate_aciton(player_id, ('select_ability_tile',)): return 
+                    yield from self.invoke_immediate_aciton(player_id, ('select_ability_tile',))
                     break
 
         all_adjust_list = {
@@ -1830,13 +2282,21 @@ class GameStateBase:
         }
 
         def adjust(player_id: int, list_to_be_adjusted) -> tuple[str, str]:
+            # 调整前后均更新版本号（调整中途调起立即行动前后的修改由决策点版本号区分）
+            self.players[player_id].version = self.adjust_version = next(state_versions)
             reward_str_list = []
             spend_str_list = []
             for adjust_item, *adjust_args in list_to_be_adjusted:
                 if adjust_item not in all_adjust_list:
                     raise ValueError(f'非法状态调整对象：{adjust_item}')
                 else:
-                    all_adjust_list[adjust_item](player_id, *adjust_args)
+                    adjust_effect = all_adjust_list[adjust_item](player_id, *adjust_args)
+                    # 可能调起立即行动的调整为生成器，逐层传递其决策点
+                    if adjust_effect is not None:
+                        yield from adjust_effect
+                    # 无界面模式不生成效果说明文本
+                    if self.headless:
+                        continue
                     match adjust_item, adjust_args:
                         case 'money', ('get', num):
                             if num > 0:
@@ -1916,6 +2376,7 @@ class GameStateBase:
                             reward_str_list.append('升1铲子')
                         case 'ability_tile', _:
                             reward_str_list.append('1能力板块')
+            self.players[player_id].version = self.adjust_version = next(state_versions)
             if spend_str_list:
                 spend_str = ' + '.join(spend_str_list)
             else:
@@ -2048,4 +2509,4 @@ class GameStateBase:
             reward.append(('book', 'get', get_ability_tile_typ, 1))
 
         # 获取奖励
-        self.adjust(player_id=player_id, list_to_be_adjusted=reward)
\ No newline at end of file
+        yield from self.adjust(player_id=player_id, list_to_be_adjusted=reward)
\ No newline at end of file
@@ -0,0 +1,126 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from GameEngine import GameEngine
+from web_io import Silence_IO
+import os
+import random
+import sys
+
+class TournamentStats:
+    """对局结果的流式统计（仅保存累计量，不保存各局结果）"""
+    def __init__(self):
+        self.games = 0                                  # 已完成对局数
+        self.total_score_sum = 0                        # 各局总分之和
+        self.winner_score_sum = 0                       # 各局第一名分数之和
+        self.max_total_score = None                     # 最大总分对局的排名分数
+        self.max_winner_score = None                    # 第一名最高分对局的排名分数
+        self.faction_games: dict[int, int] = {}         # 各派系参与对局数
+        self.faction_wins: dict[int, float] = {}        # 各派系获胜次数（并列第一时平分）
+
+    def add(self, scores: list[int], faction_ids: list[int]):
+        """加入一局结果（按玩家id排列的终局总分及派系id）"""
+        rank = tuple(sorted(scores, reverse=True))
+        self.games += 1
+        self.total_score_sum += sum(rank)
+        self.winner_score_sum += rank[0]
+        if self.max_total_score is None or sum(rank) > sum(self.max_total_score):
+            self.max_total_score = rank
+        if self.max_winner_score is None or rank[0] > self.max_winner_score[0]:
+            self.max_winner_score = rank
+
+        winner_ids = [player_id for player_id, score in enumerate(scores) if score == rank[0]]
+        for player_id, faction_id in enumerate(faction_ids):
+            self.faction_games[faction_id] = self.faction_games.get(faction_id, 0) + 1
+            if player_id in winner_ids:
+                self.faction_wins[faction_id] = self.faction_wins.get(faction_id, 0) + 1 / len(winner_ids)
+
+    def merge(self, other: 'TournamentStats'):
+        """合并另一批对局的统计"""
+        self.games += other.games
+        self.total_score_sum += other.total_score_sum
+        self.winner_score_sum += other.winner_score_sum
+        if other.max_total_score is not None and (self.max_total_score is None or sum(other.max_total_score) > sum(self.max_total_score)):
+            self.max_total_score = other.max_total_score
+        if other.max_winner_score is not None and (self.max_winner_score is None or other.max_winner_score[0] > self.max_winner_score[0]):
+            self.max_winner_score = other.max_winner_score
+        for faction_id, games in other.faction_games.items():
+            self.faction_games[faction_id] = self.faction_games.get(faction_id, 0) + games
+        for faction_id, wins in other.faction_wins.items():
+            self.faction_wins[faction_id] = self.faction_wins.get(faction_id, 0) + wins
+
+    def report(self, num_players: int) -> str:
+        """统计报告"""
+        lines = [
+            f'{self.games}局（{num_players}人）最大总分: {self.max_total_score}',
+            f'{self.games}局（{num_players}人）第一名最高分: {self.max_winner_score}',
+            f'{self.games}局（{num_players}人）平均总分{self.total_score_sum / self.games}',
+            f'{self.games}局（{num_players}人）第一名平均分{self.winner_score_sum / self.games}',
+            '各派系胜率:',
+        ]
+        for faction_id in sorted(self.faction_games):
+            lines.append(f'  派系{faction_id}: {self.faction_wins.get(faction_id, 0) / self.faction_games[faction_id]:.3f}（{self.faction_games[faction_id]}局）')
+        return '\n'.join(lines)
+
+# 工作进程内各局共用的对局参数（进程池初始化时设置，每局复制后补充种子）
+worker_game_args: dict = {}
+
+def init_worker(num_players: int, setup_mode: str, setup_tile_args: tuple | None, setup_player_order_args: list | None):
+    """工作进程初始化：设置各局共用的对局参数，并进行一局预热对局（完成首次导入与导入时构建的各表）；
+    各局仍各自构造新的对局引擎（构造约1ms，不足一局随机对局耗时的十分之一，故不复用对局引擎）"""
+    worker_game_args.update({
+        'num_players': num_players,
+        'setup_mode': setup_mode,
+        'setup_tile_args': setup_tile_args,
+        'setup_player_order_args': setup_player_order_args,
+        'action_mode': 'simulate',
+        'web_io': Silence_IO(),
+        'need_estimate': False,
+    })
+    play_games([0])
+
+def play_games(seeds: list[int]) -> TournamentStats:
+    """以给定种子依次进行随机对局，返回本批对局的统计"""
+    stats = TournamentStats()
+    num_players = worker_game_args['num_players']
+    for seed in seeds:
+        game_args = worker_game_args.copy()
+        game_args['seed'] = seed
+        game_args['action_history'] = []
+        if game_args['setup_player_order_args'] is None:
+            game_args['setup_player_order_args'] = random.Random(seed).sample(range(num_players), num_players)
+        game_engine = GameEngine(game_args)
+        game_engine.run_game()
+        stats.add(
+            [game_engine.final_scores[player_id] for player_id in range(num_players)],
+            [player.faction_id for player in game_engine.game_state.players],
+        )
+    return stats
+
+def run_tournament(
+    num_games: int,
+    num_players: int = 3,
+    setup_mode: str = 'random',
+    setup_tile_args: tuple | None = None,
+    setup_player_order_args: list | None = None,
+    seed: int = 0,
+    max_workers: int | None = None,
+    chunk_size: int = 50,
+) -> TournamentStats:
+    """多进程并行进行随机对局（第i局使用种子 seed+i），流式汇总各批结果并显示进度"""
+    stats = TournamentStats()
+    chunks = [list(range(seed + start, seed + min(start + chunk_size, num_games))) for start in range(0, num_games, chunk_size)]
+    with ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count(),
+        initializer=init_worker,
+        initargs=(num_players, setup_mode, setup_tile_args, setup_player_order_args),
+    ) as executor:
+        futures = [executor.submit(play_games, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            stats.merge(future.result())
+            print(f'\r进度: {stats.games}/{num_games}', end='', flush=True)
+    print()
+    return stats
+
+if __name__ == "__main__":
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    num_players = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    print(run_tournament(num_games, num_players).report(num_players))
@@ -0,0 +1,68 @@
+from GameEnv import GameEnv
+import numpy as np
+
+def action_bits_to_array(action_bits_list: list[int], num_actions: int) -> np.ndarray:
+    """各整数位掩码一次展开为定长NumPy布尔掩码数组 (N, num_actions)（第id列对应第id位）"""
+    num_bytes = (num_actions + 7) // 8
+    packed = np.frombuffer(b''.join(action_bits.to_bytes(num_bytes, 'little') for action_bits in action_bits_list), dtype=np.uint8)
+    return np.unpackbits(packed.reshape(len(action_bits_list), num_bytes), axis=1, count=num_actions, bitorder='little').view(bool)
+
+class VecGameEnv:
+    """批量训练环境：同步推进N个独立对局，观测与行动掩码按对局堆叠为NumPy数组，结束的对局自动重开"""
+    def __init__(self, num_envs: int, num_players: int = 3, seed: int = 0, setup_tile_args: tuple | None = None, setup_player_order_args: list | None = None):
+        self.num_envs = num_envs                                       # 对局数量
+        self.num_players = num_players                                 # 玩家数量
+        self.num_actions = GameEnv.num_actions                         # 行动掩码长度
+        self.setup_tile_args = setup_tile_args                         # 初始设置板块（None表示每局随机）
+        self.setup_player_order_args = setup_player_order_args         # 初始玩家顺位（None表示每局随机）
+        self.envs = [GameEnv(num_players) for _ in range(num_envs)]    # 各对局环境
+        self.next_seeds = [seed + idx for idx in range(num_envs)]      # 各对局下一次重开使用的种子（互不重复）
+        self.seeds = self.next_seeds.copy()                            # 各对局当前使用的种子
+        self.obs: np.ndarray | None = None                             # 观测数组 (N, 观测长度)
+        self.masks = np.zeros((num_envs, self.num_actions), dtype=bool)  # 行动掩码数组 (N, 行动数)
+        self.player_ids = np.zeros(num_envs, dtype=np.int64)           # 各对局当前决策玩家id
+
+    def reset_env(self, idx: int):
+        """以该对局的下一个种子重开第idx个对局"""
+        self.seeds[idx] = self.next_seeds[idx]
+        self.next_seeds[idx] += self.num_envs
+        self.envs[idx].reset(self.seeds[idx], self.setup_tile_args, self.setup_player_order_args)
+
+    def write_env(self, idx: int):
+        """将第idx个对局当前决策点的观测与决策玩家id写入批量数组"""
+        env = self.envs[idx]
+        self.obs[idx] = env.observation()
+        self.player_ids[idx] = env.decision[0]
+
+    def write_masks(self):
+        """由各对局的合法行动位掩码一次写入行动掩码数组"""
+        self.masks[:] = action_bits_to_array([env.available_action_bits for env in self.envs], self.num_actions)
+
+    def reset(self):
+        """重开全部对局，返回(观测, 行动掩码, 决策玩家id)"""
+        for idx in range(self.num_envs):
+            self.reset_env(idx)
+        self.obs = np.zeros((self.num_envs, len(self.envs[0].observation())), dtype=np.int32)
+        for idx in range(self.num_envs):
+            self.write_env(idx)
+        self.write_masks()
+        return self.obs, self.masks, self.player_ids
+
+    def step(self, action_ids):
+        """各对局于当前决策点执行对应行动，返回(观测, 行动掩码, 决策玩家id, 终局总分, 是否结束)；
+        终局总分形如 (N, 玩家数)，仅本步结束的对局非零，这些对局已自动重开，其观测为新对局的首个决策点"""
+        rewards = np.zeros((self.num_envs, self.num_players), dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        for idx, action_id in enumerate(action_ids):
+            _, _, final_scores, done = self.envs[idx].step(int(action_id))
+            if done:
+                rewards[idx] = final_scores
+                dones[idx] = True
+                self.reset_env(idx)
+            self.write_env(idx)
+        self.write_masks()
+        return self.obs, self.masks, self.player_ids, rewards, dones
+
+    def sample_actions(self, rng: np.random.Generator) -> np.ndarray:
+        """按行动掩码为各对局均匀随机选择合法行动"""
+        return np.array([rng.choice(env.available_action_ids) for env in self.envs], dtype=np.int64)
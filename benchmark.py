@@ -0,0 +1,393 @@
+from ActionSystem import QUICK_MAGICS_COSTS
+from CheckpointCache import CheckpointCache
+from DetailedAction import ACTION_ID_RANGES, NUM_ACTIONS
+from GameEngine import GameEngine
+from GameEnv import GameEnv
+from GameState import build_navigation_table, compile_cost
+from testing import (
+    QUICK_MAGICS_CHECK_LISTS, make_game_args, random_decisions, record_game, reference_available_actions, reference_check,
+    reference_zobrist_hash,
+)
+from VecGameEnv import action_bits_to_array
+import contextlib
+import copy
+import io
+import numpy as np
+import random
+import sys
+import time
+
+def timeit(func, repeat: int) -> float:
+    """返回多次执行的平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def benchmark_branch(positions=(10, 50, 150), repeat: int = 20, seed: int = 0):
+    """对比于第n条行动处（取其前最近的回合边界）分叉对局时，完整重放与复制游戏状态两种方式的耗时"""
+    action_history, turn_boundaries = record_game(seed)
+    print(f'基准对局共{len(turn_boundaries)}个回合，{len(action_history)}条行动记录')
+
+    for position in positions:
+        turn = max(idx for idx, boundary in enumerate(turn_boundaries) if boundary <= position)
+        prefix = action_history[:turn_boundaries[turn]]
+
+        def replay():
+            game_engine = GameEngine(make_game_args('reproduce', prefix.copy()))
+            return game_engine.run_game()
+
+        # 通过完整重放得到回合边界处的对局，作为分叉源
+        source_engine = GameEngine(make_game_args('reproduce', prefix.copy()))
+        source_engine.run_game()
+
+        def snapshot_restore():
+            game_engine = GameEngine(make_game_args('reproduce', []))
+            game_engine.game_state.restore(source_engine.game_state.snapshot())
+            return game_engine.run_game()
+
+        def branch():
+            game_engine = GameEngine(make_game_args('reproduce', []))
+            source_engine.game_state.copy_to(game_engine.game_state)
+            return game_engine.run_game()
+
+        replay_ms = timeit(replay, repeat)
+        snapshot_restore_ms = timeit(snapshot_restore, repeat)
+        branch_ms = timeit(branch, repeat)
+        print(f'第{position}条行动处（第{turn + 1}回合，前{len(prefix)}条行动）：'
+              f'完整重放 {replay_ms:.2f}ms，快照+恢复 {snapshot_restore_ms:.2f}ms，'
+              f'直接复制 {branch_ms:.2f}ms，加速 {replay_ms / branch_ms:.1f}x')
+
+def benchmark_checkpoint_cache(positions=(50, 100, 150), repeat: int = 20, seed: int = 0):
+    """对比分叉对局共享长前缀时（如估值回溯），有无检查点缓存的重放耗时"""
+    action_history, _ = record_game(seed)
+
+    for position in positions:
+        # 对局不在回合边界处时，每次分叉都需重放行动记录（兄弟分支仅末尾1~3条行动不同）
+        prefix, appendix = action_history[:position - 3], action_history[position - 3:position]
+
+        uncached_engine = GameEngine(make_game_args('reproduce', prefix.copy()))
+        def without_cache():
+            uncached_engine.checkpoint_cache.clear()
+            return uncached_engine.reproduce(appendix)['next_action']
+
+        cached_engine = GameEngine(make_game_args('reproduce', prefix.copy()))
+        def with_cache():
+            return cached_engine.reproduce(appendix)['next_action']
+
+        assert without_cache() == with_cache()
+        without_cache_ms = timeit(without_cache, repeat)
+        with_cache_ms = timeit(with_cache, repeat)
+        cache = cached_engine.checkpoint_cache
+        print(f'第{position}条行动处：无缓存 {without_cache_ms:.2f}ms，有缓存 {with_cache_ms:.2f}ms，'
+              f'加速 {without_cache_ms / with_cache_ms:.1f}x（{len(cache)}个检查点，命中{cache.hits}次）')
+
+def benchmark_step(positions=(10, 50, 150), repeat: int = 20, seed: int = 0):
+    """对比在第n条行动处追加一条行动时，重放全部行动记录与于暂停的决策点直接推进两种方式的耗时"""
+    action_history, _ = record_game(seed)
+
+    for position in positions:
+        prefix, action = action_history[:position], action_history[position]
+
+        def replay():
+            game_engine = GameEngine(make_game_args('reproduce', prefix + [action]))
+            return game_engine.run_game()
+
+        paused_engines = []
+        for _ in range(repeat + 1):
+            game_engine = GameEngine(make_game_args('reproduce', prefix.copy()))
+            game_engine.run_game()
+            paused_engines.append(game_engine)
+
+        def step():
+            return paused_engines.pop().step(action[2])
+
+        replay_ms = timeit(replay, repeat)
+        step_ms = timeit(step, repeat)
+        print(f'第{position}条行动处：重放 {replay_ms:.2f}ms，直接推进 {step_ms:.3f}ms，'
+              f'加速 {replay_ms / step_ms:.0f}x')
+
+def benchmark_legal_actions(seeds=(0, 1, 2), stride: int = 5, repeat: int = 20):
+    """测量合法行动生成耗时：于若干对局每隔stride条行动暂停，对各决策点重复生成合法行动（完整检查与缓存命中）；
+    另按决策玩家控制地块数分组统计，检查耗时不随领土规模增长"""
+    decisions = []
+    for seed in seeds:
+        action_history, _ = record_game(seed)
+        for position in range(0, len(action_history), stride):
+            game_engine = GameEngine(make_game_args('reproduce', action_history[:position]))
+            player_id, typ, args = game_engine.run_game()
+            decisions.append((game_engine.agents[player_id].action_system, typ, args))
+
+    def generate(decisions):
+        for action_system, typ, args in decisions:
+            reference_available_actions(action_system, typ, args)
+
+    def generate_cached(decisions):
+        for action_system, typ, args in decisions:
+            action_system.get_available_actions(typ, args)
+
+    # 重复测量并取最小值，减少噪声
+    generate_us = min(timeit(lambda: generate(decisions), repeat) for _ in range(5)) / len(decisions) * 1000
+    cached_us = min(timeit(lambda: generate_cached(decisions), repeat) for _ in range(5)) / len(decisions) * 1000
+    print(f'合法行动生成（{len(decisions)}个决策点）：完整检查平均每次 {generate_us:.1f}us，缓存命中 {cached_us:.2f}us')
+
+    # 批量定长NumPy布尔掩码：由各决策点的行动id列表逐行写入，或由整数位掩码一次展开（均为缓存命中）
+    def list_to_array(decisions):
+        masks = np.zeros((len(decisions), GameEnv.num_actions), dtype=bool)
+        for idx, (action_system, typ, args) in enumerate(decisions):
+            masks[idx, action_system.get_available_actions(typ, args)] = True
+
+    def bits_to_array(decisions):
+        action_bits_to_array([action_system.get_available_action_mask(typ, args) for action_system, typ, args in decisions], GameEnv.num_actions)
+
+    list_us = min(timeit(lambda: list_to_array(decisions), repeat) for _ in range(5)) / len(decisions) * 1000
+    bits_us = min(timeit(lambda: bits_to_array(decisions), repeat) for _ in range(5)) / len(decisions) * 1000
+    print(f'  批量生成NumPy行动掩码：经行动id列表平均每个决策点 {list_us:.2f}us，经整数位掩码 {bits_us:.2f}us')
+
+    groups: dict[int, list] = {}
+    for decision in decisions:
+        if decision[1] == 'normal':
+            groups.setdefault(len(decision[0].player.controlled_map_ids) // 4 * 4, []).append(decision)
+    for size, group in sorted(groups.items()):
+        group_us = min(timeit(lambda: generate(group), repeat) for _ in range(5)) / len(group) * 1000
+        print(f'  控制{size}-{size + 3}个地块时的常规行动（{len(group)}个决策点）：平均每次 {group_us:.1f}us')
+
+def benchmark_navigation_table():
+    """测量航行距离表的计算耗时（导入时计算一次）"""
+    build_ms = min(timeit(build_navigation_table, 1) for _ in range(5))
+    print(f'航行距离表：计算 {build_ms:.2f}ms')
+
+def original_calculate_players_total_score(self):
+    """引入分数估算前的终局计分函数（GameStateBase.calculate_players_total_score 原样保留，self 为游戏状态），作为分数估算的计时基准；
+    会写入玩家的大链与资源分数并累加科技轨分数"""
+
+    # 计算各玩家大链分数（最大链已随对局增量维护）
+    all_players_largest_chain_num = {player_id: self.players[player_id].largest_chain for player_id in range(self.num_players)}
+
+    sorted_largest_chain_players = sorted(all_players_largest_chain_num.items(), key=lambda x:x[1], reverse=True)
+    chain_score = [18,12,6]
+    order_id = 1
+    while order_id <= 3:
+        for tie_place in range(order_id+1,self.num_players+1):
+            if sorted_largest_chain_players[order_id-1][1] > sorted_largest_chain_players[tie_place-1][1]:
+                break
+        else:
+            tie_place = self.num_players + 1
+        get_score_num = sum(chain_score[order_id-1: tie_place-1]) // (tie_place - order_id)
+        for rank in range(order_id, tie_place):
+            self.players[sorted_largest_chain_players[rank-1][0]].chainscore = get_score_num
+        order_id = tie_place
+
+    # 计算各玩家科技轨分数
+    track_score = [8,4,2]
+    for typ in ['bank', 'law', 'engineering', 'medical']:
+        tracks_all_players = []
+        for player_id in range(self.num_players):
+            tracks_all_players.append((player_id, self.players[player_id].tracks[typ]))
+        tracks_all_players.sort(key=lambda x:x[1], reverse=True)
+        order_id = 1
+        while order_id <= 3:
+            for tie_place in range(order_id+1,self.num_players+1):
+                if tracks_all_players[order_id-1][1] > tracks_all_players[tie_place-1][1]:
+                    break
+            else:
+                tie_place = self.num_players + 1
+            get_score_num = sum(track_score[order_id-1: tie_place-1]) // (tie_place - order_id)
+            for rank in range(order_id, tie_place):
+                self.players[tracks_all_players[rank-1][0]].trackscore += get_score_num
+            order_id = tie_place
+
+    # 计算各玩家资源分数
+    for player_id in range(self.num_players):
+        self.players[player_id].resourcescore = sum(
+            [
+                sum(
+                    self.players[player_id].resources[x]
+                    for x in [
+                        'money', 'ore', 'meeples',
+                        'bank_book', 'law_book', 'engineering_book', 'medical_book',
+                    ]
+                ),
+                self.players[player_id].magics[3],
+                self.players[player_id].magics[2]//2,
+            ]
+        ) // 5
+    return {
+        player_idx: sum([
+            self.players[player_idx].boardscore,
+            self.players[player_idx].chainscore,
+            self.players[player_idx].trackscore,
+            self.players[player_idx].resourcescore
+        ])
+        for player_idx in range(self.num_players)
+    }
+
+def benchmark_project_scores(num_games: int = 20, stride: int = 10, seed: int = 0):
+    """随机对局中每隔stride个决策点估算分数，并与引入分数估算前的终局计分函数比较耗时
+    （其重复调用会累加科技轨分数，计时后还原玩家分数）"""
+    rng = random.Random(seed)
+    env = GameEnv(3)
+    project_us = original_us = 0.0
+    checked = 0
+    for game_idx in range(num_games):
+        env.reset(seed + game_idx)
+        game_state = env.game_engine.game_state
+        step_idx = 0
+        while not env.done:
+            if step_idx % stride == 0:
+                before = [(player.chainscore, player.trackscore, player.resourcescore) for player in game_state.players]
+                project_us += min(timeit(game_state.project_scores, 100) for _ in range(3)) * 1000
+                original_us += min(timeit(lambda: original_calculate_players_total_score(game_state), 100) for _ in range(3)) * 1000
+                for player, (chainscore, trackscore, resourcescore) in zip(game_state.players, before):
+                    player.chainscore, player.trackscore, player.resourcescore = chainscore, trackscore, resourcescore
+                checked += 1
+            env.step(rng.choice(env.available_action_ids))
+            step_idx += 1
+    print(f'分数估算（{checked}个决策点）：平均每次 {project_us / checked:.2f}us，'
+          f'原终局计分函数 {original_us / checked:.2f}us，加速 {original_us / project_us:.1f}x')
+
+def benchmark_player_snapshot(num_steps: int = 150, repeat: int = 200, seed: int = 0):
+    """对局进行num_steps步后复制玩家状态，测量快照内存（计数器数组与等价字典对比）及复制耗时"""
+    rng = random.Random(seed)
+    env = GameEnv(3)
+    env.reset(seed)
+    for _ in range(num_steps):
+        env.step(rng.choice(env.available_action_ids))
+    game_state = env.game_engine.game_state
+    player = game_state.players[0]
+
+    counters_bytes = sys.getsizeof(player.counters)
+    dicts_bytes = sum(sys.getsizeof(dict(view)) for view in (player.resources, player.buildings, player.tracks, player.track_rank_scores, player.magics))
+    player_bytes = CheckpointCache.estimate_bytes({'owner': game_state, 'player': player})
+    snapshot_bytes = CheckpointCache.estimate_bytes(game_state.snapshot())
+    copy_us = timeit(lambda: copy.deepcopy(player, {id(game_state): game_state}), repeat) * 1000
+    counters_copy_us = timeit(lambda: player.counters[:], repeat * 10) * 1000
+    print(f'玩家状态快照：每名玩家约{player_bytes}B（计数器数组{counters_bytes}B，等价字典{dicts_bytes}B），'
+          f'整局快照约{snapshot_bytes}B；复制玩家 {copy_us:.1f}us（其中计数器数组 {counters_copy_us:.2f}us）')
+
+def benchmark_board_snapshot(num_steps: int = 150, repeat: int = 200, seed: int = 0):
+    """对局进行num_steps步后复制地图状态，与复制等价的嵌套列表地图网格比较内存与耗时"""
+    rng = random.Random(seed)
+    env = GameEnv(3)
+    env.reset(seed)
+    for _ in range(num_steps):
+        env.step(rng.choice(env.available_action_ids))
+    map_board_state = env.game_engine.game_state.map_board_state
+
+    nested_grid = [[list(cell) for cell in row] for row in map_board_state.map_grid]
+    nested_bytes = CheckpointCache.estimate_bytes({'owner': None, 'map_grid': nested_grid})
+    cells_bytes = sys.getsizeof(map_board_state.cells)
+    nested_us = timeit(lambda: copy.deepcopy(nested_grid), repeat) * 1000
+    board_us = timeit(lambda: copy.deepcopy(map_board_state), repeat) * 1000
+    cells_us = timeit(lambda: map_board_state.cells[:], repeat * 10) * 1000
+    print(f'地图网格快照：字节数组{cells_bytes}B（嵌套列表约{nested_bytes}B）；'
+          f'复制地图状态 {board_us:.1f}us（其中地图网格 {cells_us:.2f}us），复制嵌套列表地图网格 {nested_us:.1f}us')
+
+def sample_player_states(num_games: int, seed: int = 0, stride: int = 10):
+    """随机对局中于初始设置后每隔stride个决策点采样全部玩家状态（深拷贝）与决策玩家，并返回最后一局的游戏状态
+    （花费检查只读取玩家计数器，测量时替换游戏状态的玩家状态即可）"""
+    states = []
+    for _, step_idx, env in random_decisions(num_games, seed):
+        game_state = env.game_engine.game_state
+        if game_state.round > 0 and step_idx % stride == 0:
+            states.append((copy.deepcopy(game_state.players), env.decision[0]))
+    return game_state, states
+
+def benchmark_compiled_costs(num_games: int = 20, seed: int = 0, repeat: int = 20):
+    """于采样的玩家状态上测量快速魔力行动3-8的花费逐项解释与编译后批量检查的耗时"""
+    game_state, states = sample_player_states(num_games, seed)
+    saved_players = game_state.players
+
+    def interpret():
+        for players, player_id in states:
+            game_state.players = players
+            for check_list in QUICK_MAGICS_CHECK_LISTS[2:]:
+                reference_check(game_state, player_id, check_list)
+
+    def compiled():
+        for players, player_id in states:
+            game_state.players = players
+            game_state.check_costs(player_id, QUICK_MAGICS_COSTS[2:])
+
+    interpret_us = min(timeit(interpret, repeat) for _ in range(5)) / len(states) * 1000
+    compiled_us = min(timeit(compiled, repeat) for _ in range(5)) / len(states) * 1000
+    game_state.players = saved_players
+    print(f'编译后的花费检查（{len(states)}个采样状态）：快速魔力行动3-8的花费逐项解释 {interpret_us:.2f}us，编译后批量检查 {compiled_us:.2f}us')
+
+def benchmark_compiled_cost_memo(num_games: int = 20, seed: int = 0, repeat: int = 20):
+    """于采样的玩家状态上测量魔力行动、书行动与高科板块逐个检查花费时，沿用缓存的编译后花费与每次重建花费列表的耗时"""
+    game_state, states = sample_player_states(num_games, seed)
+    saved_players = game_state.players
+    effect_objects = [
+        effect_object for typ in ('magics_action', 'book_action', 'science_tile')
+        for effect_object in game_state.all_available_object_dict[typ].values()
+    ]
+
+    def memoised():
+        for players, player_id in states:
+            game_state.players = players
+            for effect_object in effect_objects:
+                game_state.check_cost(player_id, effect_object.compiled_cost(player_id))
+
+    def rebuilt():
+        for players, player_id in states:
+            game_state.players = players
+            for effect_object in effect_objects:
+                game_state.check_cost(player_id, compile_cost(tuple(effect_object.cost(player_id)[0])))
+
+    memoised_us = min(timeit(memoised, repeat) for _ in range(5)) / len(states) * 1000
+    rebuilt_us = min(timeit(rebuilt, repeat) for _ in range(5)) / len(states) * 1000
+    game_state.players = saved_players
+    print(f'板块花费缓存（{len(states)}个采样状态）：{len(effect_objects)}个板块逐个检查花费，'
+          f'沿用缓存 {memoised_us:.2f}us，每次重建花费列表 {rebuilt_us:.2f}us')
+
+def benchmark_engine_construction(repeat: int = 50):
+    """测量对局构造耗时（行动表于导入时构建，构造对局不再重建）"""
+    construct_us = min(timeit(lambda: GameEngine(make_game_args('reproduce', [])), repeat) for _ in range(5)) * 1000
+    print(f'静态行动表：{len(ACTION_ID_RANGES)}种行动共{NUM_ACTIONS - 1}个行动id，对局构造平均 {construct_us:.0f}us')
+
+def benchmark_zobrist_hash(num_games: int = 20, stride: int = 10, seed: int = 0):
+    """随机对局中每隔stride个决策点测量增量维护的哈希与从头计算哈希的耗时"""
+    incremental_us = reference_us = 0.0
+    timed = 0
+    for _, step_idx, env in random_decisions(num_games, seed):
+        if step_idx % stride == 0:
+            game_state = env.game_engine.game_state
+            incremental_us += timeit(game_state.zobrist_hash, 100) * 1000
+            reference_us += timeit(lambda: reference_zobrist_hash(game_state), 20) * 1000
+            timed += 1
+    print(f'Zobrist 哈希（{timed}个决策点）：取哈希平均每次 {incremental_us / timed:.1f}us，从头计算 {reference_us / timed:.1f}us，'
+          f'加速 {reference_us / incremental_us:.1f}x')
+
+def benchmark_headless(num_games: int = 50):
+    """对比静默IO下生成与不生成说明文本（无界面模式）时的对局吞吐量"""
+    def play_games(action_mode: str, headless: bool):
+        results = []
+        for seed in range(num_games):
+            game_args = make_game_args(action_mode, [])
+            game_args.update({'seed': seed, 'headless': headless})
+            with contextlib.redirect_stdout(io.StringIO()):
+                results.append(GameEngine(game_args).run_game())
+        return results
+
+    for action_mode in ('simulate', 'input'):
+        # 重复测量并取最小值，减少噪声
+        verbose_ms = min(timeit(lambda: play_games(action_mode, False), 1) for _ in range(3)) / num_games
+        headless_ms = min(timeit(lambda: play_games(action_mode, True), 1) for _ in range(3)) / num_games
+        print(f'{action_mode}模式每局：生成说明文本 {verbose_ms:.2f}ms，无界面模式 {headless_ms:.2f}ms，'
+              f'加速 {verbose_ms / headless_ms:.2f}x')
+
+if __name__ == "__main__":
+    benchmark_branch()
+    benchmark_checkpoint_cache()
+    benchmark_step()
+    benchmark_legal_actions()
+    benchmark_project_scores()
+    benchmark_player_snapshot()
+    benchmark_board_snapshot()
+    benchmark_zobrist_hash()
+    benchmark_compiled_costs()
+    benchmark_compiled_cost_memo()
+    benchmark_engine_construction()
+    benchmark_navigation_table()
+    benchmark_headless()
@@ -1,43 +1,57 @@
 from GameEngine import GameEngine
 from web_io import GamePanel, Silence_IO
 import time
+import sys
+from Tournament import run_tournament
+
+# 3人对局的指定初始设置（setup_mode 为 target 时使用）
+SETUP_TILE_ARGS = (
+    3,                                          # 排除的规划卡
+    [2, 3, 5, 8],                               # 派系板块 (3+1=4个)
+    [3, 9, 14,16],                              # 宫殿板块 (3+1=4个)
+    [1, 3, 4, 7, 8, 10],                        # 回合助推板 (3+3=6个)
+    [5, 3, 4, 8, 2, 6],                         # 轮次计分板块
+    2,                                          # 最终计分板块
+    [3, 7, 2, 6, 9, 10, 12, 1, 11, 5, 4, 8],    # 能力板块顺序
+    [3, 5, 18, 7, 4, 2, 9, 11],                 # 科学板块 (2+2*3=8个
+    [2, 4, 6]                                   # 书本行动板块
+)
+SETUP_PLAYER_ORDER_ARGS = [2, 0, 1]
 
 if __name__ == "__main__":
-    # res = []
-    # for i in range(10000):
-        num_players = 3
-        # 初始化网页控制台
-        io = GamePanel(port=5000, player_count=num_players) # 自动启动后台服务
-        io.update_global_status("=== 大创造时代游戏开始 ===")
-        game_args_dict = {
-            'num_players': num_players,
-            'setup_mode': 'random',                         # input | random | target 
-            'setup_tile_args' : (
-                3,                                          # 排除的规划卡
-                [2, 3, 5, 8],                               # 派系板块 (3+1=4个)
-                [3, 9, 14,16],                              # 宫殿板块 (3+1=4个)
-                [1, 3, 4, 7, 8, 10],                        # 回合助推板 (3+3=6个)
-                [5, 3, 4, 8, 2, 6],                         # 轮次计分板块
-                2,                                          # 最终计分板块
-                [3, 7, 2, 6, 9, 10, 12, 1, 11, 5, 4, 8],    # 能力板块顺序
-                [3, 5, 18, 7, 4, 2, 9, 11],                 # 科学板块 (2+2*3=8个
-                [2, 4, 6]                                   # 书本行动板块
-            ),
-            'setup_player_order_args': [2, 0, 1],
-            'action_history': [],
-            'action_mode': 'input',                          # input | sim6ulate | reproduce
-            'web_io': io, # Silence_IO(),
-            'need_estimate': False,
-        }
-        # time.sleep(1)
-        game_engine = GameEngine(game_args_dict)
-        result = game_engine.run_game()
-        print(result)
-        # res.append(result)
-    #     if i % 250 == 0:
-    #         print('-',end=' ',flush=True)
-    # print(f'万局（三人）最大总分: {max(res,key=sum)}')
-    # print(f'万局（三人）第一名最高分: {max(res,key=lambda x: x[0])}')
-    # print(f'万局（三人）平均总分{sum(map(sum,res))/len(res)}')
-    # print(f'万局（三人）第一名平局分{sum(map(lambda x: x[0],res))/len(res)}')
-        
+    if len(sys.argv) > 1 and sys.argv[1] == 'tournament':
+        # 多进程随机对局统计：python main.py tournament [对局数] [玩家数] [初始设置模式 random | target]
+        num_games = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+        num_players = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+        setup_mode = sys.argv[4] if len(sys.argv) > 4 else 'random'
+        match setup_mode:
+            case 'random':
+                stats = run_tournament(num_games, num_players)
+            case 'target' if num_players == 3:
+                stats = run_tournament(num_games, num_players, 'target', SETUP_TILE_ARGS, SETUP_PLAYER_ORDER_ARGS)
+            case 'target':
+                sys.exit('指定初始设置仅适用于3人对局')
+            case _:
+                sys.exit(f'对局统计仅支持 random 或 target 初始设置模式，而非 {setup_mode}')
+        print(stats.report(num_players))
+        sys.exit()
+
+    num_players = 3
+    # 初始化网页控制台
+    io = GamePanel(port=5000, player_count=num_players) # 自动启动后台服务
+    io.update_global_status("=== 大创造时代游戏开始 ===")
+    game_args_dict = {
+        'num_players': num_players,
+        'setup_mode': 'random',                         # input | random | target 
+        'setup_tile_args' : SETUP_TILE_ARGS,
+        'setup_player_order_args': SETUP_PLAYER_ORDER_ARGS,
+        'action_history': [],
+        'action_mode': 'input',                          # input | sim6ulate | reproduce
+        'web_io': io, # Silence_IO(),
+        'need_estimate': False,
+    }
+    # time.sleep(1)
+    game_engine = GameEngine(game_args_dict)
+    result = game_engine.run_game()
+    print(result)
+    
@@ -0,0 +1,589 @@
+from ActionSystem import ActionSystem, action_ids_to_mask
+from CheckpointCache import CheckpointCache
+from DetailedAction import ACTION_ID_RANGES, ACTION_NAMES, ALL_DETAILED_ACTIONS, BRIDGE_ACTION_IDS, POSITION_ACTION_IDS, DetailedAction
+from GameEngine import GameEngine
+from GameEnv import GameEnv
+from VecGameEnv import VecGameEnv
+from web_io import Silence_IO
+from GameState import (
+    CHAIN_PRIZES, MAP_HEIGHT, MAP_WIDTH, NAVIGATION_MASKS, POS_BITS, TERRAIN_GRID, compile_cost, dilate_mask, is_navigable, mask_to_positions,
+    navigation_distance, positions_to_mask, rank_scores,
+)
+from Tournament import TournamentStats, run_tournament
+from testing import (
+    MAIN_ACTION_CHECK_LISTS, make_game_args, random_decisions, record_game, reference_available_actions, reference_check,
+    reference_total_scores, reference_zobrist_hash,
+)
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import copy
+import io
+import numpy as np
+import pytest
+import random
+
+# 对局引擎增量维护数据的等价性检查（pytest）：于随机对局的每个决策点，将增量维护的结果与按定义从头计算的结果对照
+
+def test_incremental_reachable(num_games: int = 100):
+    """各玩家增量维护的可抵达地块与完整重新计算的结果一致"""
+    for game_idx, step_idx, env in random_decisions(num_games):
+        game_state = env.game_engine.game_state
+        for player in game_state.players:
+            incremental = player.reachable_mask
+            game_state.update_reachable_mask(player.player_id)
+            assert player.reachable_mask == incremental, (
+                f'第{game_idx}局第{step_idx}个决策点玩家{player.player_id + 1}可抵达地块不一致: '
+                f'多出{mask_to_positions(incremental & ~player.reachable_mask)}，缺少{mask_to_positions(player.reachable_mask & ~incremental)}')
+            # 恢复增量维护的结果，避免完整计算掩盖后续偏差
+            player.reachable_mask = incremental
+
+def test_bitboards(num_games: int = 20):
+    """地图位棋盘与地图网格逐格一致"""
+    for game_idx, step_idx, env in random_decisions(num_games):
+        map_board_state = env.game_engine.game_state.map_board_state
+        for i, row in enumerate(map_board_state.map_grid):
+            for j, (terrain, owner_id, building_id, _, is_neutral) in enumerate(row):
+                bit = POS_BITS[i][j]
+                assert all(bool(mask & bit) == (terrain == terrain_id) for terrain_id, mask in enumerate(map_board_state.terrain_masks))
+                assert all(bool(mask & bit) == (owner_id == player_id) for player_id, mask in enumerate(map_board_state.player_masks))
+                assert all(bool(mask & bit) == (building_id == key) for key, mask in map_board_state.building_masks.items())
+                assert bool(map_board_state.occupied_mask & bit) == (owner_id != -1), f'第{game_idx}局第{step_idx}个决策点({i},{j})占用位不一致'
+                assert bool(map_board_state.neutral_mask & bit) == bool(is_neutral), f'第{game_idx}局第{step_idx}个决策点({i},{j})中立位不一致'
+
+def test_settlement_stats(num_games: int = 50):
+    """各聚落根节点的累计统计与逐个建筑重新统计的结果一致"""
+    for game_idx, step_idx, env in random_decisions(num_games):
+        game_state = env.game_engine.game_state
+        map_grid = game_state.map_board_state.map_grid
+        for player in game_state.players:
+            expected = {}
+            for pos in player.settlements_and_cities:
+                root = pos
+                while player.settlements_and_cities[root][0] != root:
+                    root = player.settlements_and_cities[root][0]
+                building_id, num_side_building = map_grid[pos[0]][pos[1]][2:4]
+                stats = expected.setdefault(root, [0, 0, 0, 0])
+                stats[0] += game_state.map_board_state.building_magic[building_id] + num_side_building
+                stats[1] += 1 + num_side_building
+                stats[2] += building_id == 5
+                stats[3] += building_id == 7
+            assert player.settlement_stats == expected, f'第{game_idx}局第{step_idx}个决策点玩家{player.player_id + 1}聚落统计不一致'
+
+def test_largest_chain(num_games: int = 50):
+    """各玩家增量维护的最大链与按定义重新计算的结果一致（同一聚落或航行距离不超过航行等级的建筑相连）"""
+    for game_idx, step_idx, env in random_decisions(num_games):
+        game_state = env.game_engine.game_state
+        for player in game_state.players:
+            positions = list(player.settlements_and_cities)
+            roots = {pos: game_state.find_settlement(player.player_id, pos)[0] for pos in positions}
+            unvisited, largest_chain = set(positions), 0
+            while unvisited:
+                stack, chain_size = [unvisited.pop()], 0
+                while stack:
+                    pos = stack.pop()
+                    chain_size += 1
+                    linked = [
+                        other_pos for other_pos in unvisited
+                        if roots[other_pos] == roots[pos] or navigation_distance(pos, other_pos) <= player.navigation_level
+                    ]
+                    unvisited.difference_update(linked)
+                    stack.extend(linked)
+                largest_chain = max(largest_chain, chain_size)
+            assert player.largest_chain == largest_chain, (
+                f'第{game_idx}局第{step_idx}个决策点玩家{player.player_id + 1}最大链不一致: {player.largest_chain} != {largest_chain}')
+
+def test_unlinked_settlement_chain(num_games: int = 20):
+    """未经航行与其他聚落相连的单个聚落按其建筑数量计入大链（而非记为0），大链计分以该最大链排名"""
+    unlinked_count = 0
+    for game_idx, step_idx, env in random_decisions(num_games):
+        game_state = env.game_engine.game_state
+        for player in game_state.players:
+            settlement_sizes = Counter(game_state.find_settlement(player.player_id, pos)[0] for pos in player.settlements_and_cities)
+            for root, settlement_size in settlement_sizes.items():
+                if player.chain_sizes[game_state.find_chain(player.player_id, root)] == settlement_size:
+                    unlinked_count += 1
+                    assert player.largest_chain >= settlement_size, (
+                        f'第{game_idx}局第{step_idx}个决策点玩家{player.player_id + 1}未相连聚落未计入大链')
+        chain_scores = rank_scores(tuple([player.largest_chain for player in game_state.players]), CHAIN_PRIZES)
+        assert [scores['chain'] for scores in game_state.project_scores().values()] == list(chain_scores)
+    assert unlinked_count > 0
+
+def test_project_scores(num_games: int = 20, stride: int = 10, seed: int = 0):
+    """每隔stride个决策点估算的分数与从头计算一致且不修改玩家分数；终局计分重复调用结果不变且等于终局分数"""
+    rng = random.Random(seed)
+    env = GameEnv(3)
+    for game_idx in range(num_games):
+        env.reset(seed + game_idx)
+        game_state = env.game_engine.game_state
+        step_idx = 0
+        while not env.done:
+            if step_idx % stride == 0:
+                before = [(player.chainscore, player.trackscore, player.resourcescore) for player in game_state.players]
+                assert game_state.project_scores() == reference_total_scores(game_state), f'第{game_idx}局第{step_idx}步估算分数不一致'
+                assert before == [(player.chainscore, player.trackscore, player.resourcescore) for player in game_state.players]
+            env.step(rng.choice(env.available_action_ids))
+            step_idx += 1
+        assert game_state.calculate_players_total_score() == game_state.calculate_players_total_score() == env.game_engine.final_scores
+
+def test_zobrist_hash(num_games: int = 20, stride: int = 10):
+    """增量维护的哈希与从头计算一致；每隔stride个决策点检查快照还原与重放得到的对局哈希不变，
+    且仅相差某效果板块附加行动已执行标记的局面哈希不同"""
+    for game_idx, step_idx, env in random_decisions(num_games):
+        game_engine = env.game_engine
+        game_state = game_engine.game_state
+        state_hash = game_state.zobrist_hash()
+        assert state_hash == reference_zobrist_hash(game_state), f'第{game_idx}局第{step_idx}个决策点增量哈希与从头计算不一致'
+        if step_idx % stride:
+            continue
+        restored_engine = GameEngine({**game_engine.game_args, 'action_mode': 'reproduce', 'action_history': []})
+        restored_state = restored_engine.game_state
+        restored_state.restore(game_state.snapshot())
+        assert restored_state.zobrist_hash() == state_hash
+        replayed_engine = GameEngine({**game_engine.game_args, 'action_mode': 'reproduce', 'action_history': game_engine.action_history.copy()})
+        replayed_engine.run_game()
+        assert replayed_engine.game_state.zobrist_hash() == state_hash
+        undone_object, undone_player_id = next(
+            (effect_object, player_id)
+            for effect_objects in restored_state.all_available_object_dict.values()
+            for effect_object in effect_objects.values()
+            for player_id, is_done in enumerate(effect_object.additional_action_is_done) if not is_done
+        )
+        undone_object.mark_additional_action_done(undone_player_id)
+        assert restored_state.zobrist_hash() != state_hash
+        assert restored_state.zobrist_hash() == reference_zobrist_hash(restored_state)
+
+def test_legal_action_cache(num_games: int = 50):
+    """缓存的合法行动与完整检查结果一致（含非当前决策玩家的常规行动），且其他玩家行动后各玩家确有沿用缓存的行动族"""
+    checked_names = []
+
+    def count_checks(action_system: ActionSystem):
+        # 以记录调用的检查函数表替换该行动系统的常规行动检查函数表
+        def counted(name, check_function):
+            def check(action_system):
+                checked_names.append(name)
+                return check_function(action_system)
+            return check
+        action_system.check_actions = {name: counted(name, check_function) for name, check_function in ActionSystem.check_actions.items()}
+
+    reused_families = 0
+    for game_idx, step_idx, env in random_decisions(num_games):
+        if step_idx == 0:
+            for agent in env.game_engine.agents:
+                count_checks(agent.action_system)
+        player_id, typ, args = env.decision
+        decisions = [(agent.action_system, 'normal', tuple()) for agent in env.game_engine.agents if agent.player_id != player_id]
+        decisions.append((env.game_engine.agents[player_id].action_system, typ, args))
+        for action_system, check_typ, check_args in decisions:
+            was_checked = action_system.family_available_action_masks.keys() == ActionSystem.action_dependencies.keys()
+            checked_names.clear()
+            available_action_ids = action_system.get_available_actions(check_typ, check_args)
+            if check_typ == 'normal' and action_system.player_id != player_id and was_checked:
+                reused_families += len(ActionSystem.action_list) - len(checked_names)
+            assert available_action_ids == reference_available_actions(action_system, check_typ, check_args), (
+                f'第{game_idx}局第{step_idx}个决策点玩家{action_system.player_id + 1}的合法行动缓存不一致')
+    assert reused_families > 0, f'{len(ActionSystem.action_dependencies)}个行动族在其他玩家行动后均未沿用缓存'
+
+def test_legal_action_mask(num_games: int = 50):
+    """各玩家缓存的合法行动位掩码与完整检查结果一致"""
+    for game_idx, step_idx, env in random_decisions(num_games):
+        for agent in env.game_engine.agents:
+            check_typ, check_args = env.decision[1:] if agent.player_id == env.decision[0] else ('normal', tuple())
+            reference_action_ids = reference_available_actions(agent.action_system, check_typ, check_args)
+            assert agent.action_system.get_available_action_mask(check_typ, check_args) == action_ids_to_mask(reference_action_ids), (
+                f'第{game_idx}局第{step_idx}个决策点玩家{agent.player_id + 1}的合法行动位掩码不一致')
+
+def test_compiled_costs(num_games: int = 20):
+    """各玩家编译后的花费检查（主要行动与各效果板块，逐个及批量）与逐项解释的结果一致"""
+    for game_idx, step_idx, env in random_decisions(num_games):
+        game_state = env.game_engine.game_state
+        effect_objects = [
+            effect_object for typ in ('science_tile', 'book_action', 'magics_action', 'city_tile', 'palace_tile', 'round_booster')
+            for effect_object in game_state.all_available_object_dict[typ].values()
+        ]
+        for player_id in range(game_state.num_players):
+            check_lists = MAIN_ACTION_CHECK_LISTS + [effect_object.cost(player_id)[0] for effect_object in effect_objects]
+            expected = [reference_check(game_state, player_id, check_list) for check_list in check_lists]
+            assert [game_state.check(player_id, check_list) for check_list in check_lists] == expected, (
+                f'第{game_idx}局第{step_idx}个决策点玩家{player_id + 1}的花费检查不一致')
+            assert game_state.check_costs(player_id, [compile_cost(tuple(check_list)) for check_list in check_lists]) == expected, (
+                f'第{game_idx}局第{step_idx}个决策点玩家{player_id + 1}的批量花费检查不一致')
+
+def test_compiled_cost_memo(num_games: int = 20):
+    """魔力行动、书行动与高科板块缓存的编译后花费与重新编译一致，检查结果与逐项解释一致"""
+    for game_idx, step_idx, env in random_decisions(num_games):
+        game_state = env.game_engine.game_state
+        effect_objects = [
+            effect_object for typ in ('magics_action', 'book_action', 'science_tile')
+            for effect_object in game_state.all_available_object_dict[typ].values()
+        ]
+        for player_id in range(game_state.num_players):
+            for effect_object in effect_objects:
+                assert effect_object.compiled_cost(player_id) == compile_cost(tuple(effect_object.cost(player_id)[0])), (
+                    f'第{game_idx}局第{step_idx}个决策点玩家{player_id + 1}的{effect_object.name_dict[effect_object.id]}花费缓存不一致')
+                assert game_state.check_cost(player_id, effect_object.compiled_cost(player_id)) == reference_check(
+                    game_state, player_id, effect_object.cost(player_id)[0])
+
+def test_action_table_is_read_only():
+    """行动表的外层与各条行动均不可修改，旧接口 DetailedAction().all_detailed_actions 返回同一张表"""
+    assert DetailedAction().all_detailed_actions is ALL_DETAILED_ACTIONS
+    with pytest.raises(TypeError):
+        ALL_DETAILED_ACTIONS[1] = {'action': 'select_planning_card', 'args': 2, 'description': ''}
+    with pytest.raises(TypeError):
+        ALL_DETAILED_ACTIONS[1]['args'] = 2
+
+def test_action_table(num_games: int = 20):
+    """静态行动表的反查表（桥位与地图桥位同序，坐标覆盖全部地块）正确，且各决策点的可用行动id均落在对应行动的id区间内"""
+    game_state = GameEngine(make_game_args('reproduce', [])).game_state
+    assert list(BRIDGE_ACTION_IDS) == list(game_state.map_board_state.bridges_is_conneted)
+    assert list(BRIDGE_ACTION_IDS.values()) == list(ACTION_ID_RANGES['build_bridge'])
+    assert sorted(POSITION_ACTION_IDS) == sorted(
+        (i, j) for i in range(MAP_HEIGHT) for j in range(MAP_WIDTH) if TERRAIN_GRID[i][j] != 0
+    )
+    for game_idx, step_idx, env in random_decisions(num_games):
+        _, typ, args = env.decision
+        if typ == 'immediate':
+            allowed = ACTION_ID_RANGES[args[0]]
+            assert all(action_id in allowed for action_id in env.available_action_ids), (
+                f'第{game_idx}局第{step_idx}个决策点立即行动{args[0]}的行动id越界')
+        else:
+            assert all(
+                ACTION_NAMES[action_id] in ActionSystem.normal_action_names or ACTION_NAMES[action_id].startswith('additional_action_')
+                for action_id in env.available_action_ids
+            ), f'第{game_idx}局第{step_idx}个决策点常规行动id越界'
+
+def test_checkpoint_cache_bytes(num_snapshots: int = 12):
+    """检查点缓存逐个累计各快照的估算内存，淘汰后总量不超过上限且与剩余快照之和一致"""
+    snapshots = [
+        env.game_engine.game_state.snapshot()
+        for _, step_idx, env in random_decisions(1) if step_idx % 20 == 0
+    ][:num_snapshots]
+    sizes = [CheckpointCache.estimate_bytes(snapshot) for snapshot in snapshots]
+    cache = CheckpointCache(max_bytes=sum(sizes[-4:]))
+    for idx, snapshot in enumerate(snapshots):
+        cache.store([(0, 'normal', idx)], snapshot)
+        assert cache.total_bytes <= cache.max_bytes
+        assert cache.total_bytes == sum(node.snapshot_bytes for node in cache.lru.values())
+    # 上限恰为最近4个快照之和，淘汰后恰好保留这4个
+    assert [id(node.snapshot) for node in cache.lru.values()] == [id(snapshot) for snapshot in snapshots[-4:]]
+
+def test_navigation_table():
+    """航行距离表与逐层膨胀搜索的结果一致"""
+    water_mask = positions_to_mask((i, j) for i in range(MAP_HEIGHT) for j in range(MAP_WIDTH) if TERRAIN_GRID[i][j] == 0)
+    for i in range(MAP_HEIGHT):
+        for j in range(MAP_WIDTH):
+            if TERRAIN_GRID[i][j] == 0:
+                continue
+            for navigation_budget in range(6):
+                reachable_mask, visited_water_mask, frontier_mask = 0, 0, POS_BITS[i][j]
+                for _ in range(navigation_budget + 1):
+                    neighbor_mask = dilate_mask(frontier_mask)
+                    reachable_mask |= neighbor_mask & ~water_mask
+                    frontier_mask = neighbor_mask & water_mask & ~visited_water_mask
+                    visited_water_mask |= frontier_mask
+                table_mask = NAVIGATION_MASKS[min(navigation_budget, len(NAVIGATION_MASKS) - 1)][i][j]
+                assert table_mask == reachable_mask, f'航行距离表于({i},{j})航行预算{navigation_budget}处不一致'
+                assert all(is_navigable((i, j), pos, navigation_budget) for pos in mask_to_positions(reachable_mask))
+
+def test_player_snapshot(num_games: int = 5, stride: int = 50):
+    """每隔stride个决策点复制各玩家状态：副本的计数器数组与字典式视图均独立于原玩家状态"""
+    for game_idx, step_idx, env in random_decisions(num_games):
+        if step_idx % stride:
+            continue
+        game_state = env.game_engine.game_state
+        for player in game_state.players:
+            copied_player = copy.deepcopy(player, {id(game_state): game_state})
+            assert copied_player.counters == player.counters and copied_player.counters is not player.counters
+            copied_player.resources['money'] += 1
+            copied_player.boardscore += 1
+            assert copied_player.resources['money'] == player.resources['money'] + 1, f'第{game_idx}局第{step_idx}个决策点玩家副本不独立'
+            assert copied_player.boardscore == player.boardscore + 1, f'第{game_idx}局第{step_idx}个决策点玩家副本不独立'
+
+def test_board_snapshot(num_games: int = 5, stride: int = 50):
+    """每隔stride个决策点复制地图状态：副本的地图网格与位棋盘均独立于原地图状态"""
+    for game_idx, step_idx, env in random_decisions(num_games):
+        if step_idx % stride:
+            continue
+        map_board_state = env.game_engine.game_state.map_board_state
+        copied_board = copy.deepcopy(map_board_state)
+        assert copied_board.cells == map_board_state.cells and repr(copied_board.map_grid) == repr(map_board_state.map_grid)
+        before = (repr(map_board_state.map_grid), map_board_state.player_masks.copy(), map_board_state.occupied_mask)
+        i, j = next(
+            (i, j) for i in range(MAP_HEIGHT) for j in range(MAP_WIDTH) if TERRAIN_GRID[i][j] and map_board_state.map_grid[i][j][1] == -1)
+        copied_board.set_building(i, j, 0, 1, 0, False)
+        assert copied_board.map_grid[i][j][1:3] == [0, 1]
+        assert before == (repr(map_board_state.map_grid), map_board_state.player_masks, map_board_state.occupied_mask), (
+            f'第{game_idx}局第{step_idx}个决策点地图副本不独立')
+
+def play_out(game_engine: GameEngine, actions: list):
+    """于暂停的决策点依次执行剩余行动，返回对局结果"""
+    result = None
+    for _, _, action_id in actions:
+        result = game_engine.step(action_id)
+    return result
+
+def test_snapshot_restore_branch(seeds=(0, 1, 2), positions=(50, 150)):
+    """于回合边界处，完整重放、快照还原与直接复制得到的对局给出相同的下一决策点，继续进行后终局分数相同；
+    修改复制所得的对局不影响源对局"""
+    for seed in seeds:
+        action_history, turn_boundaries = record_game(seed)
+        for position in positions:
+            boundary = max(boundary for boundary in turn_boundaries if boundary <= position)
+            prefix, rest = action_history[:boundary], action_history[boundary:]
+
+            def paused_engine(history: list) -> GameEngine:
+                game_args = make_game_args('reproduce', history)
+                game_args['seed'] = seed
+                return GameEngine(game_args)
+
+            source_engine = paused_engine(prefix.copy())
+            next_decision = source_engine.run_game()
+            source_hash = source_engine.game_state.zobrist_hash()
+
+            restored_engine = paused_engine([])
+            restored_engine.game_state.restore(source_engine.game_state.snapshot())
+            copied_engine = paused_engine([])
+            source_engine.game_state.copy_to(copied_engine.game_state)
+            assert restored_engine.run_game() == copied_engine.run_game() == next_decision, f'种子{seed}第{boundary}条行动处下一决策点不一致'
+
+            # 修改另一份复制所得的对局（玩家计数器、地图、效果板块持有关系）后，源对局不变
+            mutated_engine = paused_engine([])
+            source_engine.game_state.copy_to(mutated_engine.game_state)
+            mutated_state = mutated_engine.game_state
+            mutated_state.players[0].resources['money'] += 5
+            i, j = next((i, j) for i in range(MAP_HEIGHT) for j in range(MAP_WIDTH) if TERRAIN_GRID[i][j] and mutated_state.map_board_state.map_grid[i][j][1] == -1)
+            mutated_state.map_board_state.set_building(i, j, 0, 1, 0, False)
+            next(iter(mutated_state.all_available_object_dict['science_tile'].values())).add_owner(0)
+            assert mutated_state.zobrist_hash() != source_hash
+            assert source_engine.game_state.zobrist_hash() == source_hash == reference_zobrist_hash(source_engine.game_state)
+
+            replayed_engine = paused_engine(prefix.copy())
+            replayed_engine.run_game()
+            final_results = [play_out(game_engine, rest) for game_engine in (replayed_engine, source_engine, restored_engine, copied_engine)]
+            assert all(result == final_results[0] for result in final_results), f'种子{seed}第{boundary}条行动处继续进行的对局结果不一致'
+            assert replayed_engine.final_scores == source_engine.final_scores == restored_engine.final_scores == copied_engine.final_scores
+
+def test_step_matches_replay(seeds=(0, 1, 2), stride: int = 7):
+    """于暂停的决策点直接推进一条行动，与重放追加该行动后的完整行动记录得到相同的下一决策点（或对局结果）"""
+    for seed in seeds:
+        action_history, _ = record_game(seed)
+        for position in range(0, len(action_history), stride):
+            prefix, action = action_history[:position], action_history[position]
+            replayed = GameEngine(make_game_args('reproduce', prefix + [action])).run_game()
+            paused_engine = GameEngine(make_game_args('reproduce', prefix.copy()))
+            paused_engine.run_game()
+            assert paused_engine.step(action[2]) == replayed, f'种子{seed}第{position}条行动处直接推进与重放不一致'
+
+def test_reproduce_matches_live_run(seeds=(0, 1, 2)):
+    """以随机行动逐步推进的对局，其行动记录重现时依次经过相同的决策点，并得到相同的对局结果与终局分数"""
+    for seed in seeds:
+        rng = random.Random(seed)
+        live_engine = GameEngine(make_game_args('reproduce', []))
+        live_decisions = []
+        result = live_engine.run_game()
+        while not live_engine.final_scores:
+            player_id, typ, args = result
+            live_decisions.append((player_id, typ, args))
+            result = live_engine.step(rng.choice(live_engine.agents[player_id].action_system.get_available_actions(typ, args)))
+
+        reproduce_engine = GameEngine(make_game_args('reproduce', live_engine.replay_history.copy()))
+        reproduced_decisions = []
+        original_action = reproduce_engine.action
+        def action(player_id, typ='normal', args=tuple()):
+            reproduced_decisions.append((player_id, typ, args))
+            return original_action(player_id, typ, args)
+        reproduce_engine.action = action
+
+        assert reproduce_engine.run_game() == result
+        assert reproduced_decisions == live_decisions, f'种子{seed}重现对局的决策点序列与逐步推进时不一致'
+        assert reproduce_engine.final_scores == live_engine.final_scores
+
+def test_game_env(seeds=(0, 1, 2)):
+    """训练环境：各决策点的行动掩码、合法行动id与位掩码均与代理行动系统的合法行动一致，观测定长；
+    相同种子重开得到相同的观测序列，结束时返回终局总分，非法行动与结束后推进均报错"""
+    env, replay_env = GameEnv(3), GameEnv(3)
+    for seed in seeds:
+        decision, action_mask = env.reset(seed)
+        assert (decision, action_mask) == replay_env.reset(seed)
+        rng = random.Random(seed)
+        obs_len = len(env.observation())
+        done = False
+        while not done:
+            player_id, typ, args = env.decision
+            legal_ids = sorted(env.game_engine.agents[player_id].action_system.get_available_actions(typ, args))
+            assert len(env.action_mask) == GameEnv.num_actions
+            assert env.available_action_ids == env.legal_action_ids() == legal_ids
+            assert [action_id for action_id, legal in enumerate(env.action_mask) if legal] == legal_ids
+            assert env.available_action_bits == action_ids_to_mask(legal_ids)
+            observation = env.observation()
+            assert len(observation) == obs_len and observation == replay_env.observation()
+            illegal_id = next(action_id for action_id in range(1, GameEnv.num_actions) if not env.action_mask[action_id])
+            with pytest.raises(ValueError):
+                env.step(illegal_id)
+            action_id = rng.choice(env.available_action_ids)
+            decision, action_mask, final_scores, done = env.step(action_id)
+            assert (decision, action_mask, final_scores, done) == replay_env.step(action_id)
+            assert decision == env.decision and (final_scores is None) != done
+        assert final_scores == [env.game_engine.final_scores[player_id] for player_id in range(3)]
+        assert not any(env.action_mask) and env.available_action_ids == [] and env.available_action_bits == 0
+        with pytest.raises(RuntimeError):
+            env.step(1)
+
+def test_vec_game_env(num_envs: int = 3, seed: int = 100):
+    """批量训练环境：掩码与观测逐行对应各对局，与独立进行的单局环境一致；结束的对局以种子 seed+idx+k*num_envs 自动重开，
+    仅结束的一行返回非零终局总分"""
+    vec_env = VecGameEnv(num_envs, seed=seed)
+    obs, masks, player_ids = vec_env.reset()
+    shadow_envs = [GameEnv(3) for _ in range(num_envs)]
+    restarts = [0] * num_envs
+    for idx, shadow_env in enumerate(shadow_envs):
+        shadow_env.reset(seed + idx)
+    rng = np.random.default_rng(seed)
+    while min(restarts) < 1:
+        assert masks.shape == (num_envs, GameEnv.num_actions) and masks.dtype == bool
+        for idx, (env, shadow_env) in enumerate(zip(vec_env.envs, shadow_envs)):
+            assert list(np.flatnonzero(masks[idx])) == env.available_action_ids == shadow_env.available_action_ids
+            assert list(obs[idx]) == shadow_env.observation() and player_ids[idx] == shadow_env.decision[0]
+        action_ids = vec_env.sample_actions(rng)
+        obs, masks, player_ids, rewards, dones = vec_env.step(action_ids)
+        assert rewards.shape == (num_envs, 3) and not rewards[~dones].any()
+        for idx, (shadow_env, action_id) in enumerate(zip(shadow_envs, action_ids)):
+            _, _, final_scores, done = shadow_env.step(int(action_id))
+            assert done == dones[idx]
+            if done:
+                assert list(rewards[idx]) == final_scores and any(final_scores)
+                restarts[idx] += 1
+                assert vec_env.seeds[idx] == seed + idx + restarts[idx] * num_envs
+                shadow_env.reset(vec_env.seeds[idx])
+
+def test_tournament_stats_merge():
+    """分批统计后合并与逐局加入的结果一致（并列第一平分胜场，记录最大总分与第一名最高分的对局）"""
+    results = [
+        ([60, 72, 55], [1, 2, 3]),
+        ([70, 70, 41], [4, 1, 2]),          # 两人并列第一
+        ([50, 80, 51], [3, 4, 1]),
+        ([66, 66, 66], [2, 3, 4]),          # 三人并列第一
+        ([90, 40, 51], [1, 3, 2]),
+        ([48, 40, 93], [4, 2, 1]),
+    ]
+    sequential = TournamentStats()
+    for scores, faction_ids in results:
+        sequential.add(scores, faction_ids)
+    merged = TournamentStats()
+    for start, stop in ((0, 2), (2, 5), (5, 6)):
+        chunk = TournamentStats()
+        for scores, faction_ids in results[start:stop]:
+            chunk.add(scores, faction_ids)
+        merged.merge(chunk)
+
+    assert sequential.games == merged.games == 6
+    assert sequential.total_score_sum == merged.total_score_sum == 1109
+    assert sequential.winner_score_sum == merged.winner_score_sum == 471
+    assert sequential.max_total_score == merged.max_total_score == (66, 66, 66)
+    assert sequential.max_winner_score == merged.max_winner_score == (93, 48, 40)
+    assert sequential.faction_games == merged.faction_games == {1: 5, 2: 5, 3: 4, 4: 4}
+    expected_wins = {1: 2.5, 2: 1 + 1 / 3, 3: 1 / 3, 4: 1.5 + 1 / 3}
+    assert sequential.faction_wins == pytest.approx(expected_wins) and merged.faction_wins == pytest.approx(expected_wins)
+
+def test_tournament_independent_of_workers(num_games: int = 12):
+    """固定种子的多进程对局统计与工作进程数、分批大小无关，且与单进程逐批进行一致"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        runs = [
+            run_tournament(num_games, max_workers=max_workers, chunk_size=chunk_size)
+            for max_workers, chunk_size in ((1, num_games), (2, 5), (3, 1))
+        ]
+    for stats in runs:
+        assert (stats.games, stats.total_score_sum, stats.winner_score_sum, stats.max_total_score, stats.max_winner_score, stats.faction_games) == (
+            runs[0].games, runs[0].total_score_sum, runs[0].winner_score_sum, runs[0].max_total_score, runs[0].max_winner_score, runs[0].faction_games)
+        assert stats.faction_wins == pytest.approx(runs[0].faction_wins)
+    assert runs[0].games == num_games
+
+def test_seeded_games_reproducible(seeds=(2 ** 64 - 1, 0x9E3779B97F4A7C15, 12345)):
+    """相同64位种子构造的两局随机初始设置、随机行动对局完全一致，不同种子的对局各不相同"""
+    def play(seed: int):
+        game_args = make_game_args('simulate', [])
+        game_args.update({'setup_mode': 'random', 'setup_tile_args': None, 'seed': seed})
+        game_engine = GameEngine(game_args)
+        result = game_engine.run_game()
+        game_state = game_engine.game_state
+        setup = [(player.planning_card_id, player.faction_id, player.palace_tile_id) for player in game_state.players]
+        return result, game_engine.final_scores, setup, bytes(game_state.map_board_state.cells), game_state.zobrist_hash()
+
+    games = [play(seed) for seed in seeds]
+    for seed, game in zip(seeds, games):
+        assert play(seed) == game, f'种子{seed}的两局对局不一致'
+    assert len({game[3] for game in games}) == len({game[4] for game in games}) == len(seeds), '不同种子的终局局面相同'
+
+def test_long_run_stability(num_games: int = 600, num_seeds: int = 20):
+    """在同一进程内连续进行数百局对局，相同种子的结果始终一致，且预热后峰值常驻内存基本不再增长"""
+    resource = pytest.importorskip('resource')
+    def play(seed: int):
+        game_args = make_game_args('simulate', [])
+        game_args['seed'] = seed
+        return GameEngine(game_args).run_game()
+
+    expected = [play(seed) for seed in range(num_seeds)]
+    for game_idx in range(num_games):
+        # 前10%对局作为预热，之后的峰值常驻内存应保持不变
+        if game_idx == num_games // 10:
+            warmup_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        seed = game_idx % num_seeds
+        assert play(seed) == expected[seed], f'第{game_idx}局（种子{seed}）结果与首次进行时不一致'
+    final_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    assert final_rss_kb - warmup_rss_kb < 4 * 1024, f'峰值常驻内存 {warmup_rss_kb / 1024:.1f}MB -> {final_rss_kb / 1024:.1f}MB'
+
+class RecordingIO(Silence_IO):
+    """记录全部输出调用的静默IO（用于检查多对局输出互不干扰）"""
+    def __init__(self):
+        self.log = []
+    def output(self, channel, message, color=None):
+        self.log.append(('output', channel, message, color))
+    def update_player_state(self, player_id, updates):
+        self.log.append(('update_player_state', player_id, dict(updates)))
+    def update_global_status(self, message):
+        self.log.append(('update_global_status', message))
+    def update_terrain(self, row, col, terrain_type):
+        self.log.append(('update_terrain', row, col, terrain_type))
+    def update_building(self, hex_row, hex_col, building_colour, building_id, mode='replace'):
+        self.log.append(('update_building', hex_row, hex_col, building_colour, building_id, mode))
+    def set_round_scoring(self, round_num, round_scoring_id):
+        self.log.append(('set_round_scoring', round_num, round_scoring_id))
+    def set_final_round_bonus(self, final_scoring_id):
+        self.log.append(('set_final_round_bonus', final_scoring_id))
+    def set_bonus_columns(self, round_bonus_ids):
+        self.log.append(('set_bonus_columns', list(round_bonus_ids)))
+    def round_update(self, round):
+        self.log.append(('round_update', round))
+    def get_round_bonus(self, setup_round_booster_ids, round_booster_id):
+        self.log.append(('get_round_bonus', list(setup_round_booster_ids), round_booster_id))
+    def return_round_bonus(self, setup_round_booster_ids, round_booster_id):
+        self.log.append(('return_round_bonus', list(setup_round_booster_ids), round_booster_id))
+
+def test_concurrent_games_isolated_io(num_games: int = 16, max_workers: int = 8):
+    """在同一进程内以多线程同时进行多局随机对局，各局的IO输出与单独进行时完全一致"""
+    def play(seed: int):
+        game_args = make_game_args('simulate', [])
+        game_args.update({'setup_mode': 'random', 'setup_tile_args': None, 'seed': seed, 'web_io': RecordingIO(), 'headless': False})
+        result = GameEngine(game_args).run_game()
+        return result, game_args['web_io'].log
+
+    sequential = [play(seed) for seed in range(num_games)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        concurrent = list(executor.map(play, range(num_games)))
+    assert all(log for _, log in sequential)
+    mismatched = [seed for seed in range(num_games) if sequential[seed] != concurrent[seed]]
+    assert not mismatched, f'多线程对局输出与单独进行时不一致: {mismatched}'
+
+def test_headless_matches_verbose(num_games: int = 10):
+    """无界面模式（不生成说明文本与界面更新）与生成说明文本时的对局结果及终局局面一致"""
+    def play(action_mode: str, seed: int, headless: bool):
+        game_args = make_game_args(action_mode, [])
+        game_args.update({'seed': seed, 'headless': headless})
+        game_engine = GameEngine(game_args)
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = game_engine.run_game()
+        return result, game_engine.final_scores, game_engine.game_state.zobrist_hash()
+
+    for action_mode in ('simulate', 'input'):
+        for seed in range(num_games):
+            assert play(action_mode, seed, False) == play(action_mode, seed, True), f'{action_mode}模式种子{seed}的无界面对局不一致'
@@ -0,0 +1,208 @@
+from ActionSystem import mask_to_action_ids
+from GameEngine import GameEngine
+from GameEnv import GameEnv
+from GameState import NUM_COUNTERS, ZOBRIST_CELL_BASE, ZOBRIST_PLAYER_BASE, bridge_feature, positions_to_mask, zobrist_key
+from web_io import Silence_IO
+from collections import Counter
+import contextlib
+import io
+import random
+
+# 测试与基准共用的对局驱动工具，以及按定义从头计算的对照实现（不使用任何增量维护的数据）
+
+# 测试与基准对局设置
+SETUP_TILE_ARGS = (
+    3,                                          # 排除的规划卡
+    [2, 3, 5, 8],                               # 派系板块 (3+1=4个)
+    [3, 9, 14,16],                              # 宫殿板块 (3+1=4个)
+    [1, 3, 4, 7, 8, 10],                        # 回合助推板 (3+3=6个)
+    [5, 3, 4, 8, 2, 6],                         # 轮次计分板块
+    2,                                          # 最终计分板块
+    [3, 7, 2, 6, 9, 10, 12, 1, 11, 5, 4, 8],    # 能力板块顺序
+    [3, 5, 18, 7, 4, 2, 9, 11],                 # 科学板块 (2+2*3=8个
+    [2, 4, 6]                                   # 书本行动板块
+)
+
+def make_game_args(action_mode: str, action_history: list) -> dict:
+    """生成静默对局参数"""
+    return {
+        'num_players': 3,
+        'setup_mode': 'target',
+        'setup_tile_args': SETUP_TILE_ARGS,
+        'setup_player_order_args': [2, 0, 1],
+        'action_history': action_history,
+        'action_mode': action_mode,
+        'web_io': Silence_IO(),
+        'need_estimate': False,
+    }
+
+def record_game(seed: int):
+    """以随机决策完整进行一局，返回行动记录及每个回合边界处的行动记录长度"""
+    game_args = make_game_args('input', [])
+    game_args['seed'] = seed
+    game_engine = GameEngine(game_args)
+    turn_boundaries = []
+
+    original_action = game_engine.action
+    def action(player_id, typ='normal', args=tuple()):
+        if typ == 'normal' and game_engine.is_at_turn_boundary():
+            turn_boundaries.append(len(game_args['action_history']))
+        return original_action(player_id, typ, args)
+    game_engine.action = action
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        game_engine.run_game()
+    return game_args['action_history'], turn_boundaries
+
+def random_decisions(num_games: int, seed: int = 0):
+    """以随机决策依次进行多局对局，于每个决策点产出 (对局序号, 决策序号, 对局环境)，
+    调用方检查完毕后再由生成器随机选择一个合法行动推进"""
+    rng = random.Random(seed)
+    env = GameEnv(3)
+    for game_idx in range(num_games):
+        env.reset(seed + game_idx)
+        step_idx = 0
+        while not env.done:
+            yield game_idx, step_idx, env
+            env.step(rng.choice(env.available_action_ids))
+            step_idx += 1
+
+def reference_available_actions(action_system, typ: str, args) -> list:
+    """不经缓存完整检查合法行动（用于对照 ActionSystem.get_available_actions 的缓存结果），返回升序的行动id列表"""
+    if typ == 'immediate':
+        name, *check_args = args
+        return mask_to_action_ids(action_system.immediate_action_dict('check', name)(*check_args))
+    available_action_mask = 0
+    for name in action_system.action_list:
+        available_action_mask |= action_system.action_dict('check', name)()
+    for action_function in action_system.player.additional_actions_dict.values():
+        available_action_mask |= action_function('check', action_system.player_id)
+    return mask_to_action_ids(available_action_mask)
+
+def reference_total_scores(game_state) -> dict[int, dict[str, int]]:
+    """不使用任何增量数据、按定义从头计算的终局分数构成（作为估算分数的对照与计时基准）：
+    以聚落为单位逐一搜索航行可抵达的其他聚落并求最大连通链，科技轨逐轨排序计算名次分"""
+    players = game_state.players
+
+    def rank(values, prizes):
+        ranked = sorted(enumerate(values), key=lambda x: x[1], reverse=True)
+        scores, order_id = [0] * len(values), 1
+        while order_id <= min(len(prizes), len(values)):
+            tie_place = order_id + 1
+            while tie_place <= len(values) and ranked[tie_place-1][1] == ranked[order_id-1][1]:
+                tie_place += 1
+            for rank_idx in range(order_id, tie_place):
+                scores[ranked[rank_idx-1][0]] = sum(prizes[order_id-1: tie_place-1]) // (tie_place - order_id)
+            order_id = tie_place
+        return scores
+
+    largest_chains = []
+    for player in players:
+        chains = {}
+        for pos in player.settlements_and_cities:
+            chains.setdefault(game_state.find_settlement(player.player_id, pos)[0], set()).add(pos)
+        unvisited, largest_chain = set(chains), 0
+        while unvisited:
+            stack, chain_size = [unvisited.pop()], 0
+            while stack:
+                root = stack.pop()
+                chain_size += len(chains[root])
+                reachable_mask = game_state.search_reachable_mask(positions_to_mask(chains[root]), player.navigation_level, only_unoccupied=False)
+                linked = [other_root for other_root in unvisited if reachable_mask & positions_to_mask(chains[other_root])]
+                unvisited.difference_update(linked)
+                stack.extend(linked)
+            largest_chain = max(largest_chain, chain_size)
+        largest_chains.append(largest_chain)
+
+    chain_scores = rank(largest_chains, (18, 12, 6))
+    track_scores = [0] * len(players)
+    for typ in ('bank', 'law', 'engineering', 'medical'):
+        for player_id, score in enumerate(rank([player.tracks[typ] for player in players], (8, 4, 2))):
+            track_scores[player_id] += score
+    scores = {}
+    for player_id, player in enumerate(players):
+        resource_score = sum([
+            sum(player.resources[x] for x in ['money', 'ore', 'meeples', 'bank_book', 'law_book', 'engineering_book', 'medical_book']),
+            player.magics[3],
+            player.magics[2] // 2,
+        ]) // 5
+        scores[player_id] = {
+            'board': player.boardscore,
+            'chain': chain_scores[player_id],
+            'track': track_scores[player_id],
+            'resource': resource_score,
+            'total': player.boardscore + chain_scores[player_id] + track_scores[player_id] + resource_score,
+        }
+    return scores
+
+def reference_zobrist_hash(game_state) -> int:
+    """从头计算游戏状态的 Zobrist 哈希（不使用增量维护的分量），作为增量哈希的基准"""
+    map_board_state = game_state.map_board_state
+    state_hash = game_state.progress_hash()
+    for idx, value in enumerate(map_board_state.cells):
+        state_hash ^= zobrist_key(ZOBRIST_CELL_BASE + idx, value)
+    for bridge_key, controller in map_board_state.bridges_is_conneted.items():
+        state_hash ^= zobrist_key(bridge_feature(bridge_key), controller)
+    for player in game_state.players:
+        for idx, value in enumerate(player.counters):
+            state_hash ^= zobrist_key(ZOBRIST_PLAYER_BASE + player.player_id * NUM_COUNTERS + idx, value)
+    for effect_objects in game_state.all_available_object_dict.values():
+        for effect_object in effect_objects.values():
+            for player_id, count in Counter(effect_object.owner_list).items():
+                state_hash ^= zobrist_key(effect_object.owner_feature + player_id, count)
+            for player_id, is_done in enumerate(effect_object.additional_action_is_done):
+                if is_done:
+                    state_hash ^= zobrist_key(effect_object.action_done_feature + player_id, 1)
+    return state_hash
+
+# 主要行动的花费检查列表（与 ActionSystem 中编译的花费一致）
+QUICK_MAGICS_CHECK_LISTS = [
+    [('magics', 3, 5), ('book', 'all', 'any', 1)],
+    [('magics', 3, 5), ('meeple', 'all', 1)],
+    [('magics', 3, 3)],
+    [('magics', 3, 1)],
+    [('magics', 2, 2)],
+    [('book', 'self', 'any', 1)],
+    [('meeple', 'self', 1)],
+    [('ore', 1)],
+]
+MAIN_ACTION_CHECK_LISTS = QUICK_MAGICS_CHECK_LISTS + [
+    [('meeple', 'self', 1), ('money', 4)],
+    [('meeple', 'self', 1), ('ore', 1), ('money', 5)],
+    [('meeple', 'self', 1), ('ore', 1), ('money', 1)],
+    *[[('tracks', typ)] for typ in ('bank', 'law', 'engineering', 'medical')],
+    *[[('money', 2), ('ore', 1 + i * shovel_level), ('building', 1)] for shovel_level in (1, 2, 3) for i in range(4)],
+    *[[('ore', i * shovel_level)] for shovel_level in (1, 2, 3) for i in range(1, 4)],
+    [('building', 2), ('ore', 2), ('money', 6)],
+    [('building', 2), ('ore', 2), ('money', 3)],
+    [('building', 3), ('ore', 4), ('money', 6)],
+    [('building', 4), ('ore', 3), ('money', 5)],
+    [('building', 5), ('ore', 5), ('money', 8)],
+]
+
+def reference_check(game_state, player_id: int, list_to_be_checked: list) -> bool:
+    """逐项解释状态检查列表（经玩家状态的字典式视图读取，用于对照编译后的花费检查）"""
+    player = game_state.players[player_id]
+    for check_item, *check_args in list_to_be_checked:
+        match check_item, check_args:
+            case 'money' | 'ore', [num]:
+                passed = player.resources[check_item] >= num
+            case 'book', ['self', 'any', num]:
+                passed = sum(player.resources[f'{typ}_book'] for typ in ('bank', 'law', 'engineering', 'medical')) >= num
+            case 'book', ['self', typ, num]:
+                passed = player.resources[f'{typ}_book'] >= num
+            case 'meeple', ['self', num]:
+                passed = player.resources['meeples'] >= num
+            case 'meeple', ['all', num]:
+                passed = player.resources['all_meeples'] >= num
+            case 'magics', [zone, num]:
+                passed = player.magics[zone] >= num
+            case 'score', [num]:
+                passed = player.boardscore >= num
+            case 'building', [building_id]:
+                passed = player.buildings[building_id] >= 1
+            case _:
+                passed = game_state.check(player_id, [(check_item, *check_args)])
+        if not passed:
+            return False
+    return True
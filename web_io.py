@@ -397,7 +397,7 @@ class Silence_IO:
         pass
     def output(self, channel, message, color=None):
         pass
-    def update_player_states(self, player_id, field, value):
+    def update_player_state(self, player_id, updates):
         pass
     def update_global_status(self, message):
         pass